@@ -0,0 +1,45 @@
+"""create_refresh_tokens_table
+
+Revision ID: 3b6aa97010cf
+Revises: 767c5ce7f331
+Create Date: 2026-10-19 10:12:41.208153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b6aa97010cf'
+down_revision: Union[str, None] = '767c5ce7f331'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refresh_tokens',
+    sa.Column('token_id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный идентификатор токена (Автоинкремент)'),
+    sa.Column('user_id', sa.Integer(), nullable=False, comment='Внешний ключ, ID пользователя'),
+    sa.Column('token_hash', sa.String(length=64), nullable=False, comment='SHA-256 токена в hex'),
+    sa.Column('family_id', sa.String(length=32), nullable=False, comment='Идентификатор цепочки ротации (uuid4 hex)'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время выдачи'),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False, comment='Дата и время истечения'),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True, comment='Дата и время отзыва или ротации (NULL — активен)'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], name=op.f('fk_refresh_tokens_user_id_users'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('token_id', name=op.f('pk_refresh_tokens')),
+    sa.UniqueConstraint('token_hash', name=op.f('uq_refresh_tokens_token_hash'))
+    )
+    op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], unique=False)
+    op.create_index('ix_refresh_tokens_family_id', 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_expires_at', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_family_id', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_user_id', table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
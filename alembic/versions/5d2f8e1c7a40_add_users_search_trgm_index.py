@@ -0,0 +1,36 @@
+"""add_users_search_trgm_index
+
+Revision ID: 5d2f8e1c7a40
+Revises: c41d0e7a9b52
+Create Date: 2026-10-19 12:04:16.372918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8e1c7a40'
+down_revision: Union[str, None] = 'c41d0e7a9b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Расширение с триграммным поиском (ILIKE '%...%' и нечеткое сравнение по индексу)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Выражение должно совпадать с User.SEARCH_TEXT_SQL, иначе планировщик не использует индекс
+    op.execute(
+        "CREATE INDEX ix_users_search_trgm ON users USING gin ("
+        "(coalesce(username, '') || ' ' || coalesce(first_name, '') || ' ' || "
+        "coalesce(last_name, '') || ' ' || coalesce(email, '')) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширение не удаляем: его могут использовать другие индексы
+    op.drop_index('ix_users_search_trgm', table_name='users')
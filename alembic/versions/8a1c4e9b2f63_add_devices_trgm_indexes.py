@@ -0,0 +1,34 @@
+"""add_devices_trgm_indexes
+
+Revision ID: 8a1c4e9b2f63
+Revises: 5d2f8e1c7a40
+Create Date: 2026-10-19 12:41:08.915204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a1c4e9b2f63'
+down_revision: Union[str, None] = '5d2f8e1c7a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Триграммные индексы для поиска устройств по вхождению, началу строки (ILIKE) и нечетко
+    op.create_index('ix_devices_name_trgm', 'devices', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_devices_inventory_number_trgm', 'devices', ['inventory_number'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'inventory_number': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_devices_inventory_number_trgm', table_name='devices', postgresql_using='gin')
+    op.drop_index('ix_devices_name_trgm', table_name='devices', postgresql_using='gin')
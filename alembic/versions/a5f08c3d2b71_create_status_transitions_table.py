@@ -0,0 +1,56 @@
+"""create_status_transitions_table
+
+Revision ID: a5f08c3d2b71
+Revises: d93a5c7e1f24
+Create Date: 2026-10-19 15:11:07.524193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5f08c3d2b71'
+down_revision: Union[str, None] = 'd93a5c7e1f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Переходы по умолчанию между начальными статусами
+# (1 — Новая, 2 — Ожидает решения, 3 — В работе, 4 — Закрыта), разрешены любой роли
+DEFAULT_TRANSITIONS = [(1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 2), (3, 4)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('statuses', sa.Column('is_initial', sa.Boolean(), server_default=sa.false(), nullable=False, comment='Флаг начального статуса (присваивается новой заявке)'))
+    # Раньше новые заявки получали статус 1
+    op.execute("UPDATE statuses SET is_initial = true WHERE status_id = 1")
+
+    op.create_table('status_transitions',
+    sa.Column('transition_id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный идентификатор перехода (Автоинкремент)'),
+    sa.Column('from_status_id', sa.Integer(), nullable=False, comment='Внешний ключ, ID исходного статуса'),
+    sa.Column('to_status_id', sa.Integer(), nullable=False, comment='Внешний ключ, ID целевого статуса'),
+    sa.Column('role_id', sa.Integer(), nullable=True, comment='Внешний ключ, ID роли (NULL — любая роль)'),
+    sa.ForeignKeyConstraint(['from_status_id'], ['statuses.status_id'], name=op.f('fk_status_transitions_from_status_id_statuses'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['to_status_id'], ['statuses.status_id'], name=op.f('fk_status_transitions_to_status_id_statuses'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['role_id'], ['user_roles.id'], name=op.f('fk_status_transitions_role_id_user_roles'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('transition_id', name=op.f('pk_status_transitions')),
+    sa.UniqueConstraint('from_status_id', 'to_status_id', 'role_id', name='uq_status_transitions_from_to_role', postgresql_nulls_not_distinct=True)
+    )
+
+    # Заполняем переходы только для существующих статусов
+    values = ", ".join(f"({from_id}, {to_id})" for from_id, to_id in DEFAULT_TRANSITIONS)
+    op.execute(
+        "INSERT INTO status_transitions (from_status_id, to_status_id) "
+        f"SELECT v.from_id, v.to_id FROM (VALUES {values}) AS v(from_id, to_id) "
+        "JOIN statuses f ON f.status_id = v.from_id "
+        "JOIN statuses t ON t.status_id = v.to_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('status_transitions')
+    op.drop_column('statuses', 'is_initial')
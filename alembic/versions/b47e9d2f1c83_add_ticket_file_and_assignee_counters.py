@@ -0,0 +1,45 @@
+"""add_ticket_file_and_assignee_counters
+
+Revision ID: b47e9d2f1c83
+Revises: f61d2a8c4e95
+Create Date: 2026-10-19 17:46:12.580394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e9d2f1c83'
+down_revision: Union[str, None] = 'f61d2a8c4e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tickets', sa.Column('files_count', sa.Integer(), server_default='0', nullable=False, comment='Количество прикрепленных файлов'))
+    op.add_column('tickets', sa.Column('total_files_size', sa.BigInteger(), server_default='0', nullable=False, comment='Суммарный размер прикрепленных файлов в байтах'))
+    op.add_column('tickets', sa.Column('assignees_count', sa.Integer(), server_default='0', nullable=False, comment='Количество назначенных техников'))
+    # Заполняем счетчики существующих заявок одним агрегатом по каждой дочерней таблице
+    op.execute(
+        "UPDATE tickets SET files_count = f.files_count, total_files_size = f.total_files_size "
+        "FROM (SELECT ticket_id, count(*) AS files_count, sum(file_size) AS total_files_size "
+        "FROM files GROUP BY ticket_id) AS f "
+        "WHERE tickets.ticket_id = f.ticket_id"
+    )
+    op.execute(
+        "UPDATE tickets SET assignees_count = a.assignees_count "
+        "FROM (SELECT ticket_id, count(*) AS assignees_count "
+        "FROM technician_assignments GROUP BY ticket_id) AS a "
+        "WHERE tickets.ticket_id = a.ticket_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tickets', 'assignees_count')
+    op.drop_column('tickets', 'total_files_size')
+    op.drop_column('tickets', 'files_count')
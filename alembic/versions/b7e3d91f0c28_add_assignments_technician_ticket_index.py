@@ -0,0 +1,33 @@
+"""add_assignments_technician_ticket_index
+
+Revision ID: b7e3d91f0c28
+Revises: 8a1c4e9b2f63
+Create Date: 2026-10-19 13:17:52.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d91f0c28'
+down_revision: Union[str, None] = '8a1c4e9b2f63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Составной индекс для фильтра "назначенные технику" (EXISTS по technician_id и ticket_id);
+    # одиночный индекс по technician_id становится его префиксом и не нужен
+    op.create_index('ix_technician_assignments_technician_id_ticket_id', 'technician_assignments',
+                    ['technician_id', 'ticket_id'], unique=False)
+    op.drop_index(op.f('ix_technician_assignments_technician_id'), table_name='technician_assignments')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_technician_assignments_technician_id'), 'technician_assignments', ['technician_id'], unique=False)
+    op.drop_index('ix_technician_assignments_technician_id_ticket_id', table_name='technician_assignments')
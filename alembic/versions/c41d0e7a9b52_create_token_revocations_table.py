@@ -0,0 +1,39 @@
+"""create_token_revocations_table
+
+Revision ID: c41d0e7a9b52
+Revises: 3b6aa97010cf
+Create Date: 2026-10-19 11:03:27.514220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d0e7a9b52'
+down_revision: Union[str, None] = '3b6aa97010cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('token_revocations',
+    sa.Column('revocation_id', sa.BigInteger(), autoincrement=True, nullable=False, comment='Уникальный идентификатор отзыва (Автоинкремент)'),
+    sa.Column('jti', sa.String(length=32), nullable=True, comment='Идентификатор отозванного токена (NULL — отзыв всех токенов пользователя)'),
+    sa.Column('user_id', sa.Integer(), nullable=True, comment='ID пользователя, чьи токены отозваны'),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время отзыва'),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False, comment='Когда отозванные токены истекут сами (после этого запись не нужна)'),
+    sa.Column('reason', sa.String(length=50), nullable=True, comment='Причина отзыва (logout, sign_out, role_change и т.п.)'),
+    sa.CheckConstraint('jti IS NOT NULL OR user_id IS NOT NULL', name=op.f('ck_token_revocations_target_present')),
+    sa.PrimaryKeyConstraint('revocation_id', name=op.f('pk_token_revocations'))
+    )
+    op.create_index('ix_token_revocations_expires_at', 'token_revocations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_token_revocations_expires_at', table_name='token_revocations')
+    op.drop_table('token_revocations')
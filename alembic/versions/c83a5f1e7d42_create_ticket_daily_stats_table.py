@@ -0,0 +1,59 @@
+"""create_ticket_daily_stats_table
+
+Revision ID: c83a5f1e7d42
+Revises: b47e9d2f1c83
+Create Date: 2026-10-19 18:31:47.902615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83a5f1e7d42'
+down_revision: Union[str, None] = 'b47e9d2f1c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_daily_stats',
+    sa.Column('stat_id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный идентификатор строки сводки (Автоинкремент)'),
+    sa.Column('day', sa.Date(), nullable=False, comment='День (в часовом поясе статистики)'),
+    sa.Column('status_id', sa.Integer(), nullable=True, comment='ID статуса закрытой заявки (NULL — строка открытий)'),
+    sa.Column('priority_id', sa.Integer(), nullable=False, comment='ID приоритета'),
+    sa.Column('device_type_id', sa.Integer(), nullable=True, comment='ID типа устройства (NULL — тип не задан)'),
+    sa.Column('opened_count', sa.Integer(), server_default='0', nullable=False, comment='Количество созданных заявок'),
+    sa.Column('closed_count', sa.Integer(), server_default='0', nullable=False, comment='Количество закрытых заявок'),
+    sa.Column('close_seconds', sa.BigInteger(), server_default='0', nullable=False, comment='Суммарное время от создания до закрытия закрытых заявок (с)'),
+    sa.PrimaryKeyConstraint('stat_id', name=op.f('pk_ticket_daily_stats')),
+    sa.UniqueConstraint('day', 'status_id', 'priority_id', 'device_type_id', name='uq_ticket_daily_stats_day_status_priority_type', postgresql_nulls_not_distinct=True)
+    )
+    # Заполняем сводку по существующим заявкам: открытия — по дню создания
+    # без статуса, закрытия — по дню закрытия с текущим статусом заявки
+    op.execute(
+        sa.text(
+            "INSERT INTO ticket_daily_stats "
+            "(day, status_id, priority_id, device_type_id, opened_count, closed_count, close_seconds) "
+            "SELECT day, status_id, priority_id, device_type_id, sum(opened), sum(closed), sum(seconds) FROM ("
+            "SELECT CAST(timezone(:tz, t.created_at) AS DATE) AS day, CAST(NULL AS INTEGER) AS status_id, "
+            "t.priority_id, d.device_type_id, 1 AS opened, 0 AS closed, 0 AS seconds "
+            "FROM tickets t JOIN devices d ON d.device_id = t.device_id "
+            "UNION ALL "
+            "SELECT CAST(timezone(:tz, t.closed_at) AS DATE), t.status_id, "
+            "t.priority_id, d.device_type_id, 0, 1, CAST(extract(epoch FROM t.closed_at - t.created_at) AS BIGINT) "
+            "FROM tickets t JOIN devices d ON d.device_id = t.device_id "
+            "WHERE t.closed_at IS NOT NULL"
+            ") AS events GROUP BY day, status_id, priority_id, device_type_id"
+        ).bindparams(tz=settings.STATS_TIMEZONE)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ticket_daily_stats')
@@ -0,0 +1,39 @@
+"""create_idempotency_keys_table
+
+Revision ID: d93a5c7e1f24
+Revises: b7e3d91f0c28
+Create Date: 2026-10-19 14:02:41.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a5c7e1f24'
+down_revision: Union[str, None] = 'b7e3d91f0c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotency_keys',
+    sa.Column('user_id', sa.Integer(), nullable=False, comment='ID пользователя, отправившего запрос'),
+    sa.Column('key', sa.String(length=255), nullable=False, comment='Значение заголовка Idempotency-Key'),
+    sa.Column('request_hash', sa.String(length=64), nullable=False, comment='SHA-256 эндпоинта и содержимого запроса (повтор с другим телом отклоняется)'),
+    sa.Column('status_code', sa.SmallInteger(), nullable=True, comment='HTTP-код сохраненного ответа (NULL — запрос еще выполняется)'),
+    sa.Column('response_body', sa.LargeBinary(), nullable=True, comment='Тело сохраненного ответа (JSON)'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время первого запроса'),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False, comment='После этого момента ключ можно использовать заново'),
+    sa.PrimaryKeyConstraint('user_id', 'key', name=op.f('pk_idempotency_keys'))
+    )
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,29 @@
+"""add_tickets_closed_at_index
+
+Revision ID: d94b6e2a8f51
+Revises: c83a5f1e7d42
+Create Date: 2026-10-19 19:12:05.318724
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94b6e2a8f51'
+down_revision: Union[str, None] = 'c83a5f1e7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Отчеты по заявкам, закрытым за период
+    op.create_index('ix_tickets_closed_at', 'tickets', ['closed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_closed_at', table_name='tickets')
@@ -0,0 +1,29 @@
+"""add_tickets_created_at_index
+
+Revision ID: e25c7a9d3b16
+Revises: d94b6e2a8f51
+Create Date: 2026-10-19 19:47:23.604182
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e25c7a9d3b16'
+down_revision: Union[str, None] = 'd94b6e2a8f51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Отчеты по заявкам, созданным за период
+    op.create_index('ix_tickets_created_at', 'tickets', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_created_at', table_name='tickets')
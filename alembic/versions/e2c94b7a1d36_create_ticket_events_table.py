@@ -0,0 +1,41 @@
+"""create_ticket_events_table
+
+Revision ID: e2c94b7a1d36
+Revises: a5f08c3d2b71
+Create Date: 2026-10-19 16:24:53.907412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c94b7a1d36'
+down_revision: Union[str, None] = 'a5f08c3d2b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_events',
+    sa.Column('event_id', sa.BigInteger(), autoincrement=True, nullable=False, comment='Уникальный идентификатор события (Автоинкремент)'),
+    sa.Column('ticket_id', sa.Integer(), nullable=False, comment='ID заявки'),
+    sa.Column('actor_id', sa.Integer(), nullable=True, comment='ID пользователя, выполнившего изменение'),
+    sa.Column('event_type', sa.String(length=32), nullable=False, comment='Тип события (updated, status_changed, technician_assigned, ...)'),
+    sa.Column('changes', postgresql.JSONB(astext_type=sa.Text()), nullable=False, comment='Измененные поля: {"поле": {"old": ..., "new": ...}}'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, comment='Дата и время изменения'),
+    sa.PrimaryKeyConstraint('event_id', name=op.f('pk_ticket_events'))
+    )
+    op.create_index('ix_ticket_events_ticket_id_created_at', 'ticket_events', ['ticket_id', 'created_at', 'event_id'], unique=False)
+    op.create_index('ix_ticket_events_created_at', 'ticket_events', ['created_at'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ticket_events_created_at', table_name='ticket_events', postgresql_using='brin')
+    op.drop_index('ix_ticket_events_ticket_id_created_at', table_name='ticket_events')
+    op.drop_table('ticket_events')
@@ -0,0 +1,51 @@
+"""create_ticket_comments_table
+
+Revision ID: f61d2a8c4e95
+Revises: e2c94b7a1d36
+Create Date: 2026-10-19 17:08:36.215740
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f61d2a8c4e95'
+down_revision: Union[str, None] = 'e2c94b7a1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_comments',
+    sa.Column('comment_id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный идентификатор комментария (Автоинкремент)'),
+    sa.Column('ticket_id', sa.Integer(), nullable=False, comment='Внешний ключ, ID заявки'),
+    sa.Column('author_id', sa.Integer(), nullable=False, comment='Внешний ключ, ID автора комментария'),
+    sa.Column('body', sa.Text(), nullable=False, comment='Текст комментария'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время создания'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время последнего изменения'),
+    sa.ForeignKeyConstraint(['ticket_id'], ['tickets.ticket_id'], name=op.f('fk_ticket_comments_ticket_id_tickets'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['author_id'], ['users.user_id'], name=op.f('fk_ticket_comments_author_id_users')),
+    sa.PrimaryKeyConstraint('comment_id', name=op.f('pk_ticket_comments'))
+    )
+    op.create_index('ix_ticket_comments_ticket_id_comment_id', 'ticket_comments', ['ticket_id', 'comment_id'], unique=False)
+    op.create_index(op.f('ix_ticket_comments_author_id'), 'ticket_comments', ['author_id'], unique=False)
+
+    op.add_column('tickets', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False, comment='Количество комментариев'))
+    op.add_column('tickets', sa.Column('last_activity_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False, comment='Дата и время последней активности (создание заявки или комментарий)'))
+    # Комментариев еще нет: последняя активность существующих заявок — их создание
+    op.execute("UPDATE tickets SET last_activity_at = created_at")
+    op.create_index('ix_tickets_last_activity_at', 'tickets', ['last_activity_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_last_activity_at', table_name='tickets')
+    op.drop_column('tickets', 'last_activity_at')
+    op.drop_column('tickets', 'comment_count')
+    op.drop_index(op.f('ix_ticket_comments_author_id'), table_name='ticket_comments')
+    op.drop_index('ix_ticket_comments_ticket_id_comment_id', table_name='ticket_comments')
+    op.drop_table('ticket_comments')
@@ -0,0 +1,43 @@
+"""seed_admin_reopen_transition
+
+Revision ID: f7a1c4e9b258
+Revises: e25c7a9d3b16
+Create Date: 2026-10-19 20:24:41.083517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a1c4e9b258'
+down_revision: Union[str, None] = 'e25c7a9d3b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# До рабочего процесса администратор мог вернуть закрытую заявку в работу:
+# переход 4 (Закрыта) -> 3 (В работе) для роли admin
+REOPEN_TRANSITION = (4, 3)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    from_id, to_id = REOPEN_TRANSITION
+    op.execute(
+        "INSERT INTO status_transitions (from_status_id, to_status_id, role_id) "
+        "SELECT f.status_id, t.status_id, r.id FROM statuses f, statuses t, user_roles r "
+        f"WHERE f.status_id = {from_id} AND t.status_id = {to_id} AND r.name = 'admin' "
+        "ON CONFLICT ON CONSTRAINT uq_status_transitions_from_to_role DO NOTHING"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    from_id, to_id = REOPEN_TRANSITION
+    op.execute(
+        "DELETE FROM status_transitions "
+        f"WHERE from_status_id = {from_id} AND to_status_id = {to_id} "
+        "AND role_id = (SELECT id FROM user_roles WHERE name = 'admin')"
+    )
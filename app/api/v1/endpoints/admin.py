@@ -1,13 +1,17 @@
 # Файл: app/api/v1/endpoints/admin.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from typing import List, Literal, Optional, Tuple
+from datetime import date, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 import io
 import csv
 from starlette.responses import StreamingResponse
 
+from app.core.bulk_import import read_import_rows
+from app.core.config import settings
 from app.core.dependencies import get_current_admin_user 
+from app.core.idempotency import IdempotentRequest, request_fingerprint
+from app.core.ticket_import import import_tickets as run_ticket_import
 from app.db.session import get_session
 from app import crud, models, schemas
 
@@ -20,39 +24,81 @@ async def create_ticket_for_user(
     *, 
     db: AsyncSession = Depends(get_session),
     ticket_in: schemas.ticket.AdminTicketCreate, # Исправлено
-    current_user: models.User = Depends(get_current_admin_user)
+    current_user: models.User = Depends(get_current_admin_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     Создает новую заявку от имени указанного пользователя (только для администраторов).
+
+    С заголовком `Idempotency-Key` повтор запроса возвращает первоначальный
+    ответ без создания второй заявки.
     """
-    # Проверяем, существует ли пользователь, от имени которого создается заявка
-    target_user = await crud.user.get_user_by_id(db=db, user_id=ticket_in.user_id)
-    if not target_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail=f"User with id {ticket_in.user_id} not found"
+    fingerprint = request_fingerprint("POST /admin/tickets", ticket_in.model_dump_json())
+    async with IdempotentRequest(
+        db, user_id=current_user.user_id, key=idempotency_key, fingerprint=fingerprint
+    ) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
+
+        # Проверяем, существует ли пользователь, от имени которого создается заявка
+        target_user = await crud.user.get_user_by_id(db=db, user_id=ticket_in.user_id)
+        if not target_user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, 
+                detail=f"User with id {ticket_in.user_id} not found"
+            )
+
+        # Создаем заявку, передавая все данные из AdminTicketCreate
+        # CRUD функция create_ticket ожидает схему TicketCreate, но мы передадим user_id явно
+        # Создаем объект TicketCreate из AdminTicketCreate, исключая user_id
+        ticket_create_obj = schemas.ticket.TicketCreate(**ticket_in.dict(exclude={'user_id'}))
+
+        # Вызываем CRUD функцию для создания, передавая объект и user_id
+        # Начальный статус берется из рабочего процесса (app.core.workflow)
+        try:
+            created_ticket = await crud.ticket.create_ticket(
+                db=db, 
+                obj_in=ticket_create_obj, 
+                user_id=ticket_in.user_id,
+                commit=False
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+        # Загружаем полную информацию о заявке, включая связи, чтобы соответствовать TicketRead
+        full_ticket = await crud.ticket.get_ticket(db=db, ticket_id=created_ticket.ticket_id, with_related=True)
+        if not full_ticket:
+            # Этого не должно случиться, но на всякий случай
+            raise HTTPException(status_code=500, detail="Failed to retrieve created ticket details after creation")
+
+        response = await idempotent.respond(
+            full_ticket, response_model=schemas.ticket.TicketRead, status_code=status.HTTP_201_CREATED
         )
-        
-    # Создаем заявку, передавая все данные из AdminTicketCreate
-    # CRUD функция create_ticket ожидает схему TicketCreate, но мы передадим user_id явно
-    # Создаем объект TicketCreate из AdminTicketCreate, исключая user_id
-    ticket_create_obj = schemas.ticket.TicketCreate(**ticket_in.dict(exclude={'user_id'}))
-    
-    # Вызываем CRUD функцию для создания, передавая объект и user_id
-    created_ticket = await crud.ticket.create_ticket(
-        db=db, 
-        obj_in=ticket_create_obj, 
-        user_id=ticket_in.user_id
-        # initial_status_id будет использован по умолчанию (1)
-    )
-    
-    # Загружаем полную информацию о заявке, включая связи, чтобы соответствовать TicketRead
-    full_ticket = await crud.ticket.get_ticket(db=db, ticket_id=created_ticket.ticket_id, with_related=True)
-    if not full_ticket:
-        # Этого не должно случиться, но на всякий случай
-        raise HTTPException(status_code=500, detail="Failed to retrieve created ticket details after creation")
+        # Отчеты сбрасываются после коммита, чтобы их не пересчитали до появления заявки
+        crud.report.invalidate([crud.report.DEVICE_REPORT], crud.report.today())
+        return response
+
+@router.post(
+    "/tickets/import",
+    response_model=schemas.ticket.TicketImportResult,
+    dependencies=[Depends(get_current_admin_user)]
+)
+async def import_tickets(
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Массовый импорт заявок из JSON или CSV (только для администраторов).
 
-    return full_ticket
+    Колонки: user_id, device_id, priority_id, description и необязательные
+    status_id, resolution_notes, created_at, closed_at. Ссылки проверяются
+    одним запросом на всю выборку, вставка — через COPY пачками по
+    TICKET_IMPORT_BATCH_SIZE. Строки с ошибками возвращаются в `errors`,
+    в ответе также время импорта и скорость вставки.
+    Для очень больших файлов используйте `python -m app.jobs.import_tickets`.
+    """
+    rows = await read_import_rows(request, max_rows=settings.TICKET_IMPORT_MAX_ROWS)
+    return await run_ticket_import(db, rows, batch_size=settings.TICKET_IMPORT_BATCH_SIZE)
 
 @router.get("/reports/tickets", response_class=StreamingResponse)
 async def export_tickets_report(
@@ -145,3 +191,149 @@ async def export_tickets_report(
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
+
+def _report_period(date_from: Optional[date], date_to: Optional[date]) -> Tuple[date, date]:
+    """
+    Период статистики и отчетов: по умолчанию последние 30 дней
+    (в часовом поясе STATS_TIMEZONE), не длиннее STATS_MAX_DAYS.
+    """
+    if date_to is None:
+        date_to = crud.report.today()
+    if date_from is None:
+        date_from = date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from не может быть позже date_to")
+    if (date_to - date_from).days + 1 > settings.STATS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Диапазон не может превышать {settings.STATS_MAX_DAYS} дней"
+        )
+    return date_from, date_to
+
+def _stats_bucket(opened: int, closed: int, close_seconds: int) -> dict:
+    """Счетчики среза статистики со средним временем закрытия."""
+    return {
+        "opened": opened,
+        "closed": closed,
+        "mean_time_to_close_seconds": round(close_seconds / closed, 1) if closed else None,
+    }
+
+@router.get("/stats", response_model=schemas.ticket_stats.TicketStatsRead)
+async def get_ticket_stats(
+    db: AsyncSession = Depends(get_session),
+    current_user: models.User = Depends(get_current_admin_user),
+    date_from: Optional[date] = Query(None, description="Первый день (по умолчанию — за 29 дней до date_to)"),
+    date_to: Optional[date] = Query(None, description="Последний день (по умолчанию — сегодня)"),
+):
+    """
+    Статистика по заявкам для панели администратора: создано и закрыто
+    по дням, закрытия по финальным статусам, разрезы по приоритетам
+    и типам устройств, среднее время закрытия.
+
+    Читается из дневной сводки `ticket_daily_stats` (одним запросом
+    с GROUPING SETS), а не группировкой по всем заявкам. Дни считаются
+    в часовом поясе STATS_TIMEZONE.
+    """
+    date_from, date_to = _report_period(date_from, date_to)
+    rows = await crud.ticket_stats.get_stats(db, date_from=date_from, date_to=date_to)
+    totals = _stats_bucket(0, 0, 0)
+    days = {}
+    by_status, by_priority, by_device_type = [], [], []
+    for row in rows:
+        bucket = _stats_bucket(row.opened, row.closed, row.close_seconds)
+        if row.grouping == crud.ticket_stats.GROUP_TOTAL:
+            totals = bucket
+        elif row.grouping == crud.ticket_stats.GROUP_DAY:
+            days[row.day] = bucket
+        elif row.grouping == crud.ticket_stats.GROUP_STATUS:
+            # Строки открытий (без статуса) в разрез по статусам не попадают
+            if row.status_id is not None:
+                by_status.append({"status_id": row.status_id, **bucket})
+        elif row.grouping == crud.ticket_stats.GROUP_PRIORITY:
+            by_priority.append({"priority_id": row.priority_id, **bucket})
+        elif row.grouping == crud.ticket_stats.GROUP_DEVICE_TYPE:
+            by_device_type.append({"device_type_id": row.device_type_id, **bucket})
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "timezone": settings.STATS_TIMEZONE,
+        "totals": totals,
+        "days": [
+            {"day": day, **days.get(day, _stats_bucket(0, 0, 0))}
+            for day in (date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1))
+        ],
+        "by_status": sorted(by_status, key=lambda item: item["status_id"]),
+        "by_priority": sorted(by_priority, key=lambda item: item["priority_id"]),
+        "by_device_type": sorted(by_device_type, key=lambda item: (item["device_type_id"] is None, item["device_type_id"] or 0)),
+    }
+
+@router.get("/reports/technicians", response_model=schemas.report.TechnicianReport)
+async def get_technician_report(
+    db: AsyncSession = Depends(get_session),
+    current_user: models.User = Depends(get_current_admin_user),
+    date_from: Optional[date] = Query(None, description="Первый день (по умолчанию — за 29 дней до date_to)"),
+    date_to: Optional[date] = Query(None, description="Последний день (по умолчанию — сегодня)"),
+    export_format: Literal["json", "csv"] = Query("json", alias="format", description="Формат ответа: json или csv"),
+):
+    """
+    Показатели техников по заявкам, закрытым за период: количество,
+    медиана и 90-й перцентиль времени от назначения до закрытия, доля
+    повторно открытых заявок, места в рейтинге.
+
+    Отчет считается одним SQL-запросом (percentile_cont, оконные функции)
+    и кэшируется по периоду; закрытие заявки сбрасывает кэш периодов,
+    в которые попадает текущий день. `format=csv` — выгрузка в CSV.
+    """
+    date_from, date_to = _report_period(date_from, date_to)
+    report = await crud.report.get_technician_report(db, date_from=date_from, date_to=date_to)
+
+    if export_format == "csv":
+        output = io.StringIO()
+        writer = csv.writer(output)
+        columns = schemas.report.TECHNICIAN_REPORT_COLUMNS
+        writer.writerow(columns)
+        for item in report["items"]:
+            writer.writerow([item[column] for column in columns])
+        filename = f"technicians_{date_from.isoformat()}_{date_to.isoformat()}.csv"
+        return StreamingResponse(
+            iter([output.getvalue()]),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "timezone": settings.STATS_TIMEZONE,
+        **report,
+    }
+
+@router.get("/reports/devices", response_model=schemas.report.DeviceReliabilityReport)
+async def get_device_report(
+    db: AsyncSession = Depends(get_session),
+    current_user: models.User = Depends(get_current_admin_user),
+    date_from: Optional[date] = Query(None, description="Первый день (по умолчанию — за 29 дней до date_to)"),
+    date_to: Optional[date] = Query(None, description="Последний день (по умолчанию — сегодня)"),
+    limit: int = Query(50, ge=1, le=1000, description="Сколько наименее надежных устройств вернуть"),
+):
+    """
+    Надежность устройств и типов устройств по заявкам, созданным за период:
+    число заявок, среднее время между заявками, среднее время решения
+    и места в рейтинге (1 — наименее надежные). Устройства упорядочены
+    по числу заявок; типы возвращаются все.
+
+    Отчет кэшируется по периоду; создание заявки сбрасывает кэш периодов,
+    в которые попадает текущий день.
+    """
+    date_from, date_to = _report_period(date_from, date_to)
+    report = await crud.report.get_device_report(db, date_from=date_from, date_to=date_to)
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "timezone": settings.STATS_TIMEZONE,
+        "generated_at": report["generated_at"],
+        "devices_total": len(report["devices"]),
+        "devices": report["devices"][:limit],
+        "device_types": report["device_types"],
+    }
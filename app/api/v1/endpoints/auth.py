@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
-from app import schemas # Импортируем модуль schemas
+from app import models, schemas # Импортируем модули models и schemas
 from app import crud # Импортируем модуль crud
 from app.core import security
+from app.core.dependencies import oauth2_scheme_optional
+from app.core.revocation import revocation_list
 from app.db.session import get_session # Предполагаем, что сессия получается так
 
 router = APIRouter()
@@ -38,17 +41,74 @@ async def login_for_access_token(
     # Загружаем роль пользователя для доступа к имени роли
     await db.refresh(user, ['role'])
 
-    # 4. Создаем данные для токена
-    token_data = {
+    # 4. Генерируем токен доступа и начинаем новую цепочку токенов обновления
+    access_token = security.create_access_token(data=_access_token_claims(user))
+    refresh_token, _ = await crud.refresh_token.create_refresh_token(db, user_id=user.user_id)
+
+    # 5. Возвращаем токены
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/refresh", response_model=schemas.token.Token, tags=["Authentication"])
+async def refresh_access_token(
+    *,
+    db: AsyncSession = Depends(get_session),
+    token_in: schemas.token.RefreshTokenRequest
+) -> Any:
+    """
+    Выдает новый токен доступа по токену обновления без проверки пароля.
+
+    Токен обновления одноразовый: в ответе возвращается новый, а предъявленный
+    становится недействительным. Повторное предъявление использованного токена
+    отзывает всю цепочку (признак утечки токена).
+    """
+    rotated = await crud.refresh_token.rotate_refresh_token(db, raw_token=token_in.refresh_token)
+    if rotated is None:
+        raise security.credentials_exception
+    refresh_token, db_token = rotated
+
+    # Пользователь с ролью загружается одним запросом; bcrypt не используется
+    user = await crud.user.get_user_by_id(db, user_id=db_token.user_id, with_role=True)
+    if user is None:
+        raise security.credentials_exception
+
+    access_token = security.create_access_token(data=_access_token_claims(user))
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT, tags=["Authentication"])
+async def logout(
+    *,
+    db: AsyncSession = Depends(get_session),
+    token_in: schemas.token.RefreshTokenRequest,
+    access_token: Optional[str] = Depends(oauth2_scheme_optional)
+) -> None:
+    """
+    Завершает сеанс: отзывает цепочку, к которой относится токен обновления,
+    и текущий токен доступа (если он передан в заголовке Authorization).
+    Неизвестные или уже недействительные токены не считаются ошибкой.
+    """
+    db_token = await crud.refresh_token.get_refresh_token(db, raw_token=token_in.refresh_token)
+    if db_token is not None:
+        await crud.refresh_token.revoke_family(db, family_id=db_token.family_id)
+
+    if access_token:
+        try:
+            token_data = security.decode_access_token(access_token)
+        except HTTPException:
+            return
+        if token_data.jti and token_data.exp:
+            row = await crud.token_revocation.revoke_token(
+                db,
+                jti=token_data.jti,
+                user_id=token_data.user_id,
+                expires_at=datetime.fromtimestamp(token_data.exp, tz=timezone.utc),
+                reason="logout",
+            )
+            revocation_list.add([row])
+
+def _access_token_claims(user: models.User) -> Dict[str, Any]:
+    """Формирует данные для токена доступа. Роль пользователя должна быть загружена."""
+    return {
         "sub": user.username, # Стандартное поле 'subject' для JWT
         "user_id": user.user_id,
         "role": user.role.name # Получаем имя роли из связанной модели UserRole
     }
-
-    # 5. Генерируем токен доступа
-    access_token = security.create_access_token(data=token_data)
-
-    # 6. Возвращаем токен
-    return {"access_token": access_token, "token_type": "bearer"}
-
-# Эндпоинт /me будет добавлен позже
\ No newline at end of file
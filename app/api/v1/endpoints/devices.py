@@ -1,10 +1,16 @@
 # Файл: app/api/v1/endpoints/devices.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Set
 
 from app import crud, models, schemas
-from app.db.session import get_session
+from app.db.session import get_session, AsyncSessionFactory
+from app.core.config import settings
+from app.core.bulk_import import read_import_rows, format_validation_error
+from app.core.pagination import encode_cursor, decode_cursor
 from app.core.dependencies import get_current_user, get_current_admin_user
 
 router = APIRouter()
@@ -60,6 +66,133 @@ async def read_devices_admin(
     devices = await crud.device.get_devices(db, skip=skip, limit=limit, device_type_id=device_type_id)
     return devices
 
+@router.post(
+    "/admin/devices/import",
+    response_model=schemas.device.DeviceImportResult,
+    dependencies=[Depends(get_current_admin_user)], # Защита: только админ
+    tags=["Admin - Devices"]
+)
+async def import_devices(
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+) -> Any:
+    """
+    Массовый импорт (создание или обновление) устройств из CSV или JSON (только для администраторов).
+
+    Колонки: device_id, name, device_type_id или device_type (название типа),
+    inventory_number — тот же формат, что отдает экспорт. Существующие устройства
+    обновляются по device_id. Строки с ошибками пропускаются и возвращаются
+    в `errors`, остальные загружаются одной транзакцией (COPY во временную
+    таблицу и один INSERT ... ON CONFLICT).
+    """
+    rows = await read_import_rows(request, max_rows=settings.DEVICE_IMPORT_MAX_ROWS)
+    type_ids_by_name = await crud.device_type.get_device_type_ids_by_name(db)
+    known_type_ids = set(type_ids_by_name.values())
+
+    errors: List[schemas.bulk_import.ImportRowError] = []
+    records = []
+    row_numbers: Dict[int, int] = {}  # device_id -> номер строки
+    seen_inventory_numbers: Set[str] = set()
+    for number, raw in enumerate(rows, start=1):
+        try:
+            row = schemas.device.DeviceImportRow.model_validate(raw)
+        except ValidationError as e:
+            errors.append(schemas.bulk_import.ImportRowError(
+                row=number, identifier=str(raw.get("device_id") or "") or None, errors=format_validation_error(e)
+            ))
+            continue
+        row_errors = []
+        device_type_id = row.device_type_id
+        if device_type_id is None and row.device_type is not None:
+            device_type_id = type_ids_by_name.get(row.device_type)
+            if device_type_id is None:
+                row_errors.append(f"device_type: тип '{row.device_type}' не найден")
+        elif device_type_id is not None:
+            if device_type_id not in known_type_ids:
+                row_errors.append(f"device_type_id: тип с ID {device_type_id} не найден")
+            elif row.device_type is not None and type_ids_by_name.get(row.device_type) != device_type_id:
+                row_errors.append("device_type: название не соответствует device_type_id")
+        if row.device_id in row_numbers:
+            row_errors.append("device_id: повторяется в импортируемых данных")
+        if row.inventory_number is not None and row.inventory_number in seen_inventory_numbers:
+            row_errors.append("inventory_number: повторяется в импортируемых данных")
+        if row_errors:
+            errors.append(schemas.bulk_import.ImportRowError(row=number, identifier=str(row.device_id), errors=row_errors))
+            continue
+        row_numbers[row.device_id] = number
+        if row.inventory_number is not None:
+            seen_inventory_numbers.add(row.inventory_number)
+        records.append((row.device_id, row.name, device_type_id, row.inventory_number))
+
+    inserted, updated, conflicts = await crud.device.upsert_devices_bulk(db, records=records)
+    for device_id, inventory_number in conflicts:
+        errors.append(schemas.bulk_import.ImportRowError(
+            row=row_numbers[device_id],
+            identifier=str(device_id),
+            errors=[f"inventory_number: '{inventory_number}' уже принадлежит другому устройству"],
+        ))
+
+    errors.sort(key=lambda error: error.row)
+    return schemas.device.DeviceImportResult(
+        total=len(rows),
+        inserted=inserted,
+        updated=updated,
+        unchanged=len(records) - len(conflicts) - inserted - updated,
+        failed=len(errors),
+        errors=errors,
+    )
+
+async def _stream_devices_csv() -> AsyncIterator[bytes]:
+    """
+    Отдает CSV выгрузки устройств по мере чтения из БД.
+
+    COPY выполняется в отдельной задаче со своей сессией (сессия запроса
+    к моменту отправки тела ответа может быть уже закрыта); ограниченная
+    очередь не дает COPY обогнать медленного клиента.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+
+    async def produce() -> None:
+        try:
+            async with AsyncSessionFactory() as db:
+                await crud.device.copy_devices_csv(db, output=queue.put)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        # Клиент мог отключиться — останавливаем COPY
+        task.cancel()
+
+@router.get(
+    "/admin/devices/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_admin_user)], # Защита: только админ
+    tags=["Admin - Devices"]
+)
+async def export_devices() -> StreamingResponse:
+    """
+    Потоковая выгрузка всех устройств в CSV (только для администраторов).
+    Формат совместим с массовым импортом.
+    """
+    return StreamingResponse(
+        _stream_devices_csv(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="devices.csv"'},
+    )
+
 @router.put(
     "/admin/devices/{device_id}",
     response_model=schemas.device.DeviceRead,
@@ -117,6 +250,46 @@ async def delete_device(
 
 # --- Эндпоинты для Всех Аутентифицированных Пользователей ---
 
+@router.get(
+    "/search",
+    response_model=schemas.device.DeviceSearchPage,
+    dependencies=[Depends(get_current_user)], # Защита: любой аутентифицированный пользователь
+    tags=["Devices"]
+)
+async def search_devices(
+    db: AsyncSession = Depends(get_session),
+    q: Optional[str] = Query(None, max_length=100, description="Часть названия или инвентарного номера"),
+    device_type_id: Optional[int] = Query(None, description="Фильтр по ID типа устройства"),
+    limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из предыдущего ответа"),
+) -> Any:
+    """
+    Поиск устройств для выбора при создании заявки (для всех аутентифицированных пользователей).
+
+    Ищет по вхождению и началу названия и инвентарного номера, а также нечетко
+    по названию. Совпадения по инвентарному номеру идут первыми. Для следующей
+    страницы передайте `next_cursor` из ответа в параметр `cursor`.
+    """
+    after = None
+    if cursor:
+        try:
+            rank, name, device_id = decode_cursor(cursor, 3)
+            if not isinstance(name, str):
+                raise ValueError("Invalid cursor")
+            after = (int(rank), name, int(device_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+    rows = await crud.device.search_devices(
+        db, query=q, device_type_id=device_type_id, limit=limit + 1, after=after
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.rank, last.name, last.device_id])
+    return schemas.device.DeviceSearchPage(items=rows, next_cursor=next_cursor)
+
 @router.get(
     "",
     response_model=List[schemas.device.DeviceRead],
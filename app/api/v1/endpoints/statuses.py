@@ -1,7 +1,7 @@
 # Файл: app/api/v1/endpoints/statuses.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Any
+from typing import List, Any, Optional
 
 from app import crud, models, schemas
 from app.db.session import get_session
@@ -119,6 +119,77 @@ async def delete_status(
     return deleted_status
 
 
+# --- Рабочий процесс: разрешенные переходы между статусами (только админ) ---
+
+@router.get(
+    "/admin/status-transitions",
+    response_model=List[schemas.status.StatusTransitionRead],
+    dependencies=[Depends(get_current_admin_user)], # Защита: только админ
+    tags=["Admin - Statuses"]
+)
+async def read_status_transitions(
+    db: AsyncSession = Depends(get_session),
+    from_status_id: Optional[int] = Query(None, description="Только переходы из этого статуса")
+) -> Any:
+    """
+    Получает список разрешенных переходов между статусами (только для администраторов).
+    Переход без role_id разрешен любой роли, которая может менять статус заявок.
+    """
+    return await crud.status_transition.get_transitions(db, from_status_id=from_status_id)
+
+@router.post(
+    "/admin/status-transitions",
+    response_model=schemas.status.StatusTransitionRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_admin_user)], # Защита: только админ
+    tags=["Admin - Statuses"]
+)
+async def create_status_transition(
+    *,
+    db: AsyncSession = Depends(get_session),
+    transition_in: schemas.status.StatusTransitionCreate
+) -> Any:
+    """
+    Разрешает переход между статусами (только для администраторов).
+    """
+    if transition_in.from_status_id == transition_in.to_status_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Transition must connect two different statuses",
+        )
+    for status_id in (transition_in.from_status_id, transition_in.to_status_id):
+        if not await crud.status.get_status(db, status_id=status_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Status {status_id} not found")
+    if transition_in.role_id is not None and not await crud.user_role.get_user_role(db, role_id=transition_in.role_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+    existing = await crud.status_transition.get_transition_by_edge(db, **transition_in.model_dump())
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This transition already exists",
+        )
+    return await crud.status_transition.create_transition(db=db, obj_in=transition_in)
+
+@router.delete(
+    "/admin/status-transitions/{transition_id}",
+    response_model=schemas.status.StatusTransitionRead,
+    dependencies=[Depends(get_current_admin_user)], # Защита: только админ
+    tags=["Admin - Statuses"]
+)
+async def delete_status_transition(
+    *,
+    db: AsyncSession = Depends(get_session),
+    transition_id: int
+) -> Any:
+    """
+    Запрещает переход между статусами, удаляя его (только для администраторов).
+    """
+    deleted = await crud.status_transition.remove_transition(db=db, transition_id=transition_id)
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Status transition not found")
+    return deleted
+
+
 # --- Эндпоинт для Всех Аутентифицированных Пользователей ---
 
 @router.get(
@@ -1,7 +1,11 @@
 # Файл: app/api/v1/endpoints/tickets.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
-from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, UploadFile, File, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, List, Literal, Optional, Sequence
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 import shutil
 import os
 import uuid
@@ -11,10 +15,70 @@ from app import models, schemas, crud
 from app.core.dependencies import get_current_user
 from app.db.session import get_session
 from app.core.config import settings # Импорт настроек
+from app.core import storage, ticket_events
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.idempotency import IdempotentRequest, request_fingerprint
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.workflow import StatusWorkflow, get_workflow
 from app.schemas.file import FileCreate
 
 router = APIRouter()
 
+# --- Частичные ответы (fields= / include=) ---
+
+FIELDS_DESCRIPTION = (
+    "Колонки заявки через запятую (ticket_id возвращается всегда): "
+    + ", ".join(crud.ticket.TICKET_FIELDS)
+)
+INCLUDE_DESCRIPTION = (
+    "Связанные объекты через запятую (остальные не загружаются): "
+    + ", ".join(crud.ticket.TICKET_RELATIONS)
+)
+
+# Схемы для сериализации связей "многие к одному" в частичном ответе
+_RELATION_SCHEMAS = {
+    "user": schemas.user.UserRead,
+    "device": schemas.device.DeviceRead,
+    "priority": schemas.priority.PriorityRead,
+    "status": schemas.status.StatusRead,
+}
+
+def _parse_list_param(value: Optional[str], allowed: Sequence[str], name: str) -> Optional[List[str]]:
+    """Разбирает параметр-список через запятую и проверяет допустимые значения."""
+    if value is None:
+        return None
+    items = list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Недопустимые значения {name}: {', '.join(unknown)}. Допустимые: {', '.join(allowed)}"
+        )
+    return items
+
+def _sparse_ticket(ticket: models.Ticket, fields: Optional[List[str]], include: List[str]) -> Dict[str, Any]:
+    """Собирает частичное представление заявки только из загруженных колонок и связей."""
+    data: Dict[str, Any] = {"ticket_id": ticket.ticket_id}
+    for name in fields if fields is not None else crud.ticket.TICKET_FIELDS:
+        data[name] = getattr(ticket, name)
+    for name in include:
+        value = getattr(ticket, name)
+        if name == "files":
+            data[name] = [schemas.file.FileRead.model_validate(item) for item in value]
+        elif name == "assignments":
+            data[name] = [
+                schemas.technician_assignment.TechnicianAssignmentWithDetails.model_validate(item, from_attributes=True)
+                for item in value
+            ]
+        else:
+            data[name] = _RELATION_SCHEMAS[name].model_validate(value) if value is not None else None
+    return data
+
+IDEMPOTENCY_KEY_DESCRIPTION = (
+    "Ключ идемпотентности: повтор запроса с тем же ключом возвращает "
+    "первоначальный ответ без повторного создания"
+)
+
 # --- Эндпоинты для работы с заявками ---
 
 @router.post(
@@ -27,80 +91,469 @@ async def create_ticket(
     *,
     db: AsyncSession = Depends(get_session),
     ticket_in: schemas.ticket.TicketCreate,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", description=IDEMPOTENCY_KEY_DESCRIPTION)
 ) -> Any:
     """
     Создает новую заявку.
     
     - Автоматически проставляет user_id из токена аутентификации
-    - Автоматически устанавливает статус "Новая" (или другой начальный статус)
+    - Автоматически устанавливает начальный статус рабочего процесса (статус с is_initial)
+    - С заголовком `Idempotency-Key` повтор запроса не создает вторую заявку
     """
-    # Получение ID начального статуса (по умолчанию 1 - "Новая")
-    initial_status_id = 1  # В продакшене можно получать из конфигурации или БД
-    
-    # Проверяем существование устройства перед созданием заявки
-    device = await crud.device.get_device(db=db, device_id=ticket_in.device_id)
-    if not device:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Устройство с ID {ticket_in.device_id} не найдено"
+    fingerprint = request_fingerprint("POST /tickets", ticket_in.model_dump_json())
+    async with IdempotentRequest(
+        db, user_id=current_user.user_id, key=idempotency_key, fingerprint=fingerprint
+    ) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
+
+        # Проверяем существование устройства перед созданием заявки
+        device = await crud.device.get_device(db=db, device_id=ticket_in.device_id)
+        if not device:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Устройство с ID {ticket_in.device_id} не найдено"
+            )
+        
+        # Начальный статус берется из рабочего процесса (app.core.workflow)
+        try:
+            ticket = await crud.ticket.create_ticket(
+                db=db, 
+                obj_in=ticket_in, 
+                user_id=current_user.user_id,
+                commit=False
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        
+        # Загружаем связанные файлы для ответа
+        await db.refresh(ticket, ['files'])
+        
+        response = await idempotent.respond(
+            ticket, response_model=schemas.ticket.TicketRead, status_code=status.HTTP_201_CREATED
         )
-    
-    ticket = await crud.ticket.create_ticket(
-        db=db, 
-        obj_in=ticket_in, 
-        user_id=current_user.user_id, 
-        initial_status_id=initial_status_id
-    )
-    
-    # Загружаем связанные файлы для ответа
-    await db.refresh(ticket, ['files'])
-    
-    return ticket
+        # Отчеты сбрасываются после коммита, чтобы их не пересчитали до появления заявки
+        crud.report.invalidate([crud.report.DEVICE_REPORT], crud.report.today())
+        return response
 
 @router.get(
     "", 
-    response_model=List[schemas.ticket.TicketDetailRead],
+    response_model=List[schemas.ticket.TicketListRead],
     tags=["Tickets"]
 )
 async def read_tickets(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     current_user: models.User = Depends(get_current_user),
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
     limit: int = Query(100, ge=1, le=100, description="Максимальное количество записей для возврата"),
-    user_id: Optional[int] = Query(None, description="Фильтр по ID пользователя"),
-    status_id: Optional[int] = Query(None, description="Фильтр по ID статуса"),
-    priority_id: Optional[int] = Query(None, description="Фильтр по ID приоритета"),
-    device_id: Optional[int] = Query(None, description="Фильтр по ID устройства"),
+    user_id: Optional[List[int]] = Query(None, description="Фильтр по ID пользователя (можно несколько: user_id=1&user_id=2)"),
+    status_id: Optional[List[int]] = Query(None, description="Фильтр по ID статуса (можно несколько)"),
+    priority_id: Optional[List[int]] = Query(None, description="Фильтр по ID приоритета (можно несколько)"),
+    device_id: Optional[List[int]] = Query(None, description="Фильтр по ID устройства (можно несколько)"),
+    state: Optional[Literal["open", "closed"]] = Query(None, description="open — заявки в нефинальных статусах, closed — в финальных"),
+    created_from: Optional[datetime] = Query(None, description="Создана не раньше"),
+    created_to: Optional[datetime] = Query(None, description="Создана не позже"),
+    updated_from: Optional[datetime] = Query(None, description="Обновлена не раньше"),
+    updated_to: Optional[datetime] = Query(None, description="Обновлена не позже"),
+    closed_from: Optional[datetime] = Query(None, description="Закрыта не раньше"),
+    closed_to: Optional[datetime] = Query(None, description="Закрыта не позже"),
     search: Optional[str] = Query(None, description="Поиск по описанию заявки"),
-    sort_by: str = Query("created_at", description="Поле для сортировки"),
-    sort_desc: bool = Query(True, description="Сортировка по убыванию")
+    assignee_id: Optional[int] = Query(None, description="Только заявки, назначенные на техника с этим ID"),
+    unassigned: bool = Query(False, description="Только заявки без назначенных техников"),
+    sort_by: str = Query("created_at", description="Поле для сортировки (например, created_at, updated_at, last_activity_at)"),
+    sort_desc: bool = Query(True, description="Сортировка по убыванию"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION)
 ) -> Any:
     """
     Получает список всех заявок с возможностью фильтрации, сортировки и пагинации.
+
+    С `fields` и/или `include` возвращается частичное представление: из БД
+    выбираются только указанные колонки и загружаются только указанные связи.
+    Без них возвращаются все поля и связи "многие к одному"; файлы и назначения
+    в список не загружаются — вместо них в заявке есть `files_count`,
+    `total_files_size` и `assignees_count` (сами файлы и назначения можно
+    запросить через `include=files,assignments`).
+
+    Для "моих заявок" техника передайте `assignee_id` равным своему ID,
+    для очереди нераспределенных — `unassigned=true`. Фильтры по ID принимают
+    несколько значений, `state` отбирает открытые или закрытые заявки по
+    признаку финального статуса; все фильтры объединяются в один запрос.
+
+    Ответ содержит слабый ETag, вычисляемый агрегатом по отфильтрованным заявкам
+    (количество и максимальная дата изменения; изменение файлов и назначений
+    тоже обновляет дату изменения заявки).
+    При совпадении с If-None-Match возвращается 304 без загрузки списка.
     """
+    if assignee_id is not None and unassigned:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Параметры assignee_id и unassigned нельзя использовать вместе"
+        )
+    field_list = _parse_list_param(fields, crud.ticket.TICKET_FIELDS, "fields")
+    include_list = _parse_list_param(include, crud.ticket.TICKET_RELATIONS, "include")
+
     # Проверяем роль пользователя для определения ограничений
     # Получаем роль пользователя
     await db.refresh(current_user, ['role'])
     user_role = current_user.role.name if current_user.role else "user"
+
+    filter_args = dict(
+        user_id=user_id,
+        status_id=status_id,
+        priority_id=priority_id,
+        device_id=device_id,
+        search=search,
+        start_date=created_from,
+        end_date=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+        closed_from=closed_from,
+        closed_to=closed_to,
+        is_closed=None if state is None else state == "closed",
+        assignee_id=assignee_id,
+        unassigned=unassigned,
+    )
+    # Условный GET: агрегат по тем же фильтрам вместо загрузки страницы
+    version = await crud.ticket.get_tickets_version(db, **filter_args)
+    etag = make_etag(request.url.query, *version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
     
     # Получаем заявки с учетом фильтров
     tickets = await crud.ticket.get_tickets(
         db=db,
         skip=skip,
         limit=limit,
-        user_id=user_id,
-        status_id=status_id,
-        priority_id=priority_id,
-        device_id=device_id,
-        search=search,
         sort_by=sort_by,
         sort_desc=sort_desc,
-        with_related=True
+        with_related=True,
+        fields=field_list,
+        include=include_list,
+        **filter_args
     )
     
+    if field_list is not None or include_list is not None:
+        # Частичный ответ не соответствует TicketListRead — отдаем его напрямую
+        sparse = JSONResponse(jsonable_encoder([
+            _sparse_ticket(ticket, field_list, include_list or []) for ticket in tickets
+        ]))
+        set_etag(sparse, etag)
+        return sparse
+    set_etag(response, etag)
     return tickets
 
+@router.post(
+    "/batch-get",
+    response_model=schemas.ticket.TicketBatchGetResult,
+    tags=["Tickets"]
+)
+async def batch_get_tickets(
+    *,
+    db: AsyncSession = Depends(get_session),
+    batch_in: schemas.ticket.TicketBatchGetRequest,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Получает несколько заявок по списку ID за один запрос.
+
+    Заявки загружаются одним запросом `IN` со всеми связанными объектами
+    (как в GET /tickets/{id}). Ответ сгруппирован по ID: для найденных заявок
+    `status=200` и `ticket`, для отсутствующих — `status=404` и `detail`.
+    Повторяющиеся ID возвращаются один раз.
+    """
+    ticket_ids = list(dict.fromkeys(batch_in.ids))
+    if len(ticket_ids) > settings.TICKET_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Слишком много ID: {len(ticket_ids)} (максимум {settings.TICKET_BATCH_MAX_IDS})"
+        )
+    tickets = await crud.ticket.get_tickets_by_ids(db=db, ticket_ids=ticket_ids)
+    found = {ticket.ticket_id: ticket for ticket in tickets}
+    return {
+        "items": {
+            ticket_id: (
+                {"status": status.HTTP_200_OK, "ticket": found[ticket_id]}
+                if ticket_id in found
+                else {"status": status.HTTP_404_NOT_FOUND, "detail": "Заявка не найдена"}
+            )
+            for ticket_id in ticket_ids
+        }
+    }
+
+# --- Массовые операции ---
+# Регистрируются до маршрутов /{ticket_id}/..., чтобы "bulk" не разбирался как ID
+
+def _bulk_filter_args(bulk_filter: schemas.ticket.TicketBulkFilter) -> Dict[str, Any]:
+    """Переводит фильтр массовой операции в аргументы crud.ticket (как в списке заявок)."""
+    data = bulk_filter.model_dump()
+    state = data.pop("state")
+    data["start_date"] = data.pop("created_from")
+    data["end_date"] = data.pop("created_to")
+    data["is_closed"] = None if state is None else state == "closed"
+    return data
+
+async def _lock_bulk_targets(
+    db: AsyncSession, target: schemas.ticket.TicketBulkTarget
+) -> tuple:
+    """
+    Блокирует заявки, выбранные по ids или filter.
+
+    Returns:
+        (словарь {ticket_id: строка (is_closed, status_id, priority_id)}, список ID из запроса, которых нет в базе)
+    """
+    if target.ids is not None:
+        ticket_ids = list(dict.fromkeys(target.ids))
+        if len(ticket_ids) > settings.TICKET_BULK_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Слишком много ID: {len(ticket_ids)} (максимум {settings.TICKET_BULK_MAX_IDS})"
+            )
+        locked = await crud.ticket.lock_bulk_targets(db=db, ticket_ids=ticket_ids)
+        return locked, [ticket_id for ticket_id in ticket_ids if ticket_id not in locked]
+    if target.filter.assignee_id is not None and target.filter.unassigned:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Параметры assignee_id и unassigned нельзя использовать вместе"
+        )
+    locked = await crud.ticket.lock_bulk_targets(db=db, filter_args=_bulk_filter_args(target.filter))
+    return locked, []
+
+def _bulk_result(
+    locked: Dict[int, Any],
+    not_found: List[int],
+    eligible: List[int],
+    updated: List[int],
+    skipped_reason: str = "closed"
+) -> Dict[str, Any]:
+    """
+    Итог массовой операции: измененные, пропущенные и ненайденные заявки.
+    Заявки вне eligible попадают в skipped[skipped_reason], не измененные — в skipped.unchanged.
+    """
+    updated_set = set(updated)
+    eligible_set = set(eligible)
+    skipped = {
+        skipped_reason: [ticket_id for ticket_id in locked if ticket_id not in eligible_set],
+        "unchanged": [ticket_id for ticket_id in eligible if ticket_id not in updated_set],
+    }
+    return {
+        "matched": len(locked),
+        "updated": len(updated),
+        "updated_ids": sorted(updated),
+        "not_found": not_found,
+        "skipped": {reason: ids for reason, ids in skipped.items() if ids},
+    }
+
+async def _get_staff_role(db: AsyncSession, current_user: models.User, detail: str) -> str:
+    """Возвращает роль пользователя; обычным пользователям — 403 с переданным текстом."""
+    await db.refresh(current_user, ['role'])
+    user_role = current_user.role.name if current_user.role else "user"
+    if user_role == "user":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+    return user_role
+
+def _check_status_transition(
+    status_workflow: StatusWorkflow, user_role: str, from_status_id: int, to_status_id: int
+) -> bool:
+    """
+    Проверяет переход по графу рабочего процесса (без запросов к БД).
+
+    Returns:
+        Является ли новый статус финальным.
+    """
+    if not status_workflow.status_exists(to_status_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Статус с ID {to_status_id} не найден"
+        )
+    if not status_workflow.can_transition(user_role, from_status_id, to_status_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Переход из статуса {from_status_id} в статус {to_status_id} не разрешен для роли {user_role}"
+        )
+    return status_workflow.is_final(to_status_id)
+
+@router.post(
+    "/bulk/status",
+    response_model=schemas.ticket.TicketBulkResult,
+    tags=["Tickets"]
+)
+async def bulk_update_ticket_status(
+    *,
+    db: AsyncSession = Depends(get_session),
+    bulk_in: schemas.ticket.TicketBulkStatusUpdate,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Меняет статус набора заявок (по `ids` или `filter`) одним UPDATE в одной транзакции.
+
+    Права и проверки — как у POST /tickets/{id}/status: обычным пользователям
+    запрещено, при финальном статусе обязательны `resolution_notes` и
+    проставляется дата закрытия. Заявки, для текущего статуса которых переход
+    не разрешен рабочим процессом, пропускаются (skipped.transition_not_allowed).
+    """
+    user_role = await _get_staff_role(db, current_user, "Обычные пользователи не могут изменять статус заявок")
+
+    status_workflow = await get_workflow(db)
+    if not status_workflow.status_exists(bulk_in.status_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Статус с ID {bulk_in.status_id} не найден"
+        )
+    is_closing = status_workflow.is_final(bulk_in.status_id)
+    if is_closing and not bulk_in.resolution_notes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="При закрытии заявки необходимо указать примечания по решению"
+        )
+
+    locked, not_found = await _lock_bulk_targets(db, bulk_in)
+    eligible = [
+        ticket_id for ticket_id, target in locked.items()
+        if status_workflow.can_transition(user_role, target.status_id, bulk_in.status_id)
+    ]
+    updated = await crud.ticket.bulk_update_status(
+        db=db,
+        ticket_ids=eligible,
+        status_id=bulk_in.status_id,
+        resolution_notes=bulk_in.resolution_notes,
+        is_closing=is_closing
+    ) if eligible else []
+    for ticket_id in updated:
+        ticket_events.event_buffer.record(
+            ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_STATUS_CHANGED,
+            changes={"status_id": {"old": locked[ticket_id].status_id, "new": bulk_in.status_id}}
+        )
+    return _bulk_result(locked, not_found, eligible, updated, skipped_reason="transition_not_allowed")
+
+@router.post(
+    "/bulk/priority",
+    response_model=schemas.ticket.TicketBulkResult,
+    tags=["Tickets"]
+)
+async def bulk_update_ticket_priority(
+    *,
+    db: AsyncSession = Depends(get_session),
+    bulk_in: schemas.ticket.TicketBulkPriorityUpdate,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Меняет приоритет набора заявок одним UPDATE в одной транзакции.
+
+    Как и в PATCH /tickets/{id}: обычные пользователи приоритет не меняют,
+    закрытые заявки не редактируются (попадают в skipped.closed).
+    """
+    await _get_staff_role(db, current_user, "Обычные пользователи не могут изменять приоритет заявок")
+
+    priority = await crud.priority.get_priority(db=db, priority_id=bulk_in.priority_id)
+    if not priority:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Приоритет с ID {bulk_in.priority_id} не найден"
+        )
+
+    locked, not_found = await _lock_bulk_targets(db, bulk_in)
+    eligible = [ticket_id for ticket_id, target in locked.items() if not target.is_closed]
+    updated = await crud.ticket.bulk_update_priority(
+        db=db, ticket_ids=eligible, priority_id=bulk_in.priority_id
+    ) if eligible else []
+    for ticket_id in updated:
+        ticket_events.event_buffer.record(
+            ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_UPDATED,
+            changes={"priority_id": {"old": locked[ticket_id].priority_id, "new": bulk_in.priority_id}}
+        )
+    return _bulk_result(locked, not_found, eligible, updated)
+
+@router.post(
+    "/bulk/assign",
+    response_model=schemas.ticket.TicketBulkResult,
+    tags=["Tickets"]
+)
+async def bulk_assign_technician(
+    *,
+    db: AsyncSession = Depends(get_session),
+    bulk_in: schemas.ticket.TicketBulkAssignment,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Назначает техника на набор заявок одним INSERT ... SELECT в одной транзакции.
+
+    Права — как у POST /tickets/{id}/assign: техники назначают только себя,
+    администраторы — любого техника. Закрытые заявки пропускаются,
+    существующие назначения попадают в skipped.unchanged.
+    """
+    user_role = await _get_staff_role(db, current_user, "Обычные пользователи не могут назначать техников на заявки")
+    if user_role == "technician" and bulk_in.technician_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Техники могут назначать только себя на заявки"
+        )
+
+    technician = await crud.user.get_user_by_id(db=db, user_id=bulk_in.technician_id)
+    if not technician:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Пользователь с ID {bulk_in.technician_id} не найден"
+        )
+    await db.refresh(technician, ['role'])
+    if not technician.role or technician.role.name != "technician":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Пользователь с ID {bulk_in.technician_id} не является техником"
+        )
+
+    locked, not_found = await _lock_bulk_targets(db, bulk_in)
+    eligible = [ticket_id for ticket_id, target in locked.items() if not target.is_closed]
+    updated = await crud.technician_assignment.assign_technician_bulk(
+        db=db, ticket_ids=eligible, technician_id=bulk_in.technician_id
+    ) if eligible else []
+    for ticket_id in updated:
+        ticket_events.event_buffer.record(
+            ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_TECHNICIAN_ASSIGNED,
+            changes={"technician_id": {"old": None, "new": bulk_in.technician_id}}
+        )
+    return _bulk_result(locked, not_found, eligible, updated)
+
+@router.post(
+    "/bulk/unassign",
+    response_model=schemas.ticket.TicketBulkResult,
+    tags=["Tickets"]
+)
+async def bulk_unassign_technician(
+    *,
+    db: AsyncSession = Depends(get_session),
+    bulk_in: schemas.ticket.TicketBulkAssignment,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Снимает техника с набора заявок одним DELETE в одной транзакции.
+
+    Права — как у DELETE /tickets/{id}/unassign/{technician_id}: техники
+    снимают только себя. Закрытые заявки пропускаются, заявки без этого
+    техника попадают в skipped.unchanged.
+    """
+    user_role = await _get_staff_role(db, current_user, "Обычные пользователи не могут снимать техников с заявок")
+    if user_role == "technician" and bulk_in.technician_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Техники могут снимать только себя с заявок"
+        )
+
+    locked, not_found = await _lock_bulk_targets(db, bulk_in)
+    eligible = [ticket_id for ticket_id, target in locked.items() if not target.is_closed]
+    updated = await crud.technician_assignment.remove_technician_bulk(
+        db=db, ticket_ids=eligible, technician_id=bulk_in.technician_id
+    ) if eligible else []
+    for ticket_id in updated:
+        ticket_events.event_buffer.record(
+            ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_TECHNICIAN_REMOVED,
+            changes={"technician_id": {"old": bulk_in.technician_id, "new": None}}
+        )
+    return _bulk_result(locked, not_found, eligible, updated)
+
 @router.get(
     "/{ticket_id}", 
     response_model=schemas.ticket.TicketDetailRead,
@@ -108,20 +561,231 @@ async def read_tickets(
 )
 async def read_ticket(
     *,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     ticket_id: int,
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION)
 ) -> Any:
     """
     Получает детальную информацию о заявке по её ID.
     Все пользователи могут просматривать любую заявку.
+
+    `fields` и `include` работают так же, как в списке заявок.
+
+    Ответ содержит слабый ETag (updated_at заявки и ее счетчики файлов,
+    назначений и комментариев). При совпадении с If-None-Match возвращается 304 — заявка
+    при этом не загружается и не сериализуется.
     """
+    field_list = _parse_list_param(fields, crud.ticket.TICKET_FIELDS, "fields")
+    include_list = _parse_list_param(include, crud.ticket.TICKET_RELATIONS, "include")
+
+    version = await crud.ticket.get_ticket_version(db=db, ticket_id=ticket_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
+    etag = make_etag(request.url.query, *version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
     # Получаем заявку с загрузкой связанных объектов
-    ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id, with_related=True)
+    ticket = await crud.ticket.get_ticket(
+        db=db, ticket_id=ticket_id, with_related=True, fields=field_list, include=include_list
+    )
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
+    if field_list is not None or include_list is not None:
+        sparse = JSONResponse(jsonable_encoder(_sparse_ticket(ticket, field_list, include_list or [])))
+        set_etag(sparse, etag)
+        return sparse
+    set_etag(response, etag)
     return ticket
 
+async def _check_ticket_access(db: AsyncSession, ticket_id: int, current_user: models.User) -> str:
+    """
+    Проверяет, что заявка существует и доступна пользователю (обычные
+    пользователи — только свои заявки); загружается только user_id заявки.
+
+    Returns:
+        Роль пользователя.
+    """
+    await db.refresh(current_user, ['role'])
+    user_role = current_user.role.name if current_user.role else "user"
+    ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id, fields=["user_id"], include=[])
+    if not ticket:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
+    if user_role == "user" and ticket.user_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для доступа к этой заявке"
+        )
+    return user_role
+
+@router.get(
+    "/{ticket_id}/events",
+    response_model=schemas.ticket.TicketEventPage,
+    tags=["Tickets"]
+)
+async def read_ticket_events(
+    *,
+    db: AsyncSession = Depends(get_session),
+    ticket_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из предыдущего ответа"),
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    История изменений заявки (статус, приоритет, описание, назначения)
+    от новых событий к старым.
+
+    Пагинация по ключу: для следующей страницы передайте `next_cursor`
+    из ответа в параметр `cursor`. События пишутся в фоне пачками,
+    поэтому последнее изменение появляется в истории с задержкой
+    до `TICKET_EVENTS_FLUSH_INTERVAL` секунд.
+
+    Права доступа: обычные пользователи видят историю только своих заявок.
+    """
+    after = None
+    if cursor:
+        try:
+            created_at, event_id = decode_cursor(cursor, 2)
+            after = (datetime.fromisoformat(created_at), int(event_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    await _check_ticket_access(db, ticket_id, current_user)
+
+    # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+    events = await crud.ticket_event.get_ticket_events(db, ticket_id=ticket_id, limit=limit + 1, after=after)
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        next_cursor = encode_cursor([last.created_at.isoformat(), last.event_id])
+    return schemas.ticket.TicketEventPage(items=events, next_cursor=next_cursor)
+
+# --- Комментарии к заявке ---
+
+@router.get(
+    "/{ticket_id}/comments",
+    response_model=schemas.ticket.TicketCommentPage,
+    tags=["Tickets"]
+)
+async def read_ticket_comments(
+    *,
+    db: AsyncSession = Depends(get_session),
+    ticket_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Размер страницы"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из предыдущего ответа"),
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Комментарии к заявке от старых к новым. Для следующей страницы
+    передайте `next_cursor` из ответа в параметр `cursor`.
+
+    Права доступа: обычные пользователи видят комментарии только своих заявок.
+    """
+    after_id = None
+    if cursor:
+        try:
+            after_id = int(decode_cursor(cursor, 1)[0])
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    await _check_ticket_access(db, ticket_id, current_user)
+
+    # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+    comments = await crud.ticket_comment.get_comments(db, ticket_id=ticket_id, limit=limit + 1, after_id=after_id)
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor([comments[-1].comment_id])
+    return schemas.ticket.TicketCommentPage(items=comments, next_cursor=next_cursor)
+
+@router.post(
+    "/{ticket_id}/comments",
+    response_model=schemas.ticket.TicketCommentRead,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Tickets"]
+)
+async def create_ticket_comment(
+    *,
+    db: AsyncSession = Depends(get_session),
+    ticket_id: int,
+    comment_in: schemas.ticket.TicketCommentCreate,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Добавляет комментарий к заявке. В той же транзакции увеличивается
+    `comment_count` заявки и обновляется `last_activity_at`.
+
+    Права доступа: обычные пользователи комментируют только свои заявки.
+    """
+    await _check_ticket_access(db, ticket_id, current_user)
+    try:
+        return await crud.ticket_comment.create_comment(
+            db=db, ticket_id=ticket_id, author_id=current_user.user_id, obj_in=comment_in
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+@router.patch(
+    "/{ticket_id}/comments/{comment_id}",
+    response_model=schemas.ticket.TicketCommentRead,
+    tags=["Tickets"]
+)
+async def update_ticket_comment(
+    *,
+    db: AsyncSession = Depends(get_session),
+    ticket_id: int,
+    comment_id: int,
+    comment_in: schemas.ticket.TicketCommentUpdate,
+    current_user: models.User = Depends(get_current_user)
+) -> Any:
+    """
+    Изменяет текст комментария. Изменять комментарий может только его автор.
+    """
+    comment = await crud.ticket_comment.get_comment(db, ticket_id=ticket_id, comment_id=comment_id)
+    if not comment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Комментарий не найден")
+    if comment.author_id != current_user.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Изменять комментарий может только его автор"
+        )
+    return await crud.ticket_comment.update_comment(db=db, db_obj=comment, obj_in=comment_in)
+
+@router.delete(
+    "/{ticket_id}/comments/{comment_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Tickets"]
+)
+async def delete_ticket_comment(
+    *,
+    db: AsyncSession = Depends(get_session),
+    ticket_id: int,
+    comment_id: int,
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Удаляет комментарий и уменьшает `comment_count` заявки в той же транзакции.
+    Удалять комментарий может его автор или администратор.
+    """
+    comment = await crud.ticket_comment.get_comment(db, ticket_id=ticket_id, comment_id=comment_id)
+    if not comment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Комментарий не найден")
+    if comment.author_id != current_user.user_id:
+        await db.refresh(current_user, ['role'])
+        if not current_user.role or current_user.role.name != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Удалять комментарий может только его автор или администратор"
+            )
+    if not await crud.ticket_comment.remove_comment(db=db, db_obj=comment):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Комментарий не найден")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 @router.patch(
     "/{ticket_id}",
     response_model=schemas.ticket.TicketDetailRead,
@@ -152,6 +816,9 @@ async def update_ticket(
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
     
+    # Значения отслеживаемых полей до изменения — для истории заявки
+    before = ticket_events.snapshot(ticket)
+    
     # Проверяем права доступа
     if user_role == "user" and ticket.user_id != current_user.user_id:
         raise HTTPException(
@@ -199,6 +866,8 @@ async def update_ticket(
         # Техники и администраторы могут изменять все поля
         # Проверяем существование устройства, если оно изменяется
         update_data = ticket_in.model_dump(exclude_unset=True)
+        if update_data.get("status_id") is not None:
+            _check_status_transition(await get_workflow(db), user_role, ticket.status_id, update_data["status_id"])
         if "device_id" in update_data:
             device = await crud.device.get_device(db=db, device_id=update_data["device_id"])
             if not device:
@@ -213,6 +882,11 @@ async def update_ticket(
             obj_in=update_data
         )
     
+    ticket_events.event_buffer.record_changes(
+        ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_UPDATED,
+        before=before, after=ticket_events.snapshot(updated_ticket)
+    )
+    
     # Загружаем связанные объекты для ответа
     # await db.refresh(updated_ticket, ['user', 'device', 'priority', 'status', 'assignments', 'files'])
     # Теперь get_ticket с with_related=True сам подгружает все, включая файлы
@@ -243,7 +917,9 @@ async def update_ticket_status(
     - Техники могут менять статус заявок, назначенных им
     - Администраторы могут менять статус любых заявок
     
-    При установке финального статуса автоматически проставляется дата закрытия.
+    Допустимы только переходы, разрешенные роли в рабочем процессе
+    (таблица status_transitions). При установке финального статуса
+    автоматически проставляется дата закрытия.
     """
     # Получаем роль пользователя
     await db.refresh(current_user, ['role'])
@@ -262,16 +938,13 @@ async def update_ticket_status(
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
     
-    # Получаем новый статус из базы для проверки
-    new_status = await crud.status.get_status(db=db, status_id=status_update.status_id)
-    if not new_status:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Статус с ID {status_update.status_id} не найден"
-        )
+    # Значения отслеживаемых полей до изменения — для истории заявки
+    before = ticket_events.snapshot(ticket)
     
-    # Проверяем, является ли новый статус закрывающим
-    is_closing = new_status.is_final
+    # Проверяем переход по графу рабочего процесса и узнаем, является ли новый статус закрывающим
+    is_closing = _check_status_transition(
+        await get_workflow(db), user_role, ticket.status_id, status_update.status_id
+    )
     
     # Проверяем требование указания resolution_notes при закрытии
     if is_closing and not status_update.resolution_notes:
@@ -288,6 +961,10 @@ async def update_ticket_status(
         resolution_notes=status_update.resolution_notes,
         is_closing=is_closing
     )
+    ticket_events.event_buffer.record_changes(
+        ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_STATUS_CHANGED,
+        before=before, after=ticket_events.snapshot(updated_ticket)
+    )
     
     # Загружаем связанные объекты для ответа
     await db.refresh(updated_ticket, ['user', 'device', 'priority', 'status', 'assignments', 'files'])
@@ -328,6 +1005,9 @@ async def edit_closed_ticket(
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
     
+    # Значения отслеживаемых полей до изменения — для истории заявки
+    before = ticket_events.snapshot(ticket)
+    
     # Проверяем, действительно ли заявка закрыта
     if ticket.closed_at is None:
         raise HTTPException(
@@ -337,6 +1017,13 @@ async def edit_closed_ticket(
     
     # Проверяем существование устройства, если оно изменяется
     update_data = ticket_in.model_dump(exclude_unset=True)
+    reopened = False
+    if update_data.get("status_id") is not None:
+        is_final = _check_status_transition(await get_workflow(db), user_role, ticket.status_id, update_data["status_id"])
+        # Перевод в нефинальный статус — повторное открытие: дата закрытия сбрасывается
+        reopened = not is_final
+        if reopened:
+            update_data["closed_at"] = None
     if "device_id" in update_data:
         device = await crud.device.get_device(db=db, device_id=update_data["device_id"])
         if not device:
@@ -351,6 +1038,12 @@ async def edit_closed_ticket(
         db_obj=ticket,
         obj_in=update_data
     )
+    if reopened:
+        crud.report.invalidate([crud.report.TECHNICIAN_REPORT])
+    ticket_events.event_buffer.record_changes(
+        ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_UPDATED,
+        before=before, after=ticket_events.snapshot(updated_ticket)
+    )
     
     # Загружаем связанные объекты для ответа
     await db.refresh(updated_ticket, ['user', 'device', 'priority', 'status', 'assignments', 'files'])
@@ -379,8 +1072,12 @@ async def delete_ticket(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
     if user_role != "admin" and ticket.user_id != current_user.user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав для удаления этой заявки")
+    # Запоминаем пути файлов: записи удалятся каскадно вместе с заявкой
+    file_paths = await crud.file.get_ticket_file_paths(db=db, ticket_id=ticket_id)
     # Удаляем заявку
     await crud.ticket.delete_ticket(db=db, ticket_id=ticket_id)
+    # Удаляем файлы заявки с диска
+    storage.remove_stored_files(file_paths)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 # --- Эндпоинты для работы с назначением техников ---
@@ -451,25 +1148,28 @@ async def assign_technician_to_ticket(
             detail="Нельзя назначать техников на закрытые заявки"
         )
     
-    # Проверяем, не назначен ли уже этот техник на данную заявку
-    is_assigned = await crud.technician_assignment.is_technician_assigned(
+    # Назначаем техника одним INSERT ... ON CONFLICT DO NOTHING:
+    # уже существующее назначение (в том числе при гонке) не вставляется
+    assignment, assignments = await crud.technician_assignment.assign_technician(
         db=db, ticket_id=ticket_id, technician_id=technician_data.technician_id
     )
-    if is_assigned:
+    if assignment is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Техник с ID {technician_data.technician_id} уже назначен на эту заявку"
         )
     
-    # Назначаем техника на заявку
-    await crud.technician_assignment.assign_technician(
-        db=db, ticket_id=ticket_id, technician_id=technician_data.technician_id
+    ticket_events.event_buffer.record(
+        ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_TECHNICIAN_ASSIGNED,
+        changes={"technician_id": {"old": None, "new": technician_data.technician_id}}
     )
     
-    # Получаем обновленные данные о заявке для ответа
-    updated_ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id, with_related=True)
+    # Список назначений прочитан в той же транзакции — подставляем его
+    # (и счетчик назначений) без повторной загрузки заявки
+    set_committed_value(ticket, "assignments", assignments)
+    set_committed_value(ticket, "assignees_count", len(assignments))
     
-    return updated_ticket
+    return ticket
 
 @router.delete(
     "/{ticket_id}/unassign/{technician_id}",
@@ -522,25 +1222,27 @@ async def remove_technician_from_ticket(
             detail="Нельзя снимать техников с закрытых заявок"
         )
     
-    # Проверяем, назначен ли этот техник на данную заявку
-    is_assigned = await crud.technician_assignment.is_technician_assigned(
+    # Снимаем техника с заявки (DELETE ... RETURNING показывает, было ли назначение)
+    removed, assignments = await crud.technician_assignment.remove_technician(
         db=db, ticket_id=ticket_id, technician_id=technician_id
     )
-    if not is_assigned:
+    if not removed:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Техник с ID {technician_id} не назначен на эту заявку"
         )
     
-    # Снимаем техника с заявки
-    await crud.technician_assignment.remove_technician(
-        db=db, ticket_id=ticket_id, technician_id=technician_id
+    ticket_events.event_buffer.record(
+        ticket_id=ticket_id, actor_id=current_user.user_id, event_type=ticket_events.EVENT_TECHNICIAN_REMOVED,
+        changes={"technician_id": {"old": technician_id, "new": None}}
     )
     
-    # Получаем обновленные данные о заявке для ответа
-    updated_ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id, with_related=True)
+    # Список назначений прочитан в той же транзакции — подставляем его
+    # (и счетчик назначений) без повторной загрузки заявки
+    set_committed_value(ticket, "assignments", assignments)
+    set_committed_value(ticket, "assignees_count", len(assignments))
     
-    return updated_ticket
+    return ticket
 
 # --- Эндпоинты для работы с файлами --- #
 
@@ -556,37 +1258,52 @@ async def upload_ticket_files(
     db: AsyncSession = Depends(get_session),
     ticket_id: int,
     files: List[UploadFile] = File(...),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", description=IDEMPOTENCY_KEY_DESCRIPTION)
 ) -> Any:
     """
     Загружает файлы к заявке.
+
+    С заголовком `Idempotency-Key` повтор загрузки не сохраняет файлы повторно.
     """
-    ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id)
-    if not ticket:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
-    if ticket.user_id != current_user.user_id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Нет права загружать файлы для этой заявки")
-    saved_files = []
-    upload_dir = Path(settings.UPLOAD_DIRECTORY)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    for upload in files:
-        ext = Path(upload.filename).suffix
-        unique_name = f"{uuid.uuid4().hex}{ext}"
-        dest_path = upload_dir / unique_name
-        with open(dest_path, "wb") as f:
-            shutil.copyfileobj(upload.file, f)
-        file_obj = await crud.file.create_file(
-            db=db,
-            obj_in=FileCreate(
-                ticket_id=ticket_id,
-                file_name=upload.filename,
-                file_path=unique_name, # Сохраняем только имя файла
-                file_type=upload.content_type,
-                file_size=os.path.getsize(dest_path)
+    fingerprint = request_fingerprint(
+        f"POST /tickets/{ticket_id}/files", *((upload.filename, upload.size) for upload in files)
+    )
+    async with IdempotentRequest(
+        db, user_id=current_user.user_id, key=idempotency_key, fingerprint=fingerprint
+    ) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
+
+        ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id)
+        if not ticket:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
+        if ticket.user_id != current_user.user_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Нет права загружать файлы для этой заявки")
+        saved_files = []
+        upload_dir = Path(settings.UPLOAD_DIRECTORY)
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        for upload in files:
+            ext = Path(upload.filename).suffix
+            unique_name = f"{uuid.uuid4().hex}{ext}"
+            dest_path = upload_dir / unique_name
+            with open(dest_path, "wb") as f:
+                shutil.copyfileobj(upload.file, f)
+            file_obj = await crud.file.create_file(
+                db=db,
+                obj_in=FileCreate(
+                    ticket_id=ticket_id,
+                    file_name=upload.filename,
+                    file_path=unique_name, # Сохраняем только имя файла
+                    file_type=upload.content_type,
+                    file_size=os.path.getsize(dest_path)
+                ),
+                commit=False
             )
+            saved_files.append(file_obj)
+        return await idempotent.respond(
+            saved_files, response_model=List[schemas.file.FileRead], status_code=status.HTTP_201_CREATED
         )
-        saved_files.append(file_obj)
-    return saved_files
 
 @router.post(
     "/{ticket_id}/files", 
@@ -600,7 +1317,8 @@ async def upload_ticket_file(
     db: AsyncSession = Depends(get_session),
     ticket_id: int,
     file: UploadFile = File(...),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", description=IDEMPOTENCY_KEY_DESCRIPTION)
 ) -> Any:
     """
     Загружает файл и прикрепляет его к указанной заявке.
@@ -609,59 +1327,70 @@ async def upload_ticket_file(
     - Автор заявки
     - Назначенный техник
     - Администратор
+
+    С заголовком `Idempotency-Key` повтор загрузки не сохраняет файл повторно.
     """
-    # 1. Получаем заявку
-    ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id, with_related=True)
-    if not ticket:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
+    fingerprint = request_fingerprint(f"POST /tickets/{ticket_id}/files", file.filename, file.size)
+    async with IdempotentRequest(
+        db, user_id=current_user.user_id, key=idempotency_key, fingerprint=fingerprint
+    ) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
 
-    # 2. Проверяем права доступа
-    await db.refresh(current_user, ['role'])
-    user_role = current_user.role.name if current_user.role else "user"
-    is_owner = ticket.user_id == current_user.user_id
-    # Проверяем, является ли текущий пользователь назначенным техником
-    assigned_technician_ids = {assign.technician_id for assign in ticket.assignments}
-    is_assigned_technician = current_user.user_id in assigned_technician_ids
+        # 1. Получаем заявку
+        ticket = await crud.ticket.get_ticket(db=db, ticket_id=ticket_id, with_related=True)
+        if not ticket:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена")
 
-    if not (is_owner or is_assigned_technician or user_role == "admin"):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Недостаточно прав для загрузки файла к этой заявке"
-        )
+        # 2. Проверяем права доступа
+        await db.refresh(current_user, ['role'])
+        user_role = current_user.role.name if current_user.role else "user"
+        is_owner = ticket.user_id == current_user.user_id
+        # Проверяем, является ли текущий пользователь назначенным техником
+        assigned_technician_ids = {assign.technician_id for assign in ticket.assignments}
+        is_assigned_technician = current_user.user_id in assigned_technician_ids
 
-    # 3. Обработка файла
-    upload_dir = Path(settings.UPLOAD_DIRECTORY) / f"ticket_{ticket_id}"
-    upload_dir.mkdir(parents=True, exist_ok=True) # Создаем директорию, если не существует
+        if not (is_owner or is_assigned_technician or user_role == "admin"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав для загрузки файла к этой заявке"
+            )
 
-    # Генерируем безопасное имя файла
-    file_extension = Path(file.filename).suffix
-    # TODO: Добавить проверку на допустимые расширения и MIME-типы, если нужно
-    safe_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = upload_dir / safe_filename
-    relative_path = f"ticket_{ticket_id}/{safe_filename}" # Сохраняем относительный путь
+        # 3. Обработка файла
+        upload_dir = Path(settings.UPLOAD_DIRECTORY) / f"ticket_{ticket_id}"
+        upload_dir.mkdir(parents=True, exist_ok=True) # Создаем директорию, если не существует
 
-    # Сохраняем файл
-    try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        # TODO: Улучшить обработку ошибок сохранения файла
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Ошибка при сохранении файла: {e}")
-    finally:
-        await file.close()
-
-    # 4. Создаем запись в БД
-    file_size = file_path.stat().st_size
-    file_in = schemas.file.FileCreate(
-        file_name=file.filename, # Сохраняем оригинальное имя
-        file_path=relative_path, # Сохраняем относительный путь с папкой ticket_{ticket_id}
-        file_type=file.content_type,
-        file_size=file_size,
-        ticket_id=ticket_id
-    )
-    db_file = await crud.file.create_file(db=db, obj_in=file_in)
+        # Генерируем безопасное имя файла
+        file_extension = Path(file.filename).suffix
+        # TODO: Добавить проверку на допустимые расширения и MIME-типы, если нужно
+        safe_filename = f"{uuid.uuid4()}{file_extension}"
+        file_path = upload_dir / safe_filename
+        relative_path = f"ticket_{ticket_id}/{safe_filename}" # Сохраняем относительный путь
+
+        # Сохраняем файл
+        try:
+            with file_path.open("wb") as buffer:
+                shutil.copyfileobj(file.file, buffer)
+        except Exception as e:
+            # TODO: Улучшить обработку ошибок сохранения файла
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Ошибка при сохранении файла: {e}")
+        finally:
+            await file.close()
+
+        # 4. Создаем запись в БД
+        file_size = file_path.stat().st_size
+        file_in = schemas.file.FileCreate(
+            file_name=file.filename, # Сохраняем оригинальное имя
+            file_path=relative_path, # Сохраняем относительный путь с папкой ticket_{ticket_id}
+            file_type=file.content_type,
+            file_size=file_size,
+            ticket_id=ticket_id
+        )
+        db_file = await crud.file.create_file(db=db, obj_in=file_in, commit=False)
 
-    return db_file
+        return await idempotent.respond(
+            db_file, response_model=schemas.file.FileRead, status_code=status.HTTP_201_CREATED
+        )
 
 @router.delete(
     "/{ticket_id}/files/{file_id}",
@@ -721,24 +1450,13 @@ async def delete_ticket_file(
             detail="Недостаточно прав для удаления этого файла"
         )
 
-    # 5. Удаляем файл с диска
-    full_file_path = Path(settings.UPLOAD_DIRECTORY) / file_record.file_path
-    if full_file_path.is_file():
-        try:
-            os.remove(full_file_path)
-        except OSError as e:
-            # TODO: Логировать ошибку удаления файла
-            # Не прерываем процесс, если файл уже удален, но удаляем запись из БД
-            print(f"Ошибка удаления файла {full_file_path}: {e}")
-            pass # Можно продолжить и удалить запись из БД
-    else:
-        # TODO: Логировать, что файл не найден на диске
-        print(f"Файл не найден на диске: {full_file_path}")
-        pass # Файла нет, но запись в БД удаляем
-
-    # 6. Удаляем запись из БД
+    # 5. Удаляем запись из БД
     deleted_file = await crud.file.delete_file(db=db, file_id=file_id)
     if not deleted_file: # Дополнительная проверка, хотя get_file уже был
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ошибка при удалении записи о файле из БД")
 
+    # 6. Удаляем файл с диска после коммита: ошибки файловой системы только логируются,
+    # оставшиеся файлы-сироты подбирает задача app.jobs.reconcile_uploads
+    storage.remove_stored_file(file_record.file_path)
+
     return # Возвращаем 204 No Content
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from typing import Any, List, Optional, Set
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app import models, schemas, crud # Импортируем crud
-from app.core.dependencies import get_current_user, get_current_admin_user # Импортируем зависимости
+from app.core.dependencies import get_current_user, get_current_admin_user, get_current_staff_user # Импортируем зависимости
 from app.db.session import get_session # Импортируем сессию
 from app.core import security # Импортируем security для проверки пароля
+from app.core.revocation import revoke_user_access
+from app.core.config import settings
+from app.core.bulk_import import read_import_rows, format_validation_error
 
 router = APIRouter()
 
@@ -58,7 +63,8 @@ async def update_password_me(
     current_user: models.User = Depends(get_current_user)
 ) -> None:
     """
-    Обновляет пароль текущего пользователя.
+    Обновляет пароль текущего пользователя и отзывает все его токены
+    (доступа и обновления) — после смены пароля нужно войти заново.
     """
     # Проверяем старый пароль
     if not security.verify_password(password_in.old_password, current_user.password_hash):
@@ -67,8 +73,41 @@ async def update_password_me(
     # Хэшируем и обновляем пароль
     hashed_password = security.get_password_hash(password_in.new_password)
     await crud.user.update_user(db=db, db_obj=current_user, obj_in={"password_hash": hashed_password})
+    # После смены пароля завершаем все сеансы: украденный токен доступа
+    # не должен оставаться действительным до истечения срока
+    await revoke_user_access(db, user_id=current_user.user_id, reason="password_change", include_refresh_tokens=True)
     # Возвращаем 204 No Content при успехе
 
+@router.get(
+    "/lookup",
+    response_model=List[schemas.user.UserLookup],
+    dependencies=[Depends(get_current_staff_user)],
+    tags=["Users"]
+)
+async def lookup_users(
+    db: AsyncSession = Depends(get_session),
+    q: str = Query(..., min_length=2, max_length=100, description="Часть логина, имени, фамилии или email"),
+    role: Optional[List[str]] = Query(None, description="Ограничить ролями (можно несколько: role=technician&role=admin)"),
+    limit: int = Query(10, ge=1, le=50, description="Максимальное количество результатов"),
+) -> Any:
+    """
+    Автодополнение пользователей для выбора техника или автора заявки
+    (для администраторов и техников).
+
+    Ищет по вхождению и нечеткому совпадению (опечатки) в логине, имени,
+    фамилии и email с помощью триграммного индекса. Запрос ограничен
+    по времени USER_LOOKUP_TIMEOUT_MS; при превышении возвращается 503.
+    """
+    try:
+        return await crud.user.lookup_users(
+            db, query=q, role_names=role, limit=limit, timeout_ms=settings.USER_LOOKUP_TIMEOUT_MS
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Поиск занял слишком много времени, уточните запрос",
+        )
+
 # --- Эндпоинты для Администратора ---
 
 @router.post(
@@ -92,31 +131,131 @@ async def create_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return user
 
+@router.post(
+    "/admin/users/import",
+    response_model=schemas.user.UserImportResult,
+    dependencies=[Depends(get_current_admin_user)],
+    tags=["Admin - Users"]
+)
+async def import_users(
+    request: Request,
+    db: AsyncSession = Depends(get_session),
+) -> Any:
+    """
+    Массовый импорт пользователей из JSON или CSV (только для администраторов).
+
+    Тело запроса: JSON-массив объектов UserCreate, CSV с заголовком (text/csv)
+    или файл в поле `file` (multipart/form-data). Создаются все корректные
+    строки, по остальным возвращаются ошибки — одна плохая строка не отменяет импорт.
+    Уникальность проверяется одним запросом, пароли хэшируются параллельно
+    в пуле процессов, вставка выполняется многострочным INSERT.
+    """
+    rows = await read_import_rows(request, max_rows=settings.USER_IMPORT_MAX_ROWS)
+    errors: List[schemas.bulk_import.ImportRowError] = []
+    parsed: List[tuple] = []  # (номер строки, UserCreate)
+    seen_usernames: Set[str] = set()
+    seen_emails: Set[str] = set()
+
+    # 1. Валидация строк и поиск дубликатов внутри файла
+    for number, raw in enumerate(rows, start=1):
+        # Пустые значения не передаем, чтобы сработали значения по умолчанию (role_id)
+        data = {key: value for key, value in raw.items() if value is not None}
+        try:
+            user_in = schemas.user.UserCreate.model_validate(data)
+        except ValidationError as e:
+            errors.append(schemas.bulk_import.ImportRowError(
+                row=number, identifier=str(raw.get("username") or "") or None, errors=format_validation_error(e)
+            ))
+            continue
+        row_errors = []
+        if user_in.username in seen_usernames:
+            row_errors.append("username: повторяется в импортируемых данных")
+        if user_in.email is not None and user_in.email in seen_emails:
+            row_errors.append("email: повторяется в импортируемых данных")
+        seen_usernames.add(user_in.username)
+        if user_in.email is not None:
+            seen_emails.add(user_in.email)
+        if row_errors:
+            errors.append(schemas.bulk_import.ImportRowError(row=number, identifier=user_in.username, errors=row_errors))
+            continue
+        parsed.append((number, user_in))
+
+    # 2. Проверка уникальности и ролей — по одному запросу на всю пачку
+    existing_usernames = await crud.user.get_existing_usernames(db, (u.username for _, u in parsed))
+    existing_emails = await crud.user.get_existing_emails(db, (u.email for _, u in parsed if u.email is not None))
+    role_ids = {role.id for role in await crud.user_role.get_user_roles(db, limit=1000)}
+    accepted = []
+    for number, user_in in parsed:
+        row_errors = []
+        if user_in.username in existing_usernames:
+            row_errors.append(f"username: '{user_in.username}' уже зарегистрирован")
+        if user_in.email is not None and user_in.email in existing_emails:
+            row_errors.append(f"email: '{user_in.email}' уже зарегистрирован")
+        if user_in.role_id not in role_ids:
+            row_errors.append(f"role_id: роль с ID {user_in.role_id} не существует")
+        if row_errors:
+            errors.append(schemas.bulk_import.ImportRowError(row=number, identifier=user_in.username, errors=row_errors))
+        else:
+            accepted.append((number, user_in))
+
+    # 3. Параллельное хэширование и вставка одной пачкой
+    hashes = await security.hash_passwords([user_in.password for _, user_in in accepted])
+    created_ids = await crud.user.create_users_bulk(db, rows=[
+        {**user_in.model_dump(exclude={"password"}), "password_hash": password_hash}
+        for (_, user_in), password_hash in zip(accepted, hashes)
+    ])
+
+    created = []
+    for number, user_in in accepted:
+        user_id = created_ids.get(user_in.username)
+        if user_id is None:
+            # Логин или email заняли параллельно, между проверкой и вставкой
+            errors.append(schemas.bulk_import.ImportRowError(
+                row=number, identifier=user_in.username, errors=["Конфликт уникальности при вставке (username или email)"]
+            ))
+        else:
+            created.append(schemas.user.UserImportCreated(row=number, user_id=user_id, username=user_in.username))
+
+    errors.sort(key=lambda error: error.row)
+    return schemas.user.UserImportResult(
+        total=len(rows), created=len(created), failed=len(errors), users=created, errors=errors
+    )
+
 @router.get(
     "/admin/users",
-    response_model=List[schemas.user.UserRead],
+    response_model=List[schemas.user.UserReadWithRole],
     dependencies=[Depends(get_current_admin_user)],
     tags=["Admin - Users"]
 )
 async def read_users(
     db: AsyncSession = Depends(get_session),
     skip: int = Query(0, ge=0, description="Количество записей для пропуска"),
-    limit: int = Query(100, ge=1, le=200, description="Максимальное количество записей для возврата")
+    limit: int = Query(100, ge=1, le=200, description="Максимальное количество записей для возврата"),
+    after_id: Optional[int] = Query(None, description="Вернуть пользователей с user_id больше указанного (пагинация по ключу)"),
+    role_id: Optional[int] = Query(None, description="Фильтр по ID роли"),
+    role: Optional[str] = Query(None, description="Фильтр по названию роли (admin, technician, user)"),
+    q: Optional[str] = Query(None, min_length=1, max_length=100, description="Поиск по логину, email, имени и фамилии"),
 ) -> Any:
     """
-    Получает список пользователей с пагинацией (только для администраторов).
+    Получает список пользователей с ролями (только для администраторов).
+
+    Для постраничного просмотра передавайте в `after_id` последний user_id
+    предыдущей страницы: время ответа не зависит от номера страницы.
     """
-    users = await crud.user.get_users(db, skip=skip, limit=limit)
-    
-    # Загружаем данные о ролях для всех пользователей
-    for user in users:
-        await db.refresh(user, ['role'])
-    
-    return users
+    return await crud.user.get_users(
+        db,
+        skip=skip,
+        limit=limit,
+        after_id=after_id,
+        role_id=role_id,
+        role_name=role,
+        search=q,
+        with_role=True,
+    )
 
 @router.get(
     "/admin/users/{user_id}",
-    response_model=schemas.user.UserRead,
+    response_model=schemas.user.UserReadWithRole,
     dependencies=[Depends(get_current_admin_user)],
     tags=["Admin - Users"]
 )
@@ -125,15 +264,11 @@ async def read_user_by_id(
     db: AsyncSession = Depends(get_session),
 ) -> Any:
     """
-    Получает пользователя по ID (только для администраторов).
+    Получает пользователя по ID вместе с ролью (только для администраторов).
     """
-    user = await crud.user.get_user_by_id(db, user_id=user_id)
+    user = await crud.user.get_user_by_id(db, user_id=user_id, with_role=True)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-    # Загружаем данные о роли пользователя
-    await db.refresh(user, ['role'])
-    
     return user
 
 @router.put(
@@ -182,6 +317,8 @@ async def reset_password_admin(
 
     hashed_password = security.get_password_hash(password_in.new_password)
     await crud.user.update_user(db=db, db_obj=db_user, obj_in={"password_hash": hashed_password})
+    # Сброс пароля завершает все сеансы пользователя
+    await revoke_user_access(db, user_id=user_id, reason="password_reset", include_refresh_tokens=True)
     # Возвращаем 204 No Content при успехе
 
 @router.delete(
@@ -206,11 +343,13 @@ async def delete_user(
     deleted_user = await crud.user.remove_user(db=db, user_id=user_id)
     if not deleted_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    # Токены удаленного пользователя больше не должны приниматься
+    await revoke_user_access(db, user_id=user_id, reason="user_deleted")
     return deleted_user
 
 @router.patch(
     "/admin/users/{user_id}/role",
-    response_model=schemas.user.UserRead,
+    response_model=schemas.user.UserReadWithRole,
     dependencies=[Depends(get_current_admin_user)],
     tags=["Admin - Users"]
 )
@@ -228,6 +367,11 @@ async def change_user_role(
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
+    # Проверяем существование роли (ее же вернем в ответе без повторного запроса)
+    new_role = await crud.user_role.get_user_role(db, role_id=role_in.role_id)
+    if not new_role:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Role with ID {role_in.role_id} not found")
+
     # Проверяем, отличается ли новая роль от текущей
     if db_user.role_id == role_in.role_id:
         raise HTTPException(
@@ -241,7 +385,31 @@ async def change_user_role(
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    # Загружаем данные о роли пользователя для ответа
-    await db.refresh(user, ['role'])
+    # Выпущенные токены содержат старую роль: отзываем их,
+    # клиент получит новый токен доступа через /api/auth/refresh
+    await revoke_user_access(db, user_id=user_id, reason="role_change")
+
+    # Роль уже загружена выше — подставляем ее без запроса к БД
+    set_committed_value(user, "role", new_role)
     
-    return user
\ No newline at end of file
+    return user
+
+@router.post(
+    "/admin/users/{user_id}/sign-out",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(get_current_admin_user)],
+    tags=["Admin - Users"]
+)
+async def sign_out_user(
+    *,
+    db: AsyncSession = Depends(get_session),
+    user_id: int,
+) -> None:
+    """
+    Принудительно завершает все сеансы пользователя (только для администраторов).
+    Отзываются и токены доступа, и токены обновления.
+    """
+    db_user = await crud.user.get_user_by_id(db, user_id=user_id)
+    if not db_user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    await revoke_user_access(db, user_id=user_id, reason="sign_out", include_refresh_tokens=True)
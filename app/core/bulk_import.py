@@ -0,0 +1,106 @@
+# Файл: app/core/bulk_import.py
+import csv
+import io
+import json
+from typing import Any, Dict, List
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+
+
+async def read_import_rows(request: Request, *, max_rows: int) -> List[Dict[str, Any]]:
+    """
+    Читает строки для массового импорта из тела запроса.
+
+    Поддерживаются:
+    - application/json: массив объектов или объект {"items": [...]};
+    - text/csv: CSV с заголовком;
+    - multipart/form-data: поле `file` с CSV или JSON (определяется по расширению/типу).
+
+    Пустые значения CSV превращаются в None, чтобы необязательные поля схем
+    не получали пустые строки.
+
+    Raises:
+        HTTPException(400): Ошибка разбора.
+        HTTPException(413): Строк больше max_rows.
+        HTTPException(415): Неподдерживаемый формат.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ожидается файл в поле 'file'")
+        raw = await upload.read()
+        filename = (upload.filename or "").lower()
+        is_json = filename.endswith(".json") or (upload.content_type or "").endswith("json")
+    elif content_type in ("text/csv", "application/csv"):
+        raw, is_json = await request.body(), False
+    elif content_type in ("application/json", ""):
+        raw, is_json = await request.body(), True
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Неподдерживаемый формат: {content_type}. Используйте JSON или CSV",
+        )
+
+    try:
+        rows = parse_import_data(raw, is_json=is_json)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if len(rows) > max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Слишком много строк: {len(rows)} (максимум {max_rows})",
+        )
+    return rows
+
+
+def parse_import_data(raw: bytes, *, is_json: bool) -> List[Dict[str, Any]]:
+    """
+    Разбирает данные импорта: JSON (массив объектов или {"items": [...]})
+    или CSV с заголовком. Используется и HTTP-эндпоинтами, и утилитами
+    командной строки.
+
+    Raises:
+        ValueError: Данные не удалось разобрать.
+    """
+    return _parse_json(raw) if is_json else _parse_csv(raw)
+
+
+def _parse_json(raw: bytes) -> List[Dict[str, Any]]:
+    try:
+        data = json.loads(raw or b"[]")
+    except ValueError as e:
+        raise ValueError(f"Некорректный JSON: {e}") from e
+    if isinstance(data, dict):
+        data = data.get("items")
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("Ожидается массив объектов или объект с полем 'items'")
+    return data
+
+
+def _parse_csv(raw: bytes) -> List[Dict[str, Any]]:
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise ValueError("CSV должен быть в кодировке UTF-8") from e
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        return []
+    return [
+        {key.strip(): (value.strip() or None) if isinstance(value, str) else value
+         for key, value in row.items() if key}
+        for row in reader
+    ]
+
+
+def format_validation_error(error: ValidationError) -> List[str]:
+    """Преобразует ошибку Pydantic в список строк вида 'поле: сообщение'."""
+    messages = []
+    for item in error.errors():
+        location = ".".join(str(part) for part in item.get("loc", ())) or "row"
+        messages.append(f"{location}: {item.get('msg')}")
+    return messages
@@ -0,0 +1,104 @@
+# Файл: app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Ограниченный по размеру LRU-кэш в памяти процесса со сроком жизни записей.
+
+    Каждый воркер uvicorn держит свой экземпляр, поэтому кэш подходит только
+    для данных, которые можно безопасно пересчитать или инвалидировать локально.
+
+    Args:
+        maxsize: Максимальное количество записей; при переполнении вытесняется
+                 давно не использовавшаяся запись.
+        ttl: Время жизни записи в секундах по умолчанию (None — без ограничения).
+        timer: Источник текущего времени (по умолчанию time.time, чтобы можно
+               было передавать абсолютное время истечения, например `exp` из JWT).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.time,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Возвращает значение по ключу или default, если его нет или оно устарело."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= self._timer():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        *,
+        ttl: Optional[float] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        Сохраняет значение.
+
+        Args:
+            ttl: Время жизни этой записи в секундах (переопределяет ttl кэша).
+            expires_at: Абсолютное время истечения (в единицах timer).
+        """
+        if expires_at is None:
+            lifetime = ttl if ttl is not None else self.ttl
+            expires_at = self._timer() + lifetime if lifetime is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Удаляет запись и возвращает ее значение (или None)."""
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[0] if item is not None else None
+
+    def keys(self) -> list:
+        """Снимок ключей (включая устаревшие записи) — для выборочной инвалидации."""
+        with self._lock:
+            return list(self._data)
+
+    def clear(self) -> None:
+        """Очищает кэш (например, при инвалидации справочников)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _MISSING) is not _MISSING  # type: ignore[arg-type]
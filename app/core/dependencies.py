@@ -5,12 +5,15 @@ from typing import Optional
 
 from app import crud, models, schemas # Импортируем нужные модули
 from app.core import security
+from app.core.revocation import revocation_list
 from app.db.session import get_session
 
 # Определяем схему OAuth2. tokenUrl указывает на эндпоинт получения токена (/api/auth/login).
 # Это используется FastAPI для автоматической генерации документации Swagger UI,
 # позволяя пользователям вводить логин/пароль и получать токен прямо в интерфейсе документации.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# Вариант без автоматической ошибки 401 — для эндпоинтов, где токен необязателен (logout)
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 async def get_current_user(
     db: AsyncSession = Depends(get_session), token: str = Depends(oauth2_scheme)
@@ -20,9 +23,10 @@ async def get_current_user(
 
     1. Получает токен из заголовка Authorization: Bearer <token>.
     2. Декодирует и валидирует токен.
-    3. Извлекает user_id из токена.
-    4. Получает пользователя из базы данных по user_id.
-    5. Возвращает объект пользователя models.User.
+    3. Проверяет, не отозван ли токен (список отзыва в памяти воркера).
+    4. Извлекает user_id из токена.
+    5. Получает пользователя из базы данных по user_id.
+    6. Возвращает объект пользователя models.User.
 
     Raises:
         HTTPException(401): Если токен невалиден или пользователь не найден.
@@ -41,6 +45,12 @@ async def get_current_user(
         # Если в токене нет user_id, мы не можем найти пользователя
         raise security.credentials_exception
 
+    # Проверяем отзыв токена (logout, принудительный выход); список в памяти
+    # подтягивается из БД не чаще раза в REVOCATION_REFRESH_SECONDS
+    await revocation_list.refresh_if_stale(db)
+    if revocation_list.is_revoked(token_data):
+        raise security.credentials_exception
+
     # Получаем пользователя из БД по ID
     user = await crud.user.get_user_by_id(db, user_id=token_data.user_id)
 
@@ -71,4 +81,18 @@ async def get_current_admin_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_current_staff_user(
+    db: AsyncSession = Depends(get_session),
+    current_user: models.User = Depends(get_current_user)
+) -> models.User:
+    """Зависимость для проверки, является ли текущий пользователь администратором или техником."""
+    await db.refresh(current_user, ['role'])
+
+    if current_user.role.name not in ("admin", "technician"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The user doesn't have enough privileges"
+        )
+    return current_user
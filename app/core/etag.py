@@ -0,0 +1,46 @@
+# Файл: app/core/etag.py
+import hashlib
+from typing import Any, Optional, Sequence
+
+from fastapi import Response, status
+
+# Клиент обязан перепроверять ресурс при каждом обращении (If-None-Match),
+# но может использовать закешированное тело, получив 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Строит слабый ETag (W/"...") из значений, определяющих версию ресурса
+    (метки времени, количества, параметры представления).
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверяет заголовок If-None-Match по правилам слабого сравнения
+    (RFC 9110: префикс W/ игнорируется, "*" совпадает с любым ETag).
+    """
+    if not if_none_match:
+        return False
+    candidates: Sequence[str] = [item.strip() for item in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == opaque for candidate in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304 без тела с тем же ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Проставляет ETag и Cache-Control в ответ."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
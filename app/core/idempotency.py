@@ -0,0 +1,174 @@
+# Файл: app/core/idempotency.py
+import hashlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+MAX_KEY_LENGTH = 255
+# Заголовок, которым помечается ответ, возвращенный из сохраненного результата
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Завершенные запросы: (user_id, key) -> (request_hash, status_code, body).
+# Повтор из того же воркера обслуживается без обращения к БД; запись живет
+# до expires_at строки ключа, после чего ключ можно использовать заново
+completed_cache: Optional[TTLCache] = (
+    TTLCache(maxsize=settings.IDEMPOTENCY_CACHE_SIZE)
+    if settings.IDEMPOTENCY_CACHE_SIZE > 0 else None
+)
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def request_fingerprint(scope: str, *parts: Any) -> str:
+    """SHA-256 эндпоинта и содержимого запроса."""
+    digest = hashlib.sha256(scope.encode())
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+    return digest.hexdigest()
+
+
+def _replay(fingerprint: str, request_hash: str, status_code: int, body: bytes) -> Response:
+    """Ответ из сохраненного результата (или 422, если ключ использован для другого запроса)."""
+    if request_hash != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key уже использован для другого запроса",
+        )
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+class IdempotentRequest:
+    """
+    Обработка заголовка Idempotency-Key для создающих запросов.
+
+    Первый запрос резервирует ключ в таблице `idempotency_keys`, выполняется
+    и сохраняет свой ответ; повторы с тем же ключом получают сохраненный ответ
+    без повторной вставки и записи на диск. Пока первый запрос выполняется,
+    повтор получает 409, повтор с другим содержимым — 422. Если запрос
+    завершился ошибкой, резерв снимается и его можно повторить; резерв
+    запроса, который не завершился вовсе (упал процесс), можно занять
+    заново через IDEMPOTENCY_PENDING_TIMEOUT_SECONDS.
+    Без заголовка обработка не меняется.
+
+    Создаваемые объекты не фиксируются до respond(): он сохраняет ответ
+    и фиксирует транзакцию целиком, поэтому объект не может оказаться
+    созданным без сохраненного ответа (и повтор не создаст второй).
+
+    Использование:
+        async with IdempotentRequest(db, user_id=..., key=..., fingerprint=...) as idempotent:
+            if idempotent.replay is not None:
+                return idempotent.replay
+            obj = await crud....create_...(db, ..., commit=False)
+            return await idempotent.respond(obj, response_model=..., status_code=201)
+    """
+
+    def __init__(self, db: AsyncSession, *, user_id: int, key: Optional[str], fingerprint: str):
+        self.db = db
+        self.user_id = user_id
+        self.key = key
+        self.fingerprint = fingerprint
+        self.replay: Optional[Response] = None
+        self._reserved_at: Optional[datetime] = None
+        self._expires_at: Optional[datetime] = None
+
+    @property
+    def _cache_key(self) -> Tuple[int, str]:
+        return (self.user_id, self.key)
+
+    async def __aenter__(self) -> "IdempotentRequest":
+        from app import crud
+
+        if self.key is None:
+            return self
+        if not self.key or len(self.key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key должен содержать от 1 до {MAX_KEY_LENGTH} символов",
+            )
+        if completed_cache is not None:
+            cached = completed_cache.get(self._cache_key)
+            if cached is not None:
+                self.replay = _replay(self.fingerprint, *cached)
+                return self
+
+        self._expires_at = datetime.now(timezone.utc) + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        self._reserved_at = await crud.idempotency_key.reserve_key(
+            self.db, user_id=self.user_id, key=self.key, request_hash=self.fingerprint, expires_at=self._expires_at
+        )
+        if self._reserved_at is not None:
+            return self
+
+        existing = await crud.idempotency_key.get_key(self.db, user_id=self.user_id, key=self.key)
+        if existing is None or existing.status_code is None:
+            # Запись удалили между INSERT и SELECT (ошибка первого запроса) — тоже "еще не готово"
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Запрос с этим Idempotency-Key еще выполняется, повторите позже",
+            )
+        entry = (existing.request_hash, existing.status_code, existing.response_body)
+        if completed_cache is not None:
+            completed_cache.set(self._cache_key, entry, expires_at=existing.expires_at.timestamp())
+        self.replay = _replay(self.fingerprint, *entry)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        from app import crud
+
+        if exc_type is not None and self._reserved_at is not None:
+            # Откатывается и созданный объект: он не зафиксирован до respond()
+            await self.db.rollback()
+            await crud.idempotency_key.release_key(
+                self.db, user_id=self.user_id, key=self.key, reserved_at=self._reserved_at
+            )
+
+    async def respond(self, content: Any, *, response_model: Any, status_code: int) -> Any:
+        """
+        Сохраняет ответ для ключа, фиксирует транзакцию запроса вместе
+        с ответом и возвращает его. Без ключа только фиксирует транзакцию
+        и возвращает content как есть (сериализацию выполняет FastAPI
+        по response_model).
+
+        Raises:
+            HTTPException: 409, если резерв ключа за время выполнения занял
+                           повтор (запрос дольше IDEMPOTENCY_PENDING_TIMEOUT_SECONDS);
+                           созданный объект при этом откатывается.
+        """
+        from app import crud
+
+        if self._reserved_at is None:
+            await self.db.commit()
+            return content
+        adapter = _adapter(response_model)
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+        saved = await crud.idempotency_key.save_response(
+            self.db, user_id=self.user_id, key=self.key, reserved_at=self._reserved_at,
+            status_code=status_code, response_body=body
+        )
+        if not saved:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Запрос с этим Idempotency-Key выполняется повторно, повторите позже",
+            )
+        await self.db.commit()
+        self._reserved_at = None
+        if completed_cache is not None:
+            completed_cache.set(
+                self._cache_key, (self.fingerprint, status_code, body), expires_at=self._expires_at.timestamp()
+            )
+        return Response(content=body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,30 @@
+# Файл: app/core/pagination.py
+import base64
+import json
+from typing import Any, List, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Кодирует ключ последней записи страницы в непрозрачный курсор
+    для пагинации по ключу (keyset). Значения должны сериализоваться в JSON.
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Декодирует курсор, созданный encode_cursor.
+
+    Raises:
+        ValueError: Курсор поврежден или содержит не `size` значений.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,116 @@
+# Файл: app/core/revocation.py
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.token import TokenData
+
+# Окно перечитывания по времени: покрывает транзакции, которые получили
+# revocation_id раньше, а закоммитились позже уже прочитанных записей
+_REREAD_WINDOW = timedelta(seconds=60)
+
+
+class RevocationList:
+    """
+    Список отозванных токенов доступа в памяти воркера.
+
+    Хранит множество отозванных jti и для принудительного выхода — момент,
+    до которого выпущенные токены пользователя недействительны. Проверка
+    токена — два обращения к словарю, без запросов к БД. Из таблицы
+    `token_revocations` список подтягивается инкрементально не чаще, чем
+    раз в REVOCATION_REFRESH_SECONDS, поэтому отзыв в одном воркере
+    доходит до остальных с этой задержкой.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._jtis: Dict[str, float] = {}  # jti -> время истечения (epoch)
+        self._users: Dict[int, Tuple[float, float]] = {}  # user_id -> (not_before, время истечения)
+        self._last_id = 0
+        self._last_refresh: Optional[datetime] = None
+        self._refreshed_at = float("-inf")  # time.monotonic() последнего обновления
+        self._lock = asyncio.Lock()
+
+    def is_revoked(self, token_data: TokenData) -> bool:
+        """Проверяет, отозван ли токен (по jti или принудительным выходом пользователя)."""
+        if token_data.jti is not None and token_data.jti in self._jtis:
+            return True
+        if token_data.user_id is not None:
+            entry = self._users.get(token_data.user_id)
+            if entry is not None:
+                # Токены без iat (выпущенные до появления отзыва) считаем отозванными
+                return token_data.iat is None or token_data.iat < entry[0]
+        return False
+
+    def add(self, revocations: Iterable) -> None:
+        """Применяет записи TokenRevocation к списку (идемпотентно)."""
+        for row in revocations:
+            expires_at = row.expires_at.timestamp()
+            if row.jti is not None:
+                self._jtis[row.jti] = expires_at
+            elif row.user_id is not None:
+                not_before = row.revoked_at.timestamp()
+                current = self._users.get(row.user_id)
+                if current is None or current[0] < not_before:
+                    self._users[row.user_id] = (not_before, expires_at)
+            self._last_id = max(self._last_id, row.revocation_id)
+
+    async def refresh_if_stale(self, db: AsyncSession) -> None:
+        """Обновляет список из БД, если с прошлого обновления прошло больше refresh_interval."""
+        if time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        async with self._lock:
+            # Другой запрос мог обновить список, пока мы ждали блокировку
+            if time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return
+            await self.refresh(db)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Подтягивает новые записи об отзыве и удаляет из памяти истекшие."""
+        from app import crud
+
+        started = datetime.now(timezone.utc)
+        since = self._last_refresh - _REREAD_WINDOW if self._last_refresh is not None else None
+        rows = await crud.token_revocation.get_revocations_since(
+            db, after_id=self._last_id, revoked_since=since
+        )
+        self.add(rows)
+        self._prune(time.time())
+        self._last_refresh = started
+        self._refreshed_at = time.monotonic()
+
+    def _prune(self, now: float) -> None:
+        self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+        self._users = {uid: entry for uid, entry in self._users.items() if entry[1] > now}
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._users)
+
+
+revocation_list = RevocationList(refresh_interval=settings.REVOCATION_REFRESH_SECONDS)
+
+
+async def revoke_user_access(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    reason: str,
+    include_refresh_tokens: bool = False
+) -> None:
+    """
+    Отзывает все выпущенные токены доступа пользователя во всех воркерах.
+
+    В текущем воркере отзыв применяется сразу, в остальных — при следующем
+    обновлении списка. С include_refresh_tokens также отзываются токены
+    обновления, т.е. пользователю придется войти заново.
+    """
+    from app import crud
+
+    row = await crud.token_revocation.revoke_user(db, user_id=user_id, reason=reason)
+    revocation_list.add([row])
+    if include_refresh_tokens:
+        await crud.refresh_token.revoke_user_tokens(db, user_id=user_id)
@@ -1,13 +1,28 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence
 
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.schemas.token import TokenData # Импортируем схему TokenData
 
+# PyJWT — необязательная зависимость, альтернативный бэкенд JWT (см. _PyJWTBackend)
+try:
+    import jwt as pyjwt
+except ImportError:  # pragma: no cover - зависит от окружения
+    pyjwt = None
+
+logger = logging.getLogger(__name__)
+
 # Создаем контекст для хэширования паролей
 # Используем bcrypt как основную схему
 # Помечаем все остальные схемы как устаревшие (для будущей миграции хэшей, если потребуется)
@@ -17,6 +32,59 @@ ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+
+class _JoseBackend:
+    """Подпись и проверка JWT через python-jose."""
+    name = "jose"
+    errors = (JWTError,)
+
+    @staticmethod
+    def encode(claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+    @staticmethod
+    def decode(token: str) -> Dict[str, Any]:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+class _PyJWTBackend:
+    """
+    Подпись и проверка JWT через PyJWT. Для HS256 по скорости не отличается
+    от python-jose (см. Doc/Benchmarks.md); нужна там, где python-jose
+    собрана без cryptography, и как путь миграции с python-jose.
+    """
+    name = "pyjwt"
+    errors = (pyjwt.PyJWTError,) if pyjwt is not None else ()
+
+    @staticmethod
+    def encode(claims: Dict[str, Any]) -> str:
+        return pyjwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+    @staticmethod
+    def decode(token: str) -> Dict[str, Any]:
+        return pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def _select_jwt_backend(name: str):
+    """Возвращает бэкенд JWT по имени из настроек, откатываясь на python-jose."""
+    if name == "pyjwt":
+        if pyjwt is not None:
+            return _PyJWTBackend
+        logger.warning("JWT_BACKEND=pyjwt, но PyJWT не установлен; используется python-jose")
+    elif name != "jose":
+        logger.warning("Неизвестный JWT_BACKEND=%r; используется python-jose", name)
+    return _JoseBackend
+
+
+jwt_backend = _select_jwt_backend(settings.JWT_BACKEND.lower())
+
+# Кэш проверенных токенов: ключ — SHA-256 токена, запись живет до его `exp`.
+# Браузер использует один токен до истечения срока, поэтому повторные запросы
+# обходятся без проверки подписи и построения TokenData.
+token_cache: Optional[TTLCache[bytes, TokenData]] = (
+    TTLCache(maxsize=settings.TOKEN_CACHE_SIZE) if settings.TOKEN_CACHE_SIZE > 0 else None
+)
+
 # Исключение для невалидных учетных данных
 credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,6 +100,49 @@ def get_password_hash(password: str) -> str:
     """Хэширует пароль."""
     return pwd_context.hash(password)
 
+# Пул процессов для массового хэширования паролей: bcrypt нагружает CPU
+# и держит GIL, поэтому потоки не дают выигрыша. Создается при первом использовании.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+HASH_WORKERS = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+    return _hash_pool
+
+def _hash_password_chunk(passwords: Sequence[str]) -> List[str]:
+    """Хэширует пачку паролей в процессе пула."""
+    return [pwd_context.hash(password) for password in passwords]
+
+async def hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """
+    Хэширует пароли параллельно в пуле процессов, не блокируя цикл событий.
+
+    Пароли делятся на пачки (по несколько на процесс), чтобы накладные
+    расходы на передачу между процессами не съедали выигрыш.
+
+    Returns:
+        Список хэшей в том же порядке, что и пароли.
+    """
+    if not passwords:
+        return []
+    pool = _get_hash_pool()
+    chunk_size = max(1, len(passwords) // (HASH_WORKERS * 4))
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(pool, _hash_password_chunk, passwords[i:i + chunk_size])
+        for i in range(0, len(passwords), chunk_size)
+    ))
+    return [hashed for chunk in chunks for hashed in chunk]
+
+def shutdown_hash_pool() -> None:
+    """Останавливает пул процессов хэширования (при завершении приложения)."""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
 def create_access_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -52,9 +163,12 @@ def create_access_token(
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    # Добавляем стандартное поле 'iat' (issued at)
-    to_encode.update({"iat": datetime.now(timezone.utc)})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Добавляем стандартное поле 'iat' (issued at) с долями секунды: с ним
+    # сравнивается момент принудительного выхода пользователя
+    to_encode.update({"iat": datetime.now(timezone.utc).timestamp()})
+    # Уникальный идентификатор токена для точечного отзыва (logout)
+    to_encode.update({"jti": uuid.uuid4().hex})
+    encoded_jwt = jwt_backend.encode(to_encode)
     return encoded_jwt
 
 def decode_access_token(token: str) -> TokenData:
@@ -70,8 +184,14 @@ def decode_access_token(token: str) -> TokenData:
     Returns:
         Объект TokenData с данными из токена.
     """
+    cache_key = hashlib.sha256(token.encode()).digest() if token_cache is not None else None
+    if cache_key is not None:
+        cached = token_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt_backend.decode(token)
         # Проверяем наличие обязательных полей (хотя бы username или user_id)
         username: Optional[str] = payload.get("sub")
         user_id: Optional[int] = payload.get("user_id")
@@ -81,11 +201,23 @@ def decode_access_token(token: str) -> TokenData:
             raise credentials_exception # Недостаточно данных в токене
 
         # Валидируем данные с помощью Pydantic схемы
-        token_data = TokenData(username=username, user_id=user_id, role=role)
-
-    except JWTError: # Ловим ошибки декодирования/валидации JWT
+        token_data = TokenData(
+            username=username,
+            user_id=user_id,
+            role=role,
+            jti=payload.get("jti"),
+            iat=payload.get("iat"),
+            exp=payload.get("exp"),
+        )
+
+    except jwt_backend.errors: # Ловим ошибки декодирования/валидации JWT
         raise credentials_exception
     except Exception: # Ловим другие возможные ошибки (например, при валидации Pydantic)
         raise credentials_exception
 
+    # Кэшируем только токены с ограниченным сроком жизни
+    exp = payload.get("exp")
+    if cache_key is not None and isinstance(exp, (int, float)):
+        token_cache.set(cache_key, token_data, expires_at=float(exp))
+
     return token_data
\ No newline at end of file
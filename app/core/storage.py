@@ -0,0 +1,60 @@
+# Файл: app/core/storage.py
+import logging
+import os
+from pathlib import Path
+from typing import Iterable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_upload_root() -> Path:
+    """Возвращает корневую директорию хранилища загруженных файлов."""
+    return Path(settings.UPLOAD_DIRECTORY)
+
+
+def resolve_stored_path(relative_path: str) -> Path:
+    """
+    Преобразует относительный путь из `files.file_path` в путь на диске.
+
+    Raises:
+        ValueError: Если путь выходит за пределы директории загрузок.
+    """
+    root = get_upload_root().resolve()
+    full_path = (root / relative_path).resolve()
+    if root != full_path and root not in full_path.parents:
+        raise ValueError(f"Путь {relative_path!r} выходит за пределы директории загрузок")
+    return full_path
+
+
+def remove_stored_file(relative_path: str) -> bool:
+    """
+    Удаляет файл из хранилища по относительному пути.
+
+    Ошибки файловой системы не пробрасываются, а логируются: запись в БД
+    важнее, а оставшиеся на диске "сироты" подберет reconcile_uploads.
+
+    Returns:
+        True, если файл был удален, иначе False.
+    """
+    try:
+        full_path = resolve_stored_path(relative_path)
+    except ValueError as e:
+        logger.warning("Пропуск удаления файла: %s", e)
+        return False
+
+    try:
+        os.remove(full_path)
+    except FileNotFoundError:
+        logger.info("Файл не найден на диске: %s", full_path)
+        return False
+    except OSError as e:
+        logger.error("Ошибка удаления файла %s: %s", full_path, e)
+        return False
+    return True
+
+
+def remove_stored_files(relative_paths: Iterable[str]) -> int:
+    """Удаляет несколько файлов из хранилища. Возвращает количество удаленных."""
+    return sum(1 for path in relative_paths if remove_stored_file(path))
@@ -0,0 +1,163 @@
+# Файл: app/core/ticket_events.py
+"""
+История изменений заявок (таблица ticket_events).
+
+Эндпоинты не пишут события в своей транзакции: событие кладется в буфер
+в памяти воркера, а фоновая задача записывает накопленное пачкой
+многострочных INSERT — раз в TICKET_EVENTS_FLUSH_INTERVAL секунд или
+сразу при накоплении TICKET_EVENTS_BATCH_SIZE событий. Поэтому запись
+истории не добавляет запросов к изменению заявки. Цена — события,
+не записанные к моменту аварийной остановки воркера, теряются;
+при штатной остановке буфер дописывается (close в shutdown).
+"""
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Поля заявки, изменения которых попадают в историю
+TRACKED_FIELDS = ("status_id", "priority_id", "device_id", "description", "resolution_notes")
+
+# Типы событий
+EVENT_UPDATED = "updated"
+EVENT_STATUS_CHANGED = "status_changed"
+EVENT_TECHNICIAN_ASSIGNED = "technician_assigned"
+EVENT_TECHNICIAN_REMOVED = "technician_removed"
+
+
+def snapshot(ticket: Any) -> Dict[str, Any]:
+    """Значения отслеживаемых полей заявки до изменения."""
+    return {field: getattr(ticket, field) for field in TRACKED_FIELDS}
+
+
+def diff(before: Mapping[str, Any], after: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Измененные поля в формате {"поле": {"old": ..., "new": ...}}."""
+    return {
+        field: {"old": before[field], "new": after.get(field)}
+        for field in before
+        if field in after and after[field] != before[field]
+    }
+
+
+class TicketEventBuffer:
+    """
+    Буфер событий истории с пакетной записью в фоне.
+
+    Args:
+        batch_size: Сколько событий записывать одним INSERT; при накоплении
+                    стольких событий запись начинается, не дожидаясь таймера.
+        flush_interval: Максимальная задержка записи события (с).
+        max_pending: Предел очереди: если БД недоступна, новые события сверх
+                     него отбрасываются с ошибкой в лог, а не копятся в памяти.
+    """
+
+    def __init__(self, *, batch_size: int, flush_interval: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self,
+        *,
+        ticket_id: int,
+        actor_id: Optional[int],
+        event_type: str,
+        changes: Dict[str, Any],
+    ) -> None:
+        """
+        Ставит событие в очередь (без обращения к БД). Время события —
+        момент вызова. Пустые изменения не записываются.
+        """
+        if not changes:
+            return
+        if len(self._pending) >= self.max_pending:
+            logger.error("Буфер истории заявок переполнен, событие %s заявки %s отброшено", event_type, ticket_id)
+            return
+        self._pending.append({
+            "ticket_id": ticket_id,
+            "actor_id": actor_id,
+            "event_type": event_type,
+            "changes": changes,
+            "created_at": datetime.now(timezone.utc),
+        })
+        self._ensure_task()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def record_changes(
+        self,
+        *,
+        ticket_id: int,
+        actor_id: Optional[int],
+        event_type: str,
+        before: Mapping[str, Any],
+        after: Mapping[str, Any],
+    ) -> None:
+        """Ставит в очередь событие с разницей снимков before/after (см. snapshot)."""
+        self.record(ticket_id=ticket_id, actor_id=actor_id, event_type=event_type, changes=diff(before, after))
+
+    def _ensure_task(self) -> None:
+        """Запускает фоновую запись при первом событии в текущем цикле событий."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closing:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Записывает накопленные события. При ошибке записи события
+        возвращаются в начало очереди и будут записаны следующей попыткой.
+
+        Returns:
+            Количество записанных событий.
+        """
+        from app import crud
+        from app.db.session import AsyncSessionFactory
+
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        try:
+            async with AsyncSessionFactory() as db:
+                return await crud.ticket_event.insert_events(db, events=batch, chunk_size=self.batch_size)
+        except Exception:
+            logger.exception("Не удалось записать %d событий истории заявок", len(batch))
+            room = max(self.max_pending - len(self._pending), 0)
+            self._pending[:0] = batch[:room]
+            return 0
+
+    async def close(self) -> None:
+        """Останавливает фоновую запись и дописывает очередь (при остановке приложения)."""
+        if self._task is not None:
+            # Не отменяем задачу: прерванная запись потеряла бы взятую из очереди пачку
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._closing = False
+        await self.flush()
+
+
+event_buffer = TicketEventBuffer(
+    batch_size=settings.TICKET_EVENTS_BATCH_SIZE,
+    flush_interval=settings.TICKET_EVENTS_FLUSH_INTERVAL,
+    max_pending=settings.TICKET_EVENTS_MAX_PENDING,
+)
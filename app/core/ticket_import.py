@@ -0,0 +1,121 @@
+# Файл: app/core/ticket_import.py
+"""
+Массовый импорт заявок — общая логика для эндпоинта администратора
+(POST /api/v1/admin/tickets/import) и утилиты `python -m app.jobs.import_tickets`.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, schemas
+from app.core.bulk_import import format_validation_error
+from app.core.workflow import get_workflow
+
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Даты без часового пояса считаются UTC (колонки заявок — timestamptz)."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def import_tickets(
+    db: AsyncSession,
+    rows: Sequence[Dict[str, Any]],
+    *,
+    batch_size: int,
+) -> schemas.ticket.TicketImportResult:
+    """
+    Проверяет строки и вставляет заявки пачками через COPY.
+
+    Ссылки на пользователей и устройства проверяются одним запросом на всю
+    выборку, приоритеты и статусы — по справочникам. Строки с ошибками
+    пропускаются и возвращаются в `errors`; каждая пачка фиксируется отдельно,
+    и ошибка вставки пачки (например, пользователя удалили во время импорта)
+    помечает ошибкой только строки этой пачки.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        rows: Строки (словари) из CSV или JSON.
+        batch_size: Размер пачки COPY.
+    """
+    started = time.monotonic()
+    errors: List[schemas.bulk_import.ImportRowError] = []
+    parsed: List[tuple] = []  # (номер строки, TicketImportRow)
+
+    # 1. Валидация формата строк
+    for number, raw in enumerate(rows, start=1):
+        try:
+            row = schemas.ticket.TicketImportRow.model_validate(raw)
+        except ValidationError as e:
+            errors.append(schemas.bulk_import.ImportRowError(row=number, errors=format_validation_error(e)))
+            continue
+        parsed.append((number, row))
+
+    # 2. Проверка ссылок — по одному запросу на всю выборку
+    user_ids = await crud.user.get_existing_user_ids(db, (row.user_id for _, row in parsed))
+    device_ids = await crud.device.get_existing_device_ids(db, (row.device_id for _, row in parsed))
+    priority_ids = {priority.priority_id for priority in await crud.priority.get_priorities(db, limit=1000)}
+    # Статусы и начальный статус — из графа рабочего процесса (как в crud.ticket.create_ticket)
+    status_workflow = await get_workflow(db)
+    final_by_status = status_workflow.final_by_status
+
+    now = datetime.now(timezone.utc)
+    records: List[tuple] = []
+    numbers: List[int] = []
+    for number, row in parsed:
+        status_id = row.status_id if row.status_id is not None else status_workflow.initial_status_id
+        created_at = _as_utc(row.created_at) or now
+        closed_at = _as_utc(row.closed_at)
+        row_errors = []
+        if row.user_id not in user_ids:
+            row_errors.append(f"user_id: пользователь с ID {row.user_id} не найден")
+        if row.device_id not in device_ids:
+            row_errors.append(f"device_id: устройство с ID {row.device_id} не найдено")
+        if row.priority_id not in priority_ids:
+            row_errors.append(f"priority_id: приоритет с ID {row.priority_id} не найден")
+        if status_id not in final_by_status:
+            row_errors.append(f"status_id: статус с ID {status_id} не найден")
+        if closed_at is not None and closed_at < created_at:
+            row_errors.append("closed_at: раньше даты создания")
+        if row_errors:
+            errors.append(schemas.bulk_import.ImportRowError(row=number, errors=row_errors))
+            continue
+        if closed_at is None and final_by_status[status_id]:
+            # Заявка в финальном статусе всегда имеет дату закрытия
+            closed_at = max(created_at, now)
+        records.append((
+            row.user_id, row.device_id, row.priority_id, status_id, row.description,
+            row.resolution_notes, created_at, closed_at or created_at, closed_at, closed_at or created_at,
+        ))
+        numbers.append(number)
+
+    # 3. Вставка пачками через COPY
+    created = 0
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        try:
+            created += await crud.ticket.copy_tickets_bulk(db, records=batch)
+        except ValueError as e:
+            errors.extend(
+                schemas.bulk_import.ImportRowError(row=number, errors=[f"Пачка не вставлена: {e}"])
+                for number in numbers[start:start + batch_size]
+            )
+        logger.info("Импорт заявок: обработано %d из %d, создано %d", start + len(batch), len(records), created)
+
+    elapsed = time.monotonic() - started
+    errors.sort(key=lambda error: error.row)
+    return schemas.ticket.TicketImportResult(
+        total=len(rows),
+        created=created,
+        failed=len(errors),
+        errors=errors,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(created / elapsed, 1) if elapsed > 0 else 0.0,
+    )
@@ -0,0 +1,110 @@
+# Файл: app/core/workflow.py
+"""
+Рабочий процесс (workflow) заявки: статусы и разрешенные переходы между
+ними по ролям. Таблицы statuses и status_transitions компилируются в граф
+смежности в памяти воркера, поэтому проверка перехода не требует запросов.
+"""
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Граф в памяти воркера. Сбрасывается при изменении статусов и переходов
+# в этом воркере; в остальных устаревает по TTL.
+workflow_cache: Optional[TTLCache] = (
+    TTLCache(maxsize=1, ttl=settings.WORKFLOW_CACHE_TTL)
+    if settings.WORKFLOW_CACHE_TTL > 0 else None
+)
+_CACHE_KEY = "workflow"
+
+
+@dataclass(frozen=True)
+class StatusWorkflow:
+    """
+    Скомпилированный рабочий процесс.
+
+    Attributes:
+        final_by_status: {status_id: является ли статус финальным} для всех статусов.
+        initial_status_id: Статус новой заявки (None — статусов нет).
+        common: {from_status_id: разрешенные to_status_id} для любой роли.
+        by_role: То же для каждой роли, уже объединенное с common.
+    """
+    final_by_status: Dict[int, bool]
+    initial_status_id: Optional[int]
+    common: Dict[int, FrozenSet[int]]
+    by_role: Dict[str, Dict[int, FrozenSet[int]]]
+
+    def status_exists(self, status_id: int) -> bool:
+        return status_id in self.final_by_status
+
+    def is_final(self, status_id: int) -> bool:
+        return self.final_by_status.get(status_id, False)
+
+    def allowed_targets(self, role: str, from_status_id: int) -> FrozenSet[int]:
+        """Статусы, в которые роль может перевести заявку из from_status_id."""
+        adjacency = self.by_role.get(role, self.common)
+        return adjacency.get(from_status_id, frozenset())
+
+    def can_transition(self, role: str, from_status_id: int, to_status_id: int) -> bool:
+        """Разрешен ли переход. Статус без изменения (from == to) всегда разрешен."""
+        return from_status_id == to_status_id or to_status_id in self.allowed_targets(role, from_status_id)
+
+
+def compile_workflow(statuses, transitions) -> StatusWorkflow:
+    """
+    Строит граф из статусов (в порядке отображения) и переходов
+    (строки from_status_id, to_status_id, role_name; role_name None — любая роль).
+
+    Начальный статус — первый по порядку отображения статус с is_initial;
+    если такой не отмечен — первый нефинальный.
+    """
+    final_by_status = {item.status_id: item.is_final for item in statuses}
+    initial = next((item.status_id for item in statuses if item.is_initial), None)
+    if initial is None:
+        initial = next((item.status_id for item in statuses if not item.is_final), None)
+
+    common: Dict[int, set] = {}
+    role_edges: Dict[str, Dict[int, set]] = {}
+    for from_status_id, to_status_id, role_name in transitions:
+        adjacency = common if role_name is None else role_edges.setdefault(role_name, {})
+        adjacency.setdefault(from_status_id, set()).add(to_status_id)
+
+    frozen_common = {from_id: frozenset(targets) for from_id, targets in common.items()}
+    by_role = {
+        role_name: {
+            from_id: frozenset(edges.get(from_id, ())) | frozen_common.get(from_id, frozenset())
+            for from_id in set(edges) | set(frozen_common)
+        }
+        for role_name, edges in role_edges.items()
+    }
+    return StatusWorkflow(
+        final_by_status=final_by_status,
+        initial_status_id=initial,
+        common=frozen_common,
+        by_role=by_role,
+    )
+
+
+async def get_workflow(db: AsyncSession) -> StatusWorkflow:
+    """Возвращает граф из кэша воркера или загружает его двумя запросами."""
+    from app import crud
+
+    if workflow_cache is not None:
+        cached = workflow_cache.get(_CACHE_KEY)
+        if cached is not None:
+            return cached
+    statuses = await crud.status.get_statuses(db, limit=None)
+    transitions = await crud.status_transition.get_transition_edges(db)
+    workflow = compile_workflow(statuses, transitions)
+    if workflow_cache is not None:
+        workflow_cache.set(_CACHE_KEY, workflow)
+    return workflow
+
+
+def invalidate_workflow() -> None:
+    """Сбрасывает граф (вызывается при изменении статусов и переходов)."""
+    if workflow_cache is not None:
+        workflow_cache.clear()
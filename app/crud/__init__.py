@@ -5,11 +5,19 @@ from . import crud_user as user
 from . import crud_device_type as device_type # Добавляем импорт для типов устройств
 from . import crud_priority as priority # Добавляем импорт для приоритетов
 from . import crud_status as status # Добавляем импорт для статусов
+from . import crud_status_transition as status_transition # Переходы между статусами (workflow)
 from . import crud_device as device # Добавляем импорт для устройств
 from . import crud_user_role as user_role # Добавляем импорт для ролей пользователей
 from . import crud_ticket as ticket # Добавляем импорт для заявок
 from . import crud_technician_assignment as technician_assignment # Добавляем импорт для назначения техников
 from . import crud_file as file # Добавляем импорт для файлов
+from . import crud_refresh_token as refresh_token # Токены обновления (refresh tokens)
+from . import crud_token_revocation as token_revocation # Отзыв токенов доступа
+from . import crud_idempotency_key as idempotency_key # Ключи идемпотентности (Idempotency-Key)
+from . import crud_ticket_event as ticket_event # История изменений заявок
+from . import crud_ticket_comment as ticket_comment # Комментарии к заявкам
+from . import crud_ticket_stats as ticket_stats # Дневная сводка по заявкам
+from . import crud_report as report # Аналитические отчеты (техники, устройства)
 
 # Это позволяет импортировать и использовать так:
 # from app import crud
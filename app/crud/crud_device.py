@@ -1,10 +1,32 @@
 # Файл: app/crud/crud_device.py
+from sqlalchemy import Integer, and_, any_, case, func, literal, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import Awaitable, Callable, Iterable, List, Optional, Sequence, Set, Tuple
 
 from app import models, schemas # Импортируем модели и схемы
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.crud import crud_ticket_stats
+
+# Кэш горячих результатов поиска устройств в памяти воркера. Сбрасывается
+# при изменении устройств в этом воркере; в остальных устаревает по TTL.
+device_search_cache: Optional[TTLCache] = (
+    TTLCache(maxsize=settings.DEVICE_SEARCH_CACHE_SIZE, ttl=settings.DEVICE_SEARCH_CACHE_TTL)
+    if settings.DEVICE_SEARCH_CACHE_SIZE > 0 else None
+)
+
+def _invalidate_search_cache() -> None:
+    if device_search_cache is not None:
+        device_search_cache.clear()
+
+def _like_pattern(term: str, prefix: bool = False) -> str:
+    """Экранирует спецсимволы LIKE и строит шаблон поиска подстроки (или начала строки)."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
 
 async def get_device(db: AsyncSession, device_id: int) -> Optional[models.Device]:
     """Получает устройство по его ID, подгружая связанный тип."""
@@ -42,6 +64,88 @@ async def get_devices(
     result = await db.execute(statement)
     return result.scalars().all()
 
+async def search_devices(
+    db: AsyncSession,
+    *,
+    query: Optional[str] = None,
+    device_type_id: Optional[int] = None,
+    limit: int = 20,
+    after: Optional[Tuple[int, str, int]] = None
+) -> List[Row]:
+    """
+    Поиск устройств для автодополнения по названию и инвентарному номеру.
+
+    Устройства находятся по вхождению всех слов запроса в название, по вхождению
+    в инвентарный номер или по нечеткому совпадению названия (триграммы pg_trgm).
+    Порядок: точное совпадение инвентарного номера, начало инвентарного номера,
+    начало названия, остальные; внутри группы — по названию и ID.
+    Результаты кэшируются в памяти воркера на DEVICE_SEARCH_CACHE_TTL секунд.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        query: Строка поиска (без нее — все устройства по названию).
+        device_type_id: Фильтр по типу устройства.
+        limit: Максимальное количество записей.
+        after: Ключ последней записи предыдущей страницы (rank, name, device_id)
+               с проверенными типами (int, str, int).
+
+    Returns:
+        Строки с полями device_id, name, inventory_number, device_type_id,
+        device_type (название типа) и rank (группа релевантности для курсора).
+    """
+    query = query.strip() if query else None
+    cache_key = (query.lower() if query else None, device_type_id, limit, after)
+    if device_search_cache is not None:
+        cached = device_search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    device = models.Device
+    if query:
+        lowered = query.lower()
+        rank = case(
+            (func.lower(device.inventory_number) == lowered, 0),
+            (device.inventory_number.ilike(_like_pattern(query, prefix=True), escape="\\"), 1),
+            (device.name.ilike(_like_pattern(query, prefix=True), escape="\\"), 2),
+            else_=3,
+        )
+        name_matches = [device.name.ilike(_like_pattern(term), escape="\\") for term in lowered.split()]
+        condition = or_(
+            and_(*name_matches),
+            device.inventory_number.ilike(_like_pattern(query), escape="\\"),
+            # %> — нечеткое совпадение (word_similarity выше порога pg_trgm)
+            device.name.op("%>")(query),
+        )
+    else:
+        rank = literal(0)
+        condition = None
+
+    statement = (
+        select(
+            device.device_id,
+            device.name,
+            device.inventory_number,
+            device.device_type_id,
+            models.DeviceType.name.label("device_type"),
+            rank.label("rank"),
+        )
+        .outerjoin(models.DeviceType, models.DeviceType.device_type_id == device.device_type_id)
+        .order_by(rank, device.name, device.device_id)
+        .limit(limit)
+    )
+    if condition is not None:
+        statement = statement.where(condition)
+    if device_type_id is not None:
+        statement = statement.where(device.device_type_id == device_type_id)
+    if after:
+        statement = statement.where(tuple_(rank, device.name, device.device_id) > tuple_(*after))
+
+    result = await db.execute(statement)
+    rows = result.all()
+    if device_search_cache is not None:
+        device_search_cache.set(cache_key, rows)
+    return rows
+
 async def create_device(db: AsyncSession, *, obj_in: schemas.device.DeviceCreate) -> models.Device:
     """
     Создает новое устройство.
@@ -63,6 +167,7 @@ async def create_device(db: AsyncSession, *, obj_in: schemas.device.DeviceCreate
     db_obj = models.Device(**obj_in.model_dump()) # Используем model_dump для Pydantic V2
     db.add(db_obj)
     await db.commit()
+    _invalidate_search_cache()
     await db.refresh(db_obj)
     # Перезагружаем объект с подгрузкой device_type для возврата
     await db.refresh(db_obj, attribute_names=['device_type'])
@@ -71,7 +176,10 @@ async def create_device(db: AsyncSession, *, obj_in: schemas.device.DeviceCreate
 async def update_device(
     db: AsyncSession, *, db_obj: models.Device, obj_in: schemas.device.DeviceUpdate
 ) -> models.Device:
-    """Обновляет существующее устройство."""
+    """
+    Обновляет существующее устройство. При смене типа строки заявок
+    устройства в дневной сводке переносятся на новый тип в той же транзакции.
+    """
     update_data = obj_in.model_dump(exclude_unset=True) # Используем model_dump для Pydantic V2
 
     # Проверяем уникальность инвентарного номера, если он меняется
@@ -83,10 +191,20 @@ async def update_device(
     # TODO: Проверить, существует ли device_type_id, если он указан?
 
     if update_data:
+        type_changed = (
+            "device_type_id" in update_data and update_data["device_type_id"] != db_obj.device_type_id
+        )
+        device_tickets = models.Ticket.device_id == db_obj.device_id
+        if type_changed:
+            await crud_ticket_stats.retract_tickets(db, device_tickets)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
+        if type_changed:
+            await db.flush()
+            await crud_ticket_stats.record_tickets(db, device_tickets)
         await db.commit()
+        _invalidate_search_cache()
         await db.refresh(db_obj)
         # Перезагружаем объект с подгрузкой device_type для возврата
         await db.refresh(db_obj, attribute_names=['device_type'])
@@ -99,4 +217,115 @@ async def remove_device(db: AsyncSession, *, device_id: int) -> Optional[models.
         # TODO: Добавить проверку, не связаны ли с устройством заявки?
         await db.delete(db_obj)
         await db.commit()
-    return db_obj # Возвращаем удаленный объект или None, если не найден
\ No newline at end of file
+        _invalidate_search_cache()
+    return db_obj # Возвращаем удаленный объект или None, если не найден
+
+# --- Массовый импорт и экспорт ---
+
+# Колонки, передаваемые через COPY (порядок важен для записей)
+IMPORT_COLUMNS = ("device_id", "name", "device_type_id", "inventory_number")
+
+_EXPORT_QUERY = """
+    SELECT d.device_id, d.name, d.device_type_id, dt.name AS device_type, d.inventory_number
+    FROM devices d
+    LEFT JOIN device_types dt ON dt.device_type_id = d.device_type_id
+    ORDER BY d.device_id
+"""
+
+async def get_existing_device_ids(db: AsyncSession, device_ids: Iterable[int]) -> Set[int]:
+    """
+    Возвращает те ID из переданных, для которых устройство существует.
+    Проверка выполняется одним запросом (список передается одним параметром-массивом).
+    """
+    device_ids = set(device_ids)
+    if not device_ids:
+        return set()
+    result = await db.execute(
+        select(models.Device.device_id).where(models.Device.device_id == any_(literal(list(device_ids), ARRAY(Integer))))
+    )
+    return set(result.scalars().all())
+
+async def upsert_devices_bulk(
+    db: AsyncSession,
+    *,
+    records: Sequence[Tuple[int, str, Optional[int], Optional[str]]]
+) -> Tuple[int, int, List[Tuple[int, str]]]:
+    """
+    Создает или обновляет устройства пачкой в одной транзакции.
+
+    Записи загружаются через COPY во временную таблицу, после чего одним
+    INSERT ... ON CONFLICT (device_id) DO UPDATE переносятся в `devices`.
+    Строки без изменений не перезаписываются. Строки, чей инвентарный номер
+    уже принадлежит другому устройству, пропускаются и возвращаются как
+    конфликты (перенос номера между устройствами выполняется в два импорта).
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        records: Кортежи в порядке IMPORT_COLUMNS; device_id и inventory_number
+                 внутри пачки должны быть уникальны, типы устройств — проверены.
+
+    Returns:
+        (создано, обновлено, [(device_id, inventory_number) пропущенных из-за конфликта]).
+    """
+    if not records:
+        return 0, 0, []
+    await db.execute(text(
+        "CREATE TEMP TABLE devices_import ("
+        " device_id integer PRIMARY KEY,"
+        " name varchar(255) NOT NULL,"
+        " device_type_id integer,"
+        " inventory_number varchar(100)"
+        ") ON COMMIT DROP"
+    ))
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        "devices_import", records=records, columns=IMPORT_COLUMNS
+    )
+    conflicts = await db.execute(text(
+        "DELETE FROM devices_import s USING devices d"
+        " WHERE d.inventory_number = s.inventory_number AND d.device_id <> s.device_id"
+        " RETURNING s.device_id, s.inventory_number"
+    ))
+    conflicted = [tuple(row) for row in conflicts.all()]
+    # Строки заявок устройств, у которых меняется тип, переносятся в дневной сводке
+    retyped = await db.execute(text(
+        "SELECT s.device_id FROM devices_import s JOIN devices d ON d.device_id = s.device_id"
+        " WHERE s.device_type_id IS DISTINCT FROM d.device_type_id"
+    ))
+    retyped_ids = list(retyped.scalars().all())
+    retyped_tickets = models.Ticket.device_id == any_(literal(retyped_ids, ARRAY(Integer)))
+    if retyped_ids:
+        await crud_ticket_stats.retract_tickets(db, retyped_tickets)
+    result = await db.execute(text(
+        "INSERT INTO devices (device_id, name, device_type_id, inventory_number)"
+        " SELECT device_id, name, device_type_id, inventory_number FROM devices_import"
+        " ON CONFLICT (device_id) DO UPDATE SET"
+        "  name = EXCLUDED.name,"
+        "  device_type_id = EXCLUDED.device_type_id,"
+        "  inventory_number = EXCLUDED.inventory_number"
+        " WHERE (devices.name, devices.device_type_id, devices.inventory_number)"
+        "  IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.device_type_id, EXCLUDED.inventory_number)"
+        " RETURNING (xmax = 0) AS inserted"  # xmax = 0 — строка вставлена, а не обновлена
+    ))
+    flags = result.scalars().all()
+    if retyped_ids:
+        await crud_ticket_stats.record_tickets(db, retyped_tickets)
+    await db.commit()
+    _invalidate_search_cache()
+    inserted = sum(1 for flag in flags if flag)
+    return inserted, len(flags) - inserted, conflicted
+
+async def copy_devices_csv(db: AsyncSession, *, output: Callable[[bytes], Awaitable[None]]) -> None:
+    """
+    Выгружает все устройства в CSV (с заголовком) через COPY ... TO STDOUT.
+
+    Данные передаются частями в корутину `output` по мере чтения из БД,
+    поэтому размер выгрузки не ограничен памятью. Колонки совпадают
+    с форматом массового импорта (плюс название типа устройства).
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_from_query(
+        _EXPORT_QUERY, output=output, format="csv", header=True
+    )
@@ -2,7 +2,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app import models, schemas # Импортируем модели и схемы
 
@@ -27,6 +27,14 @@ async def get_device_types(db: AsyncSession, skip: int = 0, limit: int = 100) ->
     )
     return result.scalars().all()
 
+async def get_device_type_ids_by_name(db: AsyncSession) -> Dict[str, int]:
+    """
+    Возвращает словарь "название типа -> ID" для всего справочника одним запросом.
+    Справочник небольшой; используется для проверки типов при массовом импорте.
+    """
+    result = await db.execute(select(models.DeviceType.name, models.DeviceType.device_type_id))
+    return {name: device_type_id for name, device_type_id in result.all()}
+
 async def create_device_type(db: AsyncSession, *, obj_in: schemas.device_type.DeviceTypeCreate) -> models.DeviceType:
     """Создает новый тип устройства."""
     db_obj = models.DeviceType(name=obj_in.name)
@@ -1,10 +1,11 @@
 # Файл: app/crud/crud_file.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete as sqlalchemy_delete
-from typing import Optional
+from sqlalchemy import delete as sqlalchemy_delete, func, update, values, column, Integer, BigInteger
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from app.models.file import File
+from app.models.ticket import Ticket
 from app.schemas.file import FileCreate
 
 async def get_file(db: AsyncSession, file_id: int) -> Optional[File]:
@@ -21,17 +22,36 @@ async def get_file(db: AsyncSession, file_id: int) -> Optional[File]:
     result = await db.execute(select(File).where(File.file_id == file_id))
     return result.scalars().first()
 
-async def create_file(db: AsyncSession, *, obj_in: FileCreate) -> File:
+async def create_file(db: AsyncSession, *, obj_in: FileCreate, commit: bool = True) -> File:
     """
-    Создает новую запись о файле в базе данных.
+    Создает новую запись о файле в базе данных и в той же транзакции
+    увеличивает tickets.files_count и tickets.total_files_size.
     
     Args:
         db: Асинхронная сессия базы данных.
         obj_in: Схема с данными для создания записи о файле.
+        commit: Фиксировать ли транзакцию (False — фиксирует вызывающий,
+                например вместе с ответом Idempotency-Key).
         
     Returns:
         Созданный объект File.
+
+    Raises:
+        ValueError: Заявка не найдена.
     """
+    result = await db.execute(
+        update(Ticket)
+        .where(Ticket.ticket_id == obj_in.ticket_id)
+        .values(
+            files_count=Ticket.files_count + 1,
+            total_files_size=Ticket.total_files_size + obj_in.file_size,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise ValueError(f"Заявка с ID {obj_in.ticket_id} не найдена")
+
     # Создаем объект модели SQLAlchemy
     db_obj = File(
         ticket_id=obj_in.ticket_id,
@@ -42,13 +62,17 @@ async def create_file(db: AsyncSession, *, obj_in: FileCreate) -> File:
     )
     
     db.add(db_obj)
-    await db.commit()
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
     await db.refresh(db_obj)
     return db_obj
 
 async def delete_file(db: AsyncSession, *, file_id: int) -> Optional[File]:
     """
-    Удаляет запись о файле из базы данных.
+    Удаляет запись о файле из базы данных и в той же транзакции уменьшает
+    счетчики файлов заявки.
     
     Args:
         db: Асинхронная сессия базы данных.
@@ -62,5 +86,79 @@ async def delete_file(db: AsyncSession, *, file_id: int) -> Optional[File]:
         return None
         
     await db.delete(db_obj)
+    await _decrement_ticket_counters(db, {db_obj.ticket_id: (1, db_obj.file_size)})
     await db.commit()
     return db_obj
+
+async def _decrement_ticket_counters(db: AsyncSession, removed: Dict[int, Tuple[int, int]]) -> None:
+    """
+    Уменьшает files_count и total_files_size заявок одним UPDATE ... FROM (VALUES ...).
+
+    Args:
+        removed: {ticket_id: (количество удаленных файлов, их суммарный размер)}.
+    """
+    if not removed:
+        return
+    deltas = values(
+        column("ticket_id", Integer), column("files", Integer), column("size", BigInteger), name="removed"
+    ).data([(ticket_id, files, size) for ticket_id, (files, size) in removed.items()])
+    await db.execute(
+        update(Ticket)
+        .where(Ticket.ticket_id == deltas.c.ticket_id)
+        .values(
+            files_count=func.greatest(Ticket.files_count - deltas.c.files, 0),
+            total_files_size=func.greatest(Ticket.total_files_size - deltas.c.size, 0),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+async def get_ticket_file_paths(db: AsyncSession, *, ticket_id: int) -> List[str]:
+    """
+    Получает относительные пути всех файлов заявки.
+
+    Используется перед удалением заявки, чтобы после каскадного удаления
+    записей можно было убрать и сами файлы с диска.
+    """
+    result = await db.execute(select(File.file_path).where(File.ticket_id == ticket_id))
+    return list(result.scalars().all())
+
+async def stream_file_paths(
+    db: AsyncSession, *, batch_size: int = 1000
+) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Потоково отдает пары (file_id, file_path), отсортированные по file_path.
+
+    Сортировка выполняется в побайтовой коллации "C", чтобы порядок совпадал
+    со сравнением строк в Python (нужно для слияния с обходом диска).
+    Записи читаются серверным курсором порциями по batch_size.
+    """
+    stmt = (
+        select(File.file_id, File.file_path)
+        .order_by(File.file_path.collate("C"), File.file_id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(stmt)
+    async for file_id, file_path in result:
+        yield file_id, file_path
+
+async def delete_files(db: AsyncSession, *, file_ids: Sequence[int]) -> int:
+    """
+    Удаляет записи о файлах одним запросом и в той же транзакции уменьшает
+    счетчики файлов затронутых заявок.
+
+    Returns:
+        Количество удаленных записей.
+    """
+    if not file_ids:
+        return 0
+    result = await db.execute(
+        sqlalchemy_delete(File).where(File.file_id.in_(file_ids)).returning(File.ticket_id, File.file_size)
+    )
+    rows = result.all()
+    removed: Dict[int, Tuple[int, int]] = {}
+    for ticket_id, file_size in rows:
+        files, size = removed.get(ticket_id, (0, 0))
+        removed[ticket_id] = (files + 1, size + file_size)
+    await _decrement_ticket_counters(db, removed)
+    await db.commit()
+    return len(rows)
@@ -0,0 +1,132 @@
+# Файл: app/crud/crud_idempotency_key.py
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+
+async def reserve_key(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    key: str,
+    request_hash: str,
+    expires_at: datetime
+) -> Optional[datetime]:
+    """
+    Резервирует ключ за текущим запросом одним INSERT ... ON CONFLICT.
+    Перезаписывается истекшая запись с тем же ключом, а также резерв без
+    ответа старше IDEMPOTENCY_PENDING_TIMEOUT_SECONDS (запрос, который его
+    занял, не завершился — например, упал процесс).
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        user_id: ID пользователя (ключи уникальны в пределах пользователя).
+        key: Значение заголовка Idempotency-Key.
+        request_hash: Отпечаток запроса.
+        expires_at: До какого момента хранить результат.
+
+    Returns:
+        Время резерва (created_at записи), если ключ зарезервирован этим
+        запросом; None, если он уже занят. Время резерва передается
+        в save_response и release_key, чтобы запрос, чей резерв заняли
+        заново, не изменил чужую запись.
+    """
+    statement = pg_insert(IdempotencyKey).values(
+        user_id=user_id, key=key, request_hash=request_hash, expires_at=expires_at
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={
+            "request_hash": statement.excluded.request_hash,
+            "status_code": None,
+            "response_body": None,
+            "created_at": func.now(),
+            "expires_at": statement.excluded.expires_at,
+        },
+        where=or_(
+            IdempotencyKey.expires_at <= func.now(),
+            and_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.created_at
+                <= func.now() - timedelta(seconds=settings.IDEMPOTENCY_PENDING_TIMEOUT_SECONDS),
+            ),
+        ),
+    ).returning(IdempotencyKey.created_at)
+    result = await db.execute(statement)
+    reserved_at = result.scalar_one_or_none()
+    await db.commit()
+    return reserved_at
+
+
+async def get_key(db: AsyncSession, *, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """Получает действующую (не истекшую) запись ключа."""
+    result = await db.execute(
+        select(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    return result.scalars().first()
+
+
+async def save_response(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    key: str,
+    reserved_at: datetime,
+    status_code: int,
+    response_body: bytes
+) -> bool:
+    """
+    Сохраняет код и тело ответа для зарезервированного ключа без коммита:
+    ответ фиксируется в одной транзакции с созданным объектом.
+
+    Returns:
+        False, если резерв reserved_at уже занят другим запросом
+        (истек IDEMPOTENCY_PENDING_TIMEOUT_SECONDS).
+    """
+    result = await db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at == reserved_at,
+            IdempotencyKey.status_code.is_(None),
+        )
+        .values(status_code=status_code, response_body=response_body)
+    )
+    return result.rowcount > 0
+
+
+async def release_key(db: AsyncSession, *, user_id: int, key: str, reserved_at: datetime) -> None:
+    """
+    Снимает резерв ключа, запрос по которому завершился ошибкой,
+    чтобы клиент мог повторить его с тем же ключом.
+    """
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at == reserved_at,
+            IdempotencyKey.status_code.is_(None),
+        )
+    )
+    await db.commit()
+
+
+async def delete_expired(db: AsyncSession) -> int:
+    """Удаляет истекшие записи. Возвращает количество удаленных."""
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,144 @@
+# Файл: app/crud/crud_refresh_token.py
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import update, delete, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+
+
+def hash_refresh_token(raw_token: str) -> str:
+    """Возвращает SHA-256 токена в hex (так токен хранится в БД)."""
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+async def create_refresh_token(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    family_id: Optional[str] = None,
+    commit: bool = True
+) -> Tuple[str, RefreshToken]:
+    """
+    Выпускает новый токен обновления.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        user_id: ID пользователя.
+        family_id: Цепочка ротации; если не указана, начинается новая (вход по паролю).
+        commit: Фиксировать ли транзакцию.
+
+    Returns:
+        Кортеж (токен в открытом виде, запись в БД). Открытый токен
+        возвращается клиенту один раз и больше нигде не сохраняется.
+    """
+    raw_token = secrets.token_urlsafe(48)
+    db_obj = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(raw_token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    db.add(db_obj)
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+    return raw_token, db_obj
+
+
+async def rotate_refresh_token(
+    db: AsyncSession,
+    *,
+    raw_token: str
+) -> Optional[Tuple[str, RefreshToken]]:
+    """
+    Меняет предъявленный токен обновления на новый из той же цепочки.
+
+    Строка токена блокируется (SELECT ... FOR UPDATE), поэтому два
+    параллельных обновления одним токеном не выпустят две ветки.
+    Если предъявлен уже использованный или отозванный токен, считаем его
+    украденным и отзываем всю цепочку.
+
+    Returns:
+        Кортеж (новый токен, новая запись) или None, если токен недействителен.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(raw_token))
+        .with_for_update()
+    )
+    db_obj = result.scalars().first()
+    if db_obj is None:
+        return None
+
+    if db_obj.revoked_at is not None:
+        await revoke_family(db, family_id=db_obj.family_id)
+        return None
+
+    if db_obj.expires_at <= now:
+        await db.rollback()
+        return None
+
+    db_obj.revoked_at = now
+    new_token = await create_refresh_token(
+        db, user_id=db_obj.user_id, family_id=db_obj.family_id, commit=False
+    )
+    await db.commit()
+    return new_token
+
+
+async def get_refresh_token(db: AsyncSession, *, raw_token: str) -> Optional[RefreshToken]:
+    """Получает запись токена обновления по открытому значению."""
+    result = await db.execute(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(raw_token))
+    )
+    return result.scalars().first()
+
+
+async def revoke_family(db: AsyncSession, *, family_id: str) -> int:
+    """
+    Отзывает все активные токены цепочки.
+
+    Returns:
+        Количество отозванных токенов.
+    """
+    result = await db.execute(
+        update(RefreshToken)
+        .where(and_(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def revoke_user_tokens(db: AsyncSession, *, user_id: int) -> int:
+    """
+    Отзывает все активные токены обновления пользователя (выход на всех устройствах).
+
+    Returns:
+        Количество отозванных токенов.
+    """
+    result = await db.execute(
+        update(RefreshToken)
+        .where(and_(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def delete_expired(db: AsyncSession) -> int:
+    """Удаляет истекшие токены обновления. Возвращает количество удаленных."""
+    result = await db.execute(
+        delete(RefreshToken).where(RefreshToken.expires_at < datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,336 @@
+# Файл: app/crud/crud_report.py
+"""
+Аналитические отчеты за период (дни в часовом поясе STATS_TIMEZONE).
+
+Отчеты считаются в SQL одним запросом на отчет и кэшируются в памяти
+воркера по периоду (REPORT_CACHE_SIZE, REPORT_CACHE_TTL). Закрытие заявки
+сбрасывает отчеты по техникам, создание — отчеты по устройствам, в период
+которых попадает текущий день (см. invalidate); повторное открытие
+сбрасывает все отчеты по техникам. Остальные изменения (назначения,
+закрытие заявок, созданных раньше) попадают в отчет по истечении
+REPORT_CACHE_TTL.
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import Float, Integer, cast, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.device import Device
+from app.models.device_type import DeviceType
+from app.models.status import Status
+from app.models.technician_assignment import TechnicianAssignment
+from app.models.ticket import Ticket
+from app.models.ticket_event import TicketEvent
+from app.models.user import User
+
+# Кэш отчетов: ключ — (имя отчета, date_from, date_to)
+report_cache: Optional[TTLCache] = (
+    TTLCache(maxsize=settings.REPORT_CACHE_SIZE, ttl=settings.REPORT_CACHE_TTL)
+    if settings.REPORT_CACHE_SIZE > 0 else None
+)
+
+TECHNICIAN_REPORT = "technicians"
+DEVICE_REPORT = "devices"
+
+
+def period_bounds(date_from: date, date_to: date) -> Tuple[datetime, datetime]:
+    """Полуинтервал [начало date_from, начало следующего за date_to дня) в часовом поясе статистики."""
+    zone = ZoneInfo(settings.STATS_TIMEZONE)
+    return (
+        datetime.combine(date_from, time.min, tzinfo=zone),
+        datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=zone),
+    )
+
+
+def invalidate(names: Sequence[str], day: Optional[date] = None) -> None:
+    """
+    Сбрасывает кэш отчетов names: только периоды, содержащие day
+    (день создания или закрытия заявки), или все, если day не задан
+    (импорт заявок, повторное открытие).
+    """
+    if report_cache is None:
+        return
+    for key in report_cache.keys():
+        name, date_from, date_to = key
+        if name in names and (day is None or date_from <= day <= date_to):
+            report_cache.pop(key)
+
+
+def today() -> date:
+    """Текущий день в часовом поясе статистики."""
+    return datetime.now(ZoneInfo(settings.STATS_TIMEZONE)).date()
+
+
+async def get_technician_report(db: AsyncSession, *, date_from: date, date_to: date) -> Dict[str, Any]:
+    """
+    Показатели техников по заявкам, закрытым за период: количество,
+    медиана и 90-й перцентиль времени от назначения до закрытия
+    (percentile_cont), доля повторно открытых заявок и места в рейтинге
+    (оконные функции rank() и sum() OVER ()).
+
+    Повторное открытие — событие истории заявки (ticket_events), переводящее
+    ее из финального статуса в нефинальный. Такой переход должен быть
+    разрешен рабочим процессом (по умолчанию — только администратору,
+    «Закрыта» → «В работе»); без него reopen_rate всегда 0. Повторное
+    открытие сбрасывает closed_at, поэтому заявка относится к периоду
+    последнего закрытия, а снова открытая в отчет не входит.
+
+    Returns:
+        {"generated_at": время расчета, "items": строки отчета (словари),
+        упорядоченные по числу заявок}.
+    """
+    cache_key = (TECHNICIAN_REPORT, date_from, date_to)
+    if report_cache is not None:
+        cached = report_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    start, end = period_bounds(date_from, date_to)
+    assignment = TechnicianAssignment
+    # Назначения на заявки, закрытые за период (назначение после закрытия не учитывается)
+    handled = (
+        select(
+            assignment.technician_id,
+            assignment.ticket_id,
+            func.extract("epoch", Ticket.closed_at - assignment.assigned_at).label("seconds"),
+        )
+        .join(Ticket, Ticket.ticket_id == assignment.ticket_id)
+        .where(Ticket.closed_at >= start, Ticket.closed_at < end, assignment.assigned_at <= Ticket.closed_at)
+        .cte("handled")
+    )
+    old_status, new_status = aliased(Status), aliased(Status)
+    status_change = TicketEvent.changes["status_id"]
+    reopened = (
+        select(TicketEvent.ticket_id)
+        .join(old_status, old_status.status_id == cast(status_change["old"].astext, Integer))
+        .join(new_status, new_status.status_id == cast(status_change["new"].astext, Integer))
+        .where(
+            TicketEvent.ticket_id.in_(select(handled.c.ticket_id)),
+            TicketEvent.changes.has_key("status_id"),
+            old_status.is_final.is_(True),
+            new_status.is_final.is_(False),
+        )
+        .distinct()
+        .cte("reopened")
+    )
+    per_technician = (
+        select(
+            handled.c.technician_id,
+            func.count().label("handled"),
+            func.count(reopened.c.ticket_id).label("reopened"),
+            func.percentile_cont(0.5).within_group(handled.c.seconds).label("median_seconds"),
+            func.percentile_cont(0.9).within_group(handled.c.seconds).label("p90_seconds"),
+            cast(func.avg(handled.c.seconds), Float).label("mean_seconds"),
+        )
+        .select_from(handled)
+        .outerjoin(reopened, reopened.c.ticket_id == handled.c.ticket_id)
+        .group_by(handled.c.technician_id)
+        .cte("per_technician")
+    )
+    full_name = func.nullif(func.trim(func.concat_ws(" ", User.first_name, User.last_name)), "")
+    result = await db.execute(
+        select(
+            per_technician.c.technician_id,
+            func.coalesce(full_name, User.username).label("technician_name"),
+            per_technician.c.handled,
+            per_technician.c.reopened,
+            (cast(per_technician.c.reopened, Float) / per_technician.c.handled).label("reopen_rate"),
+            per_technician.c.median_seconds,
+            per_technician.c.p90_seconds,
+            per_technician.c.mean_seconds,
+            func.rank().over(order_by=per_technician.c.handled.desc()).label("rank_by_handled"),
+            func.rank().over(order_by=per_technician.c.median_seconds).label("rank_by_median"),
+            (
+                cast(per_technician.c.handled, Float) / func.sum(per_technician.c.handled).over()
+            ).label("share_of_handled"),
+        )
+        .join(User, User.user_id == per_technician.c.technician_id)
+        .order_by(per_technician.c.handled.desc(), per_technician.c.technician_id)
+    )
+    report = {
+        "generated_at": datetime.now(timezone.utc),
+        "items": [dict(row._mapping) for row in result.all()],
+    }
+    if report_cache is not None:
+        report_cache.set(cache_key, report)
+    return report
+
+
+def _rank(values: np.ndarray) -> np.ndarray:
+    """Места по возрастанию значений с общими местами при равенстве, как rank() в SQL; NaN — без места."""
+    valid = ~np.isnan(values)
+    ranks = np.searchsorted(np.sort(values[valid]), values, side="left") + 1.0
+    ranks[~valid] = np.nan
+    return ranks
+
+
+def _mean(total: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """Поэлементное total / count; NaN, где count = 0."""
+    return np.divide(total, count, out=np.full(len(total), np.nan), where=count > 0)
+
+
+def _optional(value) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _reliability(tickets, resolved, resolution_seconds, created, groups, group_count):
+    """
+    Показатели надежности по группам (устройствам или типам): суммы по
+    группам считаются np.bincount без цикла по заявкам.
+
+    Args:
+        tickets, resolved, resolution_seconds: Массивы по устройствам.
+        created: Время создания заявок (эпоха, с), по устройствам подряд,
+                 внутри устройства по возрастанию.
+        groups: Номер группы каждого устройства.
+        group_count: Число групп.
+    """
+    # Интервалы между соседними заявками одного устройства: разности
+    # соседних моментов без пар на границе двух устройств
+    ticket_device = np.repeat(np.arange(len(tickets)), tickets)
+    same_device = ticket_device[1:] == ticket_device[:-1]
+    intervals = np.diff(created)[same_device]
+    interval_groups = groups[ticket_device[1:][same_device]]
+
+    def by_group(values, index=groups):
+        return np.bincount(index, weights=values, minlength=group_count)
+
+    group_tickets = by_group(tickets)
+    mean_between = _mean(by_group(intervals, interval_groups), by_group(np.maximum(tickets - 1, 0)))
+    mean_resolution = _mean(by_group(resolution_seconds), by_group(resolved))
+    return {
+        "tickets": group_tickets,
+        "resolved": by_group(resolved),
+        "mean_seconds_between": mean_between,
+        "mean_resolution_seconds": mean_resolution,
+        # 1 — наименее надежные: больше заявок, чаще заявки, дольше решение
+        "rank_by_tickets": _rank(-group_tickets),
+        "rank_by_interval": _rank(mean_between),
+        "rank_by_resolution": _rank(-mean_resolution),
+    }
+
+
+def _report_rows(columns: Dict[str, np.ndarray], labels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Строки отчета: подписи группы и показатели, упорядоченные по rank_by_tickets."""
+    order = np.lexsort((np.arange(len(labels)), columns["rank_by_tickets"]))
+    rows = []
+    for position in order:
+        row = dict(labels[position])
+        row["tickets"] = int(columns["tickets"][position])
+        row["resolved"] = int(columns["resolved"][position])
+        for name in ("mean_seconds_between", "mean_resolution_seconds"):
+            row[name] = _optional(columns[name][position])
+        for name in ("rank_by_tickets", "rank_by_interval", "rank_by_resolution"):
+            rank = columns[name][position]
+            row[name] = None if np.isnan(rank) else int(rank)
+        rows.append(row)
+    return rows
+
+
+async def get_device_report(db: AsyncSession, *, date_from: date, date_to: date) -> Dict[str, Any]:
+    """
+    Надежность устройств и типов устройств по заявкам, созданным за период:
+    число заявок, среднее время между заявками устройства, среднее время
+    решения (от создания до закрытия) и места в рейтинге (1 — наименее
+    надежные).
+
+    Один SQL-запрос группирует заявки по устройствам и возвращает моменты
+    их создания массивом (array_agg по возрастанию); интервалы между
+    заявками и итоги по типам считаются над этими массивами в NumPy.
+
+    Returns:
+        {"generated_at": время расчета, "devices": строки по устройствам,
+        "device_types": строки по типам}; строки упорядочены по числу заявок.
+    """
+    cache_key = (DEVICE_REPORT, date_from, date_to)
+    if report_cache is not None:
+        cached = report_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    start, end = period_bounds(date_from, date_to)
+    created = cast(func.extract("epoch", Ticket.created_at), Float)
+    per_device = (
+        select(
+            Ticket.device_id,
+            func.count().label("tickets"),
+            func.count(Ticket.closed_at).label("resolved"),
+            cast(
+                func.coalesce(func.sum(func.extract("epoch", Ticket.closed_at - Ticket.created_at)), 0), Float
+            ).label("resolution_seconds"),
+            func.array_agg(aggregate_order_by(created, Ticket.created_at)).label("created"),
+        )
+        .where(Ticket.created_at >= start, Ticket.created_at < end)
+        .group_by(Ticket.device_id)
+        .subquery("per_device")
+    )
+    result = await db.execute(
+        select(
+            per_device,
+            Device.name.label("device_name"),
+            Device.inventory_number,
+            Device.device_type_id,
+            DeviceType.name.label("device_type_name"),
+        )
+        .join(Device, Device.device_id == per_device.c.device_id)
+        .outerjoin(DeviceType, DeviceType.device_type_id == Device.device_type_id)
+        .order_by(per_device.c.device_id)
+    )
+    rows = result.all()
+
+    tickets = np.array([row.tickets for row in rows], dtype=np.int64)
+    resolved = np.array([row.resolved for row in rows], dtype=np.int64)
+    resolution_seconds = np.array([row.resolution_seconds for row in rows], dtype=np.float64)
+    created_at = (
+        np.concatenate([np.asarray(row.created, dtype=np.float64) for row in rows])
+        if rows else np.empty(0, dtype=np.float64)
+    )
+    # Номера типов в порядке первого появления (устройства без типа — отдельная группа)
+    type_positions: Dict[Optional[int], int] = {}
+    device_types = np.array(
+        [type_positions.setdefault(row.device_type_id, len(type_positions)) for row in rows], dtype=np.int64
+    )
+    type_names = {row.device_type_id: row.device_type_name for row in rows}
+
+    device_columns = _reliability(
+        tickets, resolved, resolution_seconds, created_at, np.arange(len(rows)), len(rows)
+    )
+    type_columns = _reliability(
+        tickets, resolved, resolution_seconds, created_at, device_types, len(type_positions)
+    )
+    devices_per_type = np.bincount(device_types, minlength=len(type_positions))
+    type_labels = [
+        {
+            "device_type_id": type_id,
+            "device_type_name": type_names[type_id],
+            "devices": int(devices_per_type[position]),
+            "tickets_per_device": float(type_columns["tickets"][position] / devices_per_type[position]),
+        }
+        for type_id, position in type_positions.items()
+    ]
+    device_labels = [
+        {
+            "device_id": row.device_id,
+            "device_name": row.device_name,
+            "inventory_number": row.inventory_number,
+            "device_type_id": row.device_type_id,
+            "device_type_name": row.device_type_name,
+        }
+        for row in rows
+    ]
+    report = {
+        "generated_at": datetime.now(timezone.utc),
+        "devices": _report_rows(device_columns, device_labels),
+        "device_types": _report_rows(type_columns, type_labels),
+    }
+    if report_cache is not None:
+        report_cache.set(cache_key, report)
+    return report
@@ -5,6 +5,7 @@ from sqlalchemy.orm import selectinload
 from typing import List, Optional
 
 from app import models, schemas # Импортируем модели и схемы
+from app.core.workflow import invalidate_workflow
 
 async def get_status(db: AsyncSession, status_id: int) -> Optional[models.Status]:
     """Получает статус по его ID."""
@@ -20,8 +21,8 @@ async def get_status_by_name(db: AsyncSession, name: str) -> Optional[models.Sta
     )
     return result.scalars().first()
 
-async def get_statuses(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Status]:
-    """Получает список статусов с пагинацией."""
+async def get_statuses(db: AsyncSession, skip: int = 0, limit: Optional[int] = 100) -> List[models.Status]:
+    """Получает список статусов с пагинацией (limit=None — все статусы)."""
     result = await db.execute(
         select(models.Status)
         .offset(skip)
@@ -36,6 +37,7 @@ async def create_status(db: AsyncSession, *, obj_in: schemas.status.StatusCreate
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
+    invalidate_workflow()
     return db_obj
 
 async def update_status(
@@ -49,6 +51,7 @@ async def update_status(
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        invalidate_workflow()
     return db_obj
 
 async def remove_status(db: AsyncSession, *, status_id: int) -> Optional[models.Status]:
@@ -58,4 +61,5 @@ async def remove_status(db: AsyncSession, *, status_id: int) -> Optional[models.
         # TODO: Добавить проверку, не используются ли заявки с этим статусом?
         await db.delete(db_obj)
         await db.commit()
+        invalidate_workflow() # Переходы статуса удаляются каскадно
     return db_obj # Возвращаем удаленный объект или None, если не найден
\ No newline at end of file
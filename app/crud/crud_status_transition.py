@@ -0,0 +1,78 @@
+# Файл: app/crud/crud_status_transition.py
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import List, Optional, Tuple
+
+from app import models, schemas # Импортируем модели и схемы
+from app.core.workflow import invalidate_workflow
+
+async def get_transition(db: AsyncSession, transition_id: int) -> Optional[models.StatusTransition]:
+    """Получает переход по его ID."""
+    result = await db.execute(
+        select(models.StatusTransition).filter(models.StatusTransition.transition_id == transition_id)
+    )
+    return result.scalars().first()
+
+async def get_transition_by_edge(
+    db: AsyncSession, *, from_status_id: int, to_status_id: int, role_id: Optional[int]
+) -> Optional[models.StatusTransition]:
+    """Получает переход по исходному и целевому статусу и роли."""
+    role_condition = (
+        models.StatusTransition.role_id.is_(None) if role_id is None
+        else models.StatusTransition.role_id == role_id
+    )
+    result = await db.execute(
+        select(models.StatusTransition).filter(
+            models.StatusTransition.from_status_id == from_status_id,
+            models.StatusTransition.to_status_id == to_status_id,
+            role_condition,
+        )
+    )
+    return result.scalars().first()
+
+async def get_transitions(
+    db: AsyncSession, *, from_status_id: Optional[int] = None
+) -> List[models.StatusTransition]:
+    """Получает список переходов (при необходимости — только из одного статуса)."""
+    query = select(models.StatusTransition)
+    if from_status_id is not None:
+        query = query.filter(models.StatusTransition.from_status_id == from_status_id)
+    result = await db.execute(
+        query.order_by(models.StatusTransition.from_status_id, models.StatusTransition.to_status_id)
+    )
+    return result.scalars().all()
+
+async def get_transition_edges(db: AsyncSession) -> List[Tuple[int, int, Optional[str]]]:
+    """
+    Все переходы как (from_status_id, to_status_id, имя роли или None) —
+    исходные данные для графа в app.core.workflow.
+    """
+    result = await db.execute(
+        select(
+            models.StatusTransition.from_status_id,
+            models.StatusTransition.to_status_id,
+            models.UserRole.name,
+        )
+        .outerjoin(models.UserRole, models.UserRole.id == models.StatusTransition.role_id)
+    )
+    return [tuple(row) for row in result.all()]
+
+async def create_transition(
+    db: AsyncSession, *, obj_in: schemas.status.StatusTransitionCreate
+) -> models.StatusTransition:
+    """Добавляет разрешенный переход."""
+    db_obj = models.StatusTransition(**obj_in.model_dump())
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    invalidate_workflow()
+    return db_obj
+
+async def remove_transition(db: AsyncSession, *, transition_id: int) -> Optional[models.StatusTransition]:
+    """Удаляет переход по ID."""
+    db_obj = await get_transition(db, transition_id=transition_id)
+    if db_obj:
+        await db.delete(db_obj)
+        await db.commit()
+        invalidate_workflow()
+    return db_obj # Возвращаем удаленный объект или None, если не найден
@@ -1,19 +1,63 @@
 # Файл: app/crud/crud_technician_assignment.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete, and_
-from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, and_, func, literal, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 
 from app import models, schemas
 
+async def _add_assignees_count(db: AsyncSession, *, ticket_ids: Sequence[int], delta: int) -> None:
+    """
+    Меняет tickets.assignees_count на delta для заявок ticket_ids одним UPDATE
+    (в транзакции вызывающей функции; коммит — за ней).
+    """
+    from app.crud.crud_ticket import ids_condition
+
+    if not ticket_ids:
+        return
+    await db.execute(
+        update(models.Ticket)
+        .where(ids_condition(models.Ticket.ticket_id, ticket_ids))
+        .values(assignees_count=func.greatest(models.Ticket.assignees_count + delta, 0))
+        .execution_options(synchronize_session=False)
+    )
+
+async def get_ticket_assignments(
+    db: AsyncSession,
+    *,
+    ticket_id: int
+) -> List[models.TechnicianAssignment]:
+    """
+    Получает назначения заявки вместе с техниками (для ответа API).
+    
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_id: ID заявки.
+        
+    Returns:
+        Список назначений в порядке назначения.
+    """
+    result = await db.execute(
+        select(models.TechnicianAssignment)
+        .where(models.TechnicianAssignment.ticket_id == ticket_id)
+        .options(selectinload(models.TechnicianAssignment.technician))
+        .order_by(models.TechnicianAssignment.assigned_at)
+    )
+    return list(result.scalars().all())
+
 async def assign_technician(
     db: AsyncSession, 
     *, 
     ticket_id: int, 
     technician_id: int
-) -> Optional[models.TechnicianAssignment]:
+) -> Tuple[Optional[models.TechnicianAssignment], List[models.TechnicianAssignment]]:
     """
-    Назначает техника на заявку.
+    Назначает техника на заявку одним INSERT ... ON CONFLICT DO NOTHING RETURNING:
+    без предварительной проверки и без IntegrityError при гонке повторных назначений.
+    Обновленный список назначений читается, а tickets.assignees_count
+    увеличивается в той же транзакции.
     
     Args:
         db: Асинхронная сессия базы данных.
@@ -21,42 +65,34 @@ async def assign_technician(
         technician_id: ID техника (пользователя с ролью tech).
         
     Returns:
-        Созданное назначение или None, если уже существует.
+        (созданное назначение или None, если уже существует;
+         назначения заявки после изменения — пустой список, если назначение не создано).
     """
-    # Проверяем, существует ли уже такое назначение
     result = await db.execute(
-        select(models.TechnicianAssignment)
-        .where(
-            and_(
-                models.TechnicianAssignment.ticket_id == ticket_id,
-                models.TechnicianAssignment.technician_id == technician_id
-            )
-        )
-    )
-    existing_assignment = result.scalars().first()
-    
-    # Если назначение уже существует, возвращаем None
-    if existing_assignment:
-        return None
-    
-    # Создаем новое назначение
-    db_obj = models.TechnicianAssignment(
-        ticket_id=ticket_id,
-        technician_id=technician_id
+        pg_insert(models.TechnicianAssignment)
+        .values(ticket_id=ticket_id, technician_id=technician_id)
+        .on_conflict_do_nothing(constraint="uq_ticket_technician")
+        .returning(models.TechnicianAssignment)
     )
-    db.add(db_obj)
+    db_obj = result.scalars().first()
+    if db_obj is None:
+        await db.commit()
+        return None, []
+    await _add_assignees_count(db, ticket_ids=[ticket_id], delta=1)
+    assignments = await get_ticket_assignments(db, ticket_id=ticket_id)
     await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    return db_obj, assignments
 
 async def remove_technician(
     db: AsyncSession, 
     *, 
     ticket_id: int, 
     technician_id: int
-) -> bool:
+) -> Tuple[bool, List[models.TechnicianAssignment]]:
     """
-    Снимает техника с заявки.
+    Снимает техника с заявки одним DELETE ... RETURNING.
+    Обновленный список назначений читается, а tickets.assignees_count
+    уменьшается в той же транзакции.
     
     Args:
         db: Асинхронная сессия базы данных.
@@ -64,9 +100,9 @@ async def remove_technician(
         technician_id: ID техника (пользователя с ролью tech).
         
     Returns:
-        True, если назначение было удалено, иначе False.
+        (True, если назначение было удалено, иначе False;
+         назначения заявки после изменения — пустой список, если ничего не удалено).
     """
-    # Находим и удаляем назначение
     result = await db.execute(
         delete(models.TechnicianAssignment)
         .where(
@@ -77,13 +113,77 @@ async def remove_technician(
         )
         .returning(models.TechnicianAssignment.assignment_id)
     )
-    deleted_row = result.scalar_one_or_none()
-    
-    # Если была удалена хотя бы одна строка
-    if deleted_row:
+    if result.scalar_one_or_none() is None:
         await db.commit()
-        return True
-    return False
+        return False, []
+    await _add_assignees_count(db, ticket_ids=[ticket_id], delta=-1)
+    assignments = await get_ticket_assignments(db, ticket_id=ticket_id)
+    await db.commit()
+    return True, assignments
+
+async def assign_technician_bulk(
+    db: AsyncSession,
+    *,
+    ticket_ids: Sequence[int],
+    technician_id: int
+) -> List[int]:
+    """
+    Назначает техника на набор заявок одним INSERT ... SELECT.
+    Существующие назначения пропускаются (ON CONFLICT DO NOTHING);
+    assignees_count увеличивается только у заявок, где назначение создано.
+    
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_ids: ID заявок.
+        technician_id: ID техника.
+        
+    Returns:
+        ID заявок, на которые техник назначен этим запросом.
+    """
+    from app.crud.crud_ticket import ids_condition
+
+    source = (
+        select(models.Ticket.ticket_id, literal(technician_id))
+        .where(ids_condition(models.Ticket.ticket_id, ticket_ids))
+    )
+    result = await db.execute(
+        pg_insert(models.TechnicianAssignment)
+        .from_select(["ticket_id", "technician_id"], source)
+        .on_conflict_do_nothing(constraint="uq_ticket_technician")
+        .returning(models.TechnicianAssignment.ticket_id)
+    )
+    assigned = list(result.scalars().all())
+    await _add_assignees_count(db, ticket_ids=assigned, delta=1)
+    await db.commit()
+    return assigned
+
+async def remove_technician_bulk(
+    db: AsyncSession,
+    *,
+    ticket_ids: Sequence[int],
+    technician_id: int
+) -> List[int]:
+    """
+    Снимает техника с набора заявок одним DELETE и уменьшает
+    assignees_count заявок, с которых он действительно снят.
+    
+    Returns:
+        ID заявок, с которых техник был снят.
+    """
+    from app.crud.crud_ticket import ids_condition
+
+    result = await db.execute(
+        delete(models.TechnicianAssignment)
+        .where(
+            models.TechnicianAssignment.technician_id == technician_id,
+            ids_condition(models.TechnicianAssignment.ticket_id, ticket_ids),
+        )
+        .returning(models.TechnicianAssignment.ticket_id)
+    )
+    removed = list(result.scalars().all())
+    await _add_assignees_count(db, ticket_ids=removed, delta=-1)
+    await db.commit()
+    return removed
 
 async def get_ticket_technicians(
     db: AsyncSession, 
@@ -111,24 +211,33 @@ async def get_ticket_technicians(
 async def get_technician_tickets(
     db: AsyncSession, 
     *, 
-    technician_id: int
-) -> List[int]:
+    technician_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    with_related: bool = True
+) -> List[models.Ticket]:
     """
-    Получает список ID заявок, назначенных на техника.
+    Получает заявки, назначенные на техника, одним запросом.
     
     Args:
         db: Асинхронная сессия базы данных.
         technician_id: ID техника.
+        skip: Сколько записей пропустить.
+        limit: Максимальное количество записей.
+        with_related: Загружать ли связанные объекты заявок.
         
     Returns:
-        Список ID заявок.
+        Список заявок (новые первыми).
     """
-    result = await db.execute(
-        select(models.TechnicianAssignment.ticket_id)
-        .where(models.TechnicianAssignment.technician_id == technician_id)
-        .order_by(models.TechnicianAssignment.assigned_at.desc())
+    from app.crud import crud_ticket
+
+    return await crud_ticket.get_tickets(
+        db,
+        skip=skip,
+        limit=limit,
+        assignee_id=technician_id,
+        with_related=with_related,
     )
-    return list(result.scalars().all())
 
 async def is_technician_assigned(
     db: AsyncSession, 
@@ -1,19 +1,26 @@
 # Файл: app/crud/crud_ticket.py
-from typing import Any, Dict, Optional, List, Union
-from sqlalchemy import select, or_, and_
+from typing import Any, Collection, Dict, Optional, List, Sequence, Union
+from sqlalchemy import select, or_, and_, exists, func, update, literal, any_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, load_only, noload
 from app.models.ticket import Ticket
+from app.models.status import Status
 from app.models.technician_assignment import TechnicianAssignment
 from app.schemas.ticket import TicketCreate, TicketUpdate
+from app.core.workflow import get_workflow
+from app.crud import crud_report, crud_ticket_stats
 from datetime import datetime
+from operator import itemgetter
 
 async def create_ticket(
     db: AsyncSession, 
     *, 
     obj_in: TicketCreate, 
     user_id: int, 
-    initial_status_id: int = 1  # По умолчанию "Новая"
+    initial_status_id: Optional[int] = None,
+    commit: bool = True
 ) -> Ticket:
     """
     Создает новую заявку.
@@ -22,11 +29,22 @@ async def create_ticket(
         db: Асинхронная сессия базы данных.
         obj_in: Данные для создания заявки.
         user_id: ID пользователя, создающего заявку.
-        initial_status_id: Начальный статус заявки (по умолчанию 1 - "Новая").
+        initial_status_id: Начальный статус заявки (по умолчанию — начальный
+                           статус рабочего процесса, из кэша app.core.workflow).
+        commit: Фиксировать ли транзакцию (False — фиксирует вызывающий,
+                например вместе с ответом Idempotency-Key, и после коммита
+                сбрасывает кэш отчетов по устройствам).
         
     Returns:
         Созданная заявка.
+        
+    Raises:
+        ValueError: Начальный статус не задан и в справочнике нет статусов.
     """
+    if initial_status_id is None:
+        initial_status_id = (await get_workflow(db)).initial_status_id
+        if initial_status_id is None:
+            raise ValueError("Не настроен начальный статус заявки")
     create_data = obj_in.model_dump()
     db_obj = Ticket(
         **create_data,
@@ -35,15 +53,79 @@ async def create_ticket(
     )
     
     db.add(db_obj)
-    await db.commit()
+    await db.flush()
+    # Дневная сводка обновляется в той же транзакции
+    await crud_ticket_stats.record_tickets(db, Ticket.ticket_id == db_obj.ticket_id)
+    if commit:
+        await db.commit()
+        crud_report.invalidate([crud_report.DEVICE_REPORT], crud_report.today())
     await db.refresh(db_obj)
     return db_obj
 
+# Колонки заявки, которые можно запросить через fields= (ticket_id выбирается всегда)
+TICKET_FIELDS = (
+    "device_id", "user_id", "description", "priority_id", "status_id",
+    "resolution_notes", "created_at", "updated_at", "closed_at",
+    "comment_count", "last_activity_at", "files_count", "total_files_size", "assignees_count",
+)
+# Связи заявки, которые можно запросить через include=
+TICKET_RELATIONS = ("user", "device", "priority", "status", "files", "assignments")
+# Внешние ключи, без которых не загрузить связь "многие к одному"
+_RELATION_KEYS = {"user": "user_id", "device": "device_id", "priority": "priority_id", "status": "status_id"}
+
+def _related_options() -> list:
+    """Опции загрузки всех связей заявки (полный ответ)."""
+    return [
+        selectinload(Ticket.user),
+        selectinload(Ticket.device),
+        selectinload(Ticket.priority),
+        selectinload(Ticket.status),
+        selectinload(Ticket.files),
+        selectinload(Ticket.assignments).selectinload(TechnicianAssignment.technician)
+    ]
+
+def _list_options() -> list:
+    """
+    Опции загрузки для списка заявок: только связи "многие к одному".
+    Файлы и назначения не загружаются — их количество есть в самой заявке
+    (files_count, total_files_size, assignees_count).
+    """
+    return [
+        selectinload(Ticket.user),
+        selectinload(Ticket.device),
+        selectinload(Ticket.priority),
+        selectinload(Ticket.status),
+        noload(Ticket.files),
+        noload(Ticket.assignments),
+    ]
+
+def _sparse_options(fields: Optional[Collection[str]], include: Collection[str]) -> list:
+    """
+    Опции загрузки для частичного ответа: выбираются только запрошенные колонки,
+    запрошенные связи загружаются пакетно, остальные не загружаются вовсе
+    (в том числе связи с lazy="selectin" в модели).
+    """
+    options = []
+    if fields is not None:
+        columns = {"ticket_id", *fields, *(_RELATION_KEYS[name] for name in include if name in _RELATION_KEYS)}
+        options.append(load_only(*(getattr(Ticket, name) for name in sorted(columns))))
+    for name in TICKET_RELATIONS:
+        attribute = getattr(Ticket, name)
+        if name not in include:
+            options.append(noload(attribute))
+        elif name == "assignments":
+            options.append(selectinload(attribute).selectinload(TechnicianAssignment.technician))
+        else:
+            options.append(selectinload(attribute))
+    return options
+
 async def get_ticket(
     db: AsyncSession, 
     *, 
     ticket_id: int, 
-    with_related: bool = False
+    with_related: bool = False,
+    fields: Optional[Collection[str]] = None,
+    include: Optional[Collection[str]] = None
 ) -> Optional[Ticket]:
     """
     Получает заявку по ID.
@@ -52,40 +134,140 @@ async def get_ticket(
         db: Асинхронная сессия базы данных.
         ticket_id: ID заявки для получения.
         with_related: Загружать ли связанные объекты.
+        fields: Загрузить только эти колонки (из TICKET_FIELDS).
+        include: Загрузить только эти связи (из TICKET_RELATIONS); если задан,
+                 with_related игнорируется.
         
     Returns:
         Заявка или None, если не найдена.
     """
-    if with_related:
-        query = select(Ticket).where(Ticket.ticket_id == ticket_id).options(
-            selectinload(Ticket.user),
-            selectinload(Ticket.device),
-            selectinload(Ticket.priority),
-            selectinload(Ticket.status),
-            selectinload(Ticket.files),
-            selectinload(Ticket.assignments).selectinload(TechnicianAssignment.technician)
-        )
-    else:
-        query = select(Ticket).where(Ticket.ticket_id == ticket_id)
+    query = select(Ticket).where(Ticket.ticket_id == ticket_id)
+    if fields is not None or include is not None:
+        query = query.options(*_sparse_options(fields, include or ()))
+    elif with_related:
+        query = query.options(*_related_options())
     
     result = await db.execute(query)
     return result.scalars().first()
 
+async def get_tickets_by_ids(
+    db: AsyncSession,
+    *,
+    ticket_ids: Sequence[int],
+    with_related: bool = True
+) -> List[Ticket]:
+    """
+    Получает заявки по списку ID одним запросом (IN).
+    
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_ids: ID заявок.
+        with_related: Загружать ли связанные объекты (пакетно, selectin).
+        
+    Returns:
+        Найденные заявки (порядок не гарантируется, отсутствующие ID пропускаются).
+    """
+    if not ticket_ids:
+        return []
+    query = select(Ticket).where(Ticket.ticket_id.in_(ticket_ids))
+    if with_related:
+        query = query.options(*_related_options())
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+IdFilter = Union[int, Sequence[int], None]
+
+def _id_filter(column, value: IdFilter):
+    """Условие для фильтра по ID: равенство для одного значения, IN — для списка."""
+    if isinstance(value, int):
+        return column == value
+    values = list(value)
+    return column == values[0] if len(values) == 1 else column.in_(values)
+
+def _ticket_filters(
+    *,
+    user_id: IdFilter = None,
+    status_id: IdFilter = None,
+    priority_id: IdFilter = None,
+    device_id: IdFilter = None,
+    search: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+    closed_from: Optional[datetime] = None,
+    closed_to: Optional[datetime] = None,
+    is_closed: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+    unassigned: bool = False
+) -> list:
+    """Условия WHERE списка заявок (общие для get_tickets и get_tickets_version)."""
+    filters = []
+    
+    if user_id is not None:
+        filters.append(_id_filter(Ticket.user_id, user_id))
+    if status_id is not None:
+        filters.append(_id_filter(Ticket.status_id, status_id))
+    if priority_id is not None:
+        filters.append(_id_filter(Ticket.priority_id, priority_id))
+    if device_id is not None:
+        filters.append(_id_filter(Ticket.device_id, device_id))
+    if is_closed is not None:
+        # Подзапрос к маленькому справочнику статусов — тот же план, что и IN-список
+        filters.append(Ticket.status_id.in_(
+            select(Status.status_id).where(Status.is_final.is_(is_closed))
+        ))
+    if start_date is not None:
+        filters.append(Ticket.created_at >= start_date)
+    if end_date is not None:
+        filters.append(Ticket.created_at <= end_date)
+    if updated_from is not None:
+        filters.append(Ticket.updated_at >= updated_from)
+    if updated_to is not None:
+        filters.append(Ticket.updated_at <= updated_to)
+    if closed_from is not None:
+        filters.append(Ticket.closed_at >= closed_from)
+    if closed_to is not None:
+        filters.append(Ticket.closed_at <= closed_to)
+    # Фильтр по технику — EXISTS, без JOIN (не размножает строки);
+    # обслуживается индексом (technician_id, ticket_id)
+    if assignee_id is not None:
+        filters.append(exists().where(
+            TechnicianAssignment.technician_id == assignee_id,
+            TechnicianAssignment.ticket_id == Ticket.ticket_id,
+        ))
+    # Нераспределенные — по денормализованному счетчику, без обращения к назначениям
+    if unassigned:
+        filters.append(Ticket.assignees_count == 0)
+        
+    if search:
+        filters.append(Ticket.description.ilike(f"%{search}%"))
+    return filters
+
 async def get_tickets(
     db: AsyncSession,
     *,
     skip: int = 0,
     limit: int = 100,
-    user_id: Optional[int] = None,
-    status_id: Optional[int] = None,
-    priority_id: Optional[int] = None,
-    device_id: Optional[int] = None,
+    user_id: IdFilter = None,
+    status_id: IdFilter = None,
+    priority_id: IdFilter = None,
+    device_id: IdFilter = None,
     search: Optional[str] = None,
     sort_by: str = "created_at",
     sort_desc: bool = True,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    with_related: bool = False
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+    closed_from: Optional[datetime] = None,
+    closed_to: Optional[datetime] = None,
+    is_closed: Optional[bool] = None,
+    assignee_id: Optional[int] = None,
+    unassigned: bool = False,
+    with_related: bool = False,
+    fields: Optional[Collection[str]] = None,
+    include: Optional[Collection[str]] = None
 ) -> List[Ticket]:
     """
     Получает список заявок с фильтрацией, сортировкой и пагинацией.
@@ -94,51 +276,48 @@ async def get_tickets(
         db: Асинхронная сессия базы данных.
         skip: Сколько записей пропустить (для пагинации).
         limit: Максимальное количество возвращаемых записей.
-        user_id: Фильтрация по ID пользователя.
-        status_id: Фильтрация по ID статуса.
-        priority_id: Фильтрация по ID приоритета.
-        device_id: Фильтрация по ID устройства.
+        user_id: Фильтрация по ID пользователя (одно значение или список).
+        status_id: Фильтрация по ID статуса (одно значение или список).
+        priority_id: Фильтрация по ID приоритета (одно значение или список).
+        device_id: Фильтрация по ID устройства (одно значение или список).
         search: Поиск в описании заявки.
         sort_by: Поле для сортировки.
         sort_desc: Сортировка по убыванию.
         start_date: Начальная дата (created_at >= start_date).
         end_date: Конечная дата (created_at <= end_date).
-        with_related: Загружать ли связанные объекты (user, device, status, priority).
+        updated_from: updated_at >= updated_from.
+        updated_to: updated_at <= updated_to.
+        closed_from: closed_at >= closed_from.
+        closed_to: closed_at <= closed_to.
+        is_closed: True — только заявки в финальных статусах (Status.is_final),
+                   False — только открытые.
+        assignee_id: Только заявки, на которые назначен этот техник.
+        unassigned: Только заявки без назначенных техников.
+        with_related: Загружать ли связанные объекты (user, device, status, priority);
+                      файлы и назначения в списке не загружаются.
+        fields: Загрузить только эти колонки (из TICKET_FIELDS).
+        include: Загрузить только эти связи (из TICKET_RELATIONS); если задан,
+                 with_related игнорируется.
         
     Returns:
         Список заявок.
     """
     query = select(Ticket)
-    filters = []
-    
-    if user_id is not None:
-        filters.append(Ticket.user_id == user_id)
-    if status_id is not None:
-        filters.append(Ticket.status_id == status_id)
-    if priority_id is not None:
-        filters.append(Ticket.priority_id == priority_id)
-    if device_id is not None:
-        filters.append(Ticket.device_id == device_id)
-    if start_date is not None:
-        filters.append(Ticket.created_at >= start_date)
-    if end_date is not None:
-        filters.append(Ticket.created_at <= end_date)
-        
-    if search:
-        filters.append(Ticket.description.ilike(f"%{search}%"))
+    filters = _ticket_filters(
+        user_id=user_id, status_id=status_id, priority_id=priority_id, device_id=device_id,
+        search=search, start_date=start_date, end_date=end_date,
+        updated_from=updated_from, updated_to=updated_to,
+        closed_from=closed_from, closed_to=closed_to, is_closed=is_closed,
+        assignee_id=assignee_id, unassigned=unassigned,
+    )
     
     if filters:
         query = query.where(and_(*filters))
         
-    if with_related:
-        query = query.options(
-            selectinload(Ticket.user),
-            selectinload(Ticket.device),
-            selectinload(Ticket.status),
-            selectinload(Ticket.priority),
-            selectinload(Ticket.files),
-            selectinload(Ticket.assignments).selectinload(TechnicianAssignment.technician)
-        )
+    if fields is not None or include is not None:
+        query = query.options(*_sparse_options(fields, include or ()))
+    elif with_related:
+        query = query.options(*_list_options())
 
     order_column = getattr(Ticket, sort_by, Ticket.created_at)
     if sort_desc:
@@ -151,6 +330,48 @@ async def get_tickets(
     result = await db.execute(query)
     return list(result.scalars().all())
 
+async def get_ticket_version(db: AsyncSession, *, ticket_id: int) -> Optional[tuple]:
+    """
+    Дешевый "отпечаток" заявки для ETag: updated_at и денормализованные счетчики.
+    Добавление и удаление файлов, назначений и комментариев обновляет счетчики
+    и updated_at заявки в той же транзакции, поэтому дочерние таблицы не читаются.
+    
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_id: ID заявки.
+        
+    Returns:
+        Кортеж значений или None, если заявка не найдена.
+    """
+    result = await db.execute(
+        select(
+            Ticket.updated_at,
+            Ticket.files_count,
+            Ticket.total_files_size,
+            Ticket.assignees_count,
+            Ticket.comment_count,
+        )
+        .where(Ticket.ticket_id == ticket_id)
+    )
+    row = result.first()
+    return tuple(row) if row is not None else None
+
+async def get_tickets_version(db: AsyncSession, **filter_args: Any) -> tuple:
+    """
+    Дешевый агрегат по набору заявок для ETag списка: количество и максимальный
+    updated_at заявок. Принимает те же фильтры, что и get_tickets (без пагинации
+    и сортировки) — один запрос без загрузки и сериализации строк. Изменения
+    файлов и назначений обновляют updated_at заявки (см. crud_file,
+    crud_technician_assignment), поэтому дочерние таблицы не читаются.
+    """
+    result = await db.execute(
+        select(func.count(), func.max(Ticket.updated_at)).where(*_ticket_filters(**filter_args))
+    )
+    return tuple(result.one())
+
+# Поля заявки, от которых зависят строки дневной сводки (кроме дат)
+_STATS_FIELDS = ("status_id", "priority_id", "device_id")
+
 async def update_ticket(
     db: AsyncSession,
     *,
@@ -173,11 +394,22 @@ async def update_ticket(
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
+    # Вклад заявки в дневную сводку переносится, если меняется ее ключ
+    stats_changed = any(
+        field in update_data and update_data[field] != getattr(db_obj, field)
+        for field in _STATS_FIELDS
+    )
+    if stats_changed:
+        await crud_ticket_stats.retract_tickets(db, Ticket.ticket_id == db_obj.ticket_id)
+    
     for field in update_data:
         if field in update_data:
             setattr(db_obj, field, update_data[field])
     
     db.add(db_obj)
+    if stats_changed:
+        await db.flush()
+        await crud_ticket_stats.record_tickets(db, Ticket.ticket_id == db_obj.ticket_id)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -203,20 +435,206 @@ async def update_ticket_status(
     Returns:
         Обновленная заявка.
     """
+    # Закрытие учитывается в дневной сводке с текущим статусом: у закрытой
+    # заявки оно переносится на новый статус в той же транзакции
+    was_closed = db_obj.closed_at is not None
+    if was_closed:
+        await crud_ticket_stats.retract_tickets(db, Ticket.ticket_id == db_obj.ticket_id, closed_only=True)
+
     db_obj.status_id = status_id
     
     if resolution_notes is not None:
         db_obj.resolution_notes = resolution_notes
     
-    if is_closing:
-        from datetime import datetime
-        db_obj.closed_at = datetime.now()
+    # Дата закрытия проставляется при закрытии открытой заявки (как и в
+    # bulk_update_status) и сбрасывается при повторном открытии
+    newly_closed = is_closing and not was_closed
+    reopened = was_closed and not is_closing
+    if newly_closed:
+        db_obj.closed_at = func.now()
+    elif reopened:
+        db_obj.closed_at = None
     
     db.add(db_obj)
+    if was_closed or newly_closed:
+        await db.flush()
+        await crud_ticket_stats.record_tickets(db, Ticket.ticket_id == db_obj.ticket_id, closed_only=True)
     await db.commit()
+    if newly_closed:
+        crud_report.invalidate([crud_report.TECHNICIAN_REPORT], crud_report.today())
+    elif reopened:
+        # День прежнего закрытия не известен — сбрасываются все периоды
+        crud_report.invalidate([crud_report.TECHNICIAN_REPORT])
     await db.refresh(db_obj)
     return db_obj
 
+# === Массовые операции ===
+
+# Колонки массового импорта заявок (порядок значений в записях copy_tickets_bulk)
+IMPORT_COLUMNS = (
+    "user_id", "device_id", "priority_id", "status_id", "description",
+    "resolution_notes", "created_at", "updated_at", "closed_at", "last_activity_at",
+)
+# Колонки записи импорта, нужные дневной сводке (порядок crud_ticket_stats.record_imported)
+_IMPORT_STATS_COLUMNS = ("created_at", "closed_at", "status_id", "priority_id", "device_id")
+
+async def copy_tickets_bulk(db: AsyncSession, *, records: Sequence[tuple]) -> int:
+    """
+    Вставляет пачку заявок через COPY, учитывает их в дневной сводке
+    и фиксирует транзакцию. ticket_id назначается последовательностью таблицы.
+    
+    Args:
+        db: Асинхронная сессия базы данных.
+        records: Кортежи в порядке IMPORT_COLUMNS; ссылки на пользователей,
+                 устройства, приоритеты и статусы должны быть проверены.
+        
+    Returns:
+        Количество вставленных заявок.
+        
+    Raises:
+        ValueError: COPY отклонен (нарушение ограничения, некорректные данные);
+                    транзакция откатывается, пачка не вставляется.
+    """
+    if not records:
+        return 0
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    try:
+        await raw_connection.driver_connection.copy_records_to_table(
+            "tickets", records=records, columns=IMPORT_COLUMNS
+        )
+    except (asyncpg.PostgresError, asyncpg.DataError) as e:
+        await db.rollback()
+        raise ValueError(str(e)) from e
+    # Дневная сводка обновляется в той же транзакции, что и COPY
+    stats_row = itemgetter(*(IMPORT_COLUMNS.index(name) for name in _IMPORT_STATS_COLUMNS))
+    await crud_ticket_stats.record_imported(db, rows=map(stats_row, records))
+    await db.commit()
+    # Импортированные заявки могут попасть в любой период
+    crud_report.invalidate([crud_report.TECHNICIAN_REPORT, crud_report.DEVICE_REPORT])
+    return len(records)
+
+
+def ids_condition(column, ticket_ids: Sequence[int]):
+    """
+    column = ANY(:ids) — весь список передается одним параметром-массивом,
+    поэтому размер набора не упирается в лимит параметров запроса.
+    """
+    return column == any_(literal(list(ticket_ids), ARRAY(Integer)))
+
+async def lock_bulk_targets(
+    db: AsyncSession,
+    *,
+    ticket_ids: Optional[Sequence[int]] = None,
+    filter_args: Optional[Dict[str, Any]] = None
+) -> Dict[int, Any]:
+    """
+    Выбирает и блокирует (FOR UPDATE) заявки для массовой операции.
+    Блокировка держится до commit операции, поэтому набор не меняется
+    между проверкой и изменением.
+    
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_ids: Явный список ID заявок.
+        filter_args: Фильтры get_tickets (если ticket_ids не задан).
+        
+    Returns:
+        Словарь {ticket_id: строка с полями is_closed, status_id и priority_id}.
+    """
+    query = select(
+        Ticket.ticket_id, Ticket.closed_at.is_not(None).label("is_closed"), Ticket.status_id, Ticket.priority_id
+    )
+    if ticket_ids is not None:
+        query = query.where(ids_condition(Ticket.ticket_id, ticket_ids))
+    else:
+        query = query.where(*_ticket_filters(**(filter_args or {})))
+    result = await db.execute(query.order_by(Ticket.ticket_id).with_for_update(of=Ticket))
+    return {row.ticket_id: row for row in result.all()}
+
+async def bulk_update_status(
+    db: AsyncSession,
+    *,
+    ticket_ids: Sequence[int],
+    status_id: int,
+    resolution_notes: Optional[str] = None,
+    is_closing: bool = False
+) -> List[int]:
+    """
+    Меняет статус набора заявок одним UPDATE. Заявки, уже находящиеся
+    в этом статусе, не изменяются. При закрытии closed_at проставляется
+    только тем заявкам, у которых он еще не задан, при переводе в
+    нефинальный статус — сбрасывается; закрытия учитываются в дневной
+    сводке (с новым статусом) в той же транзакции.
+    
+    Returns:
+        ID измененных заявок.
+    """
+    values: Dict[str, Any] = {"status_id": status_id}
+    if resolution_notes is not None:
+        values["resolution_notes"] = resolution_notes
+    if is_closing:
+        values["closed_at"] = func.coalesce(Ticket.closed_at, func.now())
+    else:
+        values["closed_at"] = None
+    changed = (ids_condition(Ticket.ticket_id, ticket_ids), Ticket.status_id != status_id)
+    # Закрытия уже закрытых заявок переносятся в сводке на новый статус
+    # (или вычитаются при повторном открытии)
+    await crud_ticket_stats.retract_tickets(db, *changed, closed_only=True)
+    reopened = False
+    if not is_closing:
+        # Заявки заблокированы retract_tickets и до UPDATE не меняются
+        reopened = (await db.execute(
+            select(Ticket.ticket_id).where(*changed, Ticket.closed_at.is_not(None)).limit(1)
+        )).first() is not None
+    result = await db.execute(
+        update(Ticket)
+        .where(*changed)
+        .values(**values)
+        # closed_at = now() (время начала транзакции) только у заявок, закрытых этим запросом
+        .returning(Ticket.ticket_id, (Ticket.closed_at == func.now()).label("newly_closed"))
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    updated = [row.ticket_id for row in rows]
+    if updated:
+        await crud_ticket_stats.record_tickets(db, ids_condition(Ticket.ticket_id, updated), closed_only=True)
+    closed = [row.ticket_id for row in rows if row.newly_closed]
+    await db.commit()
+    if closed:
+        crud_report.invalidate([crud_report.TECHNICIAN_REPORT], crud_report.today())
+    elif reopened:
+        crud_report.invalidate([crud_report.TECHNICIAN_REPORT])
+    return updated
+
+async def bulk_update_priority(
+    db: AsyncSession,
+    *,
+    ticket_ids: Sequence[int],
+    priority_id: int
+) -> List[int]:
+    """
+    Меняет приоритет набора заявок одним UPDATE (заявки с тем же
+    приоритетом не изменяются). Их строки в дневной сводке переносятся
+    на новый приоритет в той же транзакции.
+    
+    Returns:
+        ID измененных заявок.
+    """
+    changed = (ids_condition(Ticket.ticket_id, ticket_ids), Ticket.priority_id != priority_id)
+    await crud_ticket_stats.retract_tickets(db, *changed)
+    result = await db.execute(
+        update(Ticket)
+        .where(*changed)
+        .values(priority_id=priority_id)
+        .returning(Ticket.ticket_id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = list(result.scalars().all())
+    if updated:
+        await crud_ticket_stats.record_tickets(db, ids_condition(Ticket.ticket_id, updated))
+    await db.commit()
+    return updated
+
 async def get_ticket_count(
     db: AsyncSession,
     *,
@@ -251,14 +669,16 @@ async def get_ticket_count(
     return result.scalar() or 0
 
 async def delete_ticket(db: AsyncSession, ticket_id: int) -> Optional[Ticket]:
-    """Удаляет заявку из базы данных по ID."""
+    """Удаляет заявку из базы данных по ID и вычитает ее из дневной сводки."""
     result = await db.execute(
         select(Ticket).where(Ticket.ticket_id == ticket_id)
     )
     db_ticket = result.scalars().first()
     if db_ticket:
+        await crud_ticket_stats.retract_tickets(db, Ticket.ticket_id == ticket_id)
         await db.delete(db_ticket)
         await db.commit()
+        crud_report.invalidate([crud_report.TECHNICIAN_REPORT, crud_report.DEVICE_REPORT])
     return db_ticket
 
 # === Функции для работы с файлами ===
@@ -0,0 +1,123 @@
+# Файл: app/crud/crud_ticket_comment.py
+from typing import List, Optional
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.models.ticket import Ticket
+from app.models.ticket_comment import TicketComment
+from app.schemas.ticket import TicketCommentCreate, TicketCommentUpdate
+
+
+async def get_comment(db: AsyncSession, *, ticket_id: int, comment_id: int) -> Optional[TicketComment]:
+    """Получает комментарий заявки по ID (с автором)."""
+    result = await db.execute(
+        select(TicketComment)
+        .options(selectinload(TicketComment.author))
+        .where(TicketComment.comment_id == comment_id, TicketComment.ticket_id == ticket_id)
+    )
+    return result.scalars().first()
+
+
+async def get_comments(
+    db: AsyncSession,
+    *,
+    ticket_id: int,
+    limit: int,
+    after_id: Optional[int] = None
+) -> List[TicketComment]:
+    """
+    Комментарии заявки от старых к новым, постранично по ключу comment_id
+    (без OFFSET).
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_id: ID заявки.
+        limit: Размер страницы.
+        after_id: ID последнего комментария предыдущей страницы.
+    """
+    query = (
+        select(TicketComment)
+        .options(selectinload(TicketComment.author))
+        .where(TicketComment.ticket_id == ticket_id)
+    )
+    if after_id is not None:
+        query = query.where(TicketComment.comment_id > after_id)
+    result = await db.execute(query.order_by(TicketComment.comment_id).limit(limit))
+    return list(result.scalars().all())
+
+
+async def create_comment(
+    db: AsyncSession,
+    *,
+    ticket_id: int,
+    author_id: int,
+    obj_in: TicketCommentCreate
+) -> TicketComment:
+    """
+    Добавляет комментарий и в той же транзакции увеличивает
+    tickets.comment_count и обновляет tickets.last_activity_at.
+    Счетчик меняется в SQL (comment_count + 1), поэтому одновременные
+    комментарии не теряют приращения. updated_at заявки тоже обновляется,
+    поэтому меняется и ее ETag.
+
+    Raises:
+        ValueError: Заявка не найдена.
+    """
+    result = await db.execute(
+        update(Ticket)
+        .where(Ticket.ticket_id == ticket_id)
+        .values(comment_count=Ticket.comment_count + 1, last_activity_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise ValueError(f"Заявка с ID {ticket_id} не найдена")
+    db_obj = TicketComment(ticket_id=ticket_id, author_id=author_id, body=obj_in.body)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj, ["created_at", "updated_at", "author"])
+    return db_obj
+
+
+async def update_comment(
+    db: AsyncSession,
+    *,
+    db_obj: TicketComment,
+    obj_in: TicketCommentUpdate
+) -> TicketComment:
+    """Изменяет текст комментария (счетчики заявки не меняются)."""
+    db_obj.body = obj_in.body
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj, ["updated_at", "author"])
+    return db_obj
+
+
+async def remove_comment(db: AsyncSession, *, db_obj: TicketComment) -> bool:
+    """
+    Удаляет комментарий и в той же транзакции уменьшает tickets.comment_count.
+    Счетчик уменьшается, только если DELETE действительно удалил строку,
+    поэтому одновременные удаления одного комментария не уменьшают его дважды.
+
+    Returns:
+        False, если комментарий уже удален другим запросом.
+    """
+    result = await db.execute(
+        delete(TicketComment)
+        .where(TicketComment.comment_id == db_obj.comment_id)
+        .returning(TicketComment.comment_id)
+    )
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
+    await db.execute(
+        update(Ticket)
+        .where(Ticket.ticket_id == db_obj.ticket_id)
+        .values(comment_count=func.greatest(Ticket.comment_count - 1, 0))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return True
@@ -0,0 +1,58 @@
+# Файл: app/crud/crud_ticket_event.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.ticket_event import TicketEvent
+
+
+async def insert_events(db: AsyncSession, *, events: Sequence[Dict[str, Any]], chunk_size: int) -> int:
+    """
+    Записывает события многострочными INSERT ... VALUES (по chunk_size строк
+    в запросе) и фиксирует транзакцию.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        events: Словари с ключами ticket_id, actor_id, event_type, changes, created_at.
+        chunk_size: Максимум строк в одном INSERT (ограничен числом параметров запроса).
+
+    Returns:
+        Количество записанных событий.
+    """
+    for start in range(0, len(events), chunk_size):
+        await db.execute(insert(TicketEvent).values(list(events[start:start + chunk_size])))
+    await db.commit()
+    return len(events)
+
+
+async def get_ticket_events(
+    db: AsyncSession,
+    *,
+    ticket_id: int,
+    limit: int,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[TicketEvent]:
+    """
+    История заявки от новых событий к старым, постранично по ключу
+    (created_at, event_id) — без OFFSET.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        ticket_id: ID заявки.
+        limit: Размер страницы.
+        after: Ключ последнего события предыдущей страницы.
+    """
+    query = select(TicketEvent).where(TicketEvent.ticket_id == ticket_id)
+    if after is not None:
+        created_at, event_id = after
+        query = query.where(
+            tuple_(TicketEvent.created_at, TicketEvent.event_id)
+            < tuple_(literal(created_at, TicketEvent.created_at.type), literal(event_id, TicketEvent.event_id.type))
+        )
+    result = await db.execute(
+        query.order_by(TicketEvent.created_at.desc(), TicketEvent.event_id.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
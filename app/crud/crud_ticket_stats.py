@@ -0,0 +1,229 @@
+# Файл: app/crud/crud_ticket_stats.py
+"""
+Дневная сводка по заявкам (таблица ticket_daily_stats).
+
+Открытие заявки учитывается в день создания без статуса (status_id = NULL:
+при создании статус всегда начальный), закрытие — в день закрытия
+с текущим статусом и временем от создания до закрытия.
+
+Сводка отражает текущие значения заявок (приоритет, тип устройства, статус
+закрытой заявки), как и rebuild(). Поэтому при их изменении и при удалении
+заявки вклад заявки переносится: retract_tickets до изменения вычитает его,
+record_tickets после — добавляет заново. Функции не фиксируют транзакцию:
+они вызываются из crud_ticket и crud_device в транзакции, меняющей заявки
+или устройства, поэтому сводка не расходится с заявками.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import BigInteger, Date, Integer, cast, column, delete, func, literal, null, text, tuple_, union_all, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.device import Device
+from app.models.ticket import Ticket
+from app.models.ticket_daily_stat import TicketDailyStat
+
+# Колонки сводки в порядке, в котором их возвращают запросы-источники
+_COLUMNS = ("day", "status_id", "priority_id", "device_type_id", "opened_count", "closed_count", "close_seconds")
+_KEY = ("day", "status_id", "priority_id", "device_type_id")
+
+# Маска grouping(day, status_id, priority_id, device_type_id) для каждого разреза
+# (бит установлен, если колонка свернута)
+GROUP_DAY = 0b0111
+GROUP_STATUS = 0b1011
+GROUP_PRIORITY = 0b1101
+GROUP_DEVICE_TYPE = 0b1110
+GROUP_TOTAL = 0b1111
+
+
+def _local_day(column_):
+    """День момента времени в часовом поясе статистики."""
+    return cast(func.timezone(settings.STATS_TIMEZONE, column_), Date)
+
+
+def _close_seconds(closed_at, created_at):
+    """Секунды до закрытия, округленные для каждой заявки: вклады заявок складываются и вычитаются точно."""
+    return cast(func.extract("epoch", closed_at - created_at), BigInteger)
+
+
+async def _upsert(db: AsyncSession, source) -> None:
+    """
+    Прибавляет строки источника к сводке одним INSERT ... SELECT ... ON CONFLICT.
+    Источник упорядочивается по ключу, поэтому одновременные транзакции
+    блокируют строки сводки в одном порядке.
+    """
+    ordered = source.order_by(*list(source.selected_columns)[:len(_KEY)])
+    stmt = pg_insert(TicketDailyStat).from_select(list(_COLUMNS), ordered)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_ticket_daily_stats_day_status_priority_type",
+            set_={
+                name: getattr(TicketDailyStat, name) + getattr(stmt.excluded, name)
+                for name in ("opened_count", "closed_count", "close_seconds")
+            },
+        )
+    )
+
+
+def _opened_source(*where, sign: int = 1):
+    day = _local_day(Ticket.created_at)
+    return (
+        select(
+            day, cast(null(), Integer), Ticket.priority_id, Device.device_type_id,
+            func.count() * sign, literal(0), literal(0),
+        )
+        .join(Device, Device.device_id == Ticket.device_id)
+        .where(*where)
+        .group_by(day, Ticket.priority_id, Device.device_type_id)
+    )
+
+
+def _closed_source(*where, sign: int = 1):
+    day = _local_day(Ticket.closed_at)
+    return (
+        select(
+            day, Ticket.status_id, Ticket.priority_id, Device.device_type_id, literal(0), func.count() * sign,
+            cast(func.sum(_close_seconds(Ticket.closed_at, Ticket.created_at)) * sign, BigInteger),
+        )
+        .join(Device, Device.device_id == Ticket.device_id)
+        .where(Ticket.closed_at.is_not(None), *where)
+        .group_by(day, Ticket.status_id, Ticket.priority_id, Device.device_type_id)
+    )
+
+
+async def _apply(db: AsyncSession, where: tuple, *, sign: int, closed_only: bool) -> None:
+    if not closed_only:
+        await _upsert(db, _opened_source(*where, sign=sign))
+    await _upsert(db, _closed_source(*where, sign=sign))
+
+
+async def record_tickets(db: AsyncSession, *where, closed_only: bool = False) -> None:
+    """
+    Добавляет в сводку вклад заявок, отобранных условиями where, по их
+    текущим значениям (без коммита): создание заявки или значения после
+    изменения, вклад до которого вычтен retract_tickets.
+
+    Args:
+        closed_only: Только закрытия (меняется статус, а приоритет и устройство — нет).
+    """
+    await _apply(db, where, sign=1, closed_only=closed_only)
+
+
+async def retract_tickets(db: AsyncSession, *where, closed_only: bool = False) -> None:
+    """
+    Вычитает из сводки вклад заявок, отобранных условиями where, перед
+    изменением их приоритета, устройства, статуса или закрытия и перед
+    удалением (без коммита). Заявки блокируются (FOR UPDATE) до конца
+    транзакции, поэтому не меняются до парного record_tickets.
+    """
+    await db.execute(select(Ticket.ticket_id).where(*where).order_by(Ticket.ticket_id).with_for_update(of=Ticket))
+    await _apply(db, where, sign=-1, closed_only=closed_only)
+
+
+def aggregate_imported(
+    rows: Iterable[Tuple[datetime, Optional[datetime], int, int, int]],
+    zone: ZoneInfo
+) -> Dict[tuple, List[int]]:
+    """
+    Сворачивает импортируемые заявки в строки сводки по устройствам.
+
+    Returns:
+        {(day, status_id, priority_id, device_id): [opened, closed, close_seconds]};
+        status_id = None — строка открытий.
+    """
+    totals: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0, 0])
+    for created_at, closed_at, status_id, priority_id, device_id in rows:
+        totals[(created_at.astimezone(zone).date(), None, priority_id, device_id)][0] += 1
+        if closed_at is not None:
+            counters = totals[(closed_at.astimezone(zone).date(), status_id, priority_id, device_id)]
+            counters[1] += 1
+            # Округление как у CAST(... AS BIGINT) в _close_seconds
+            counters[2] += int((closed_at - created_at).total_seconds() + 0.5)
+    return dict(totals)
+
+
+async def record_imported(
+    db: AsyncSession,
+    *,
+    rows: Iterable[Tuple[datetime, Optional[datetime], int, int, int]]
+) -> None:
+    """
+    Учитывает в сводке импортированные заявки (без коммита). Строки
+    агрегируются в Python, в БД передается по строке на ключ сводки.
+
+    Args:
+        rows: Кортежи (created_at, closed_at, status_id, priority_id, device_id)
+              с датами с часовым поясом.
+    """
+    totals = aggregate_imported(rows, ZoneInfo(settings.STATS_TIMEZONE))
+    if not totals:
+        return
+    imported = values(
+        column("day", Date), column("status_id", Integer), column("priority_id", Integer),
+        column("device_id", Integer), column("opened", Integer), column("closed", Integer),
+        column("seconds", BigInteger),
+        name="imported",
+    ).data([(*key, *counters) for key, counters in totals.items()])
+    source = (
+        select(
+            imported.c.day, cast(imported.c.status_id, Integer), imported.c.priority_id, Device.device_type_id,
+            func.sum(imported.c.opened), func.sum(imported.c.closed), func.sum(imported.c.seconds),
+        )
+        .join(Device, Device.device_id == imported.c.device_id)
+        .group_by(imported.c.day, imported.c.status_id, imported.c.priority_id, Device.device_type_id)
+    )
+    await _upsert(db, source)
+
+
+async def rebuild(db: AsyncSession) -> int:
+    """
+    Пересчитывает сводку заново по всем заявкам и фиксирует транзакцию
+    (первичное заполнение, смена STATS_TIMEZONE). На время пересчета
+    таблица сводки блокируется от изменений, поэтому заявки, создаваемые
+    и закрываемые параллельно, учитываются ровно один раз.
+
+    Returns:
+        Количество строк сводки.
+    """
+    await db.execute(text("LOCK TABLE ticket_daily_stats IN EXCLUSIVE MODE"))
+    await db.execute(delete(TicketDailyStat))
+    combined = union_all(_opened_source(), _closed_source()).subquery()
+    key = [combined.c[index] for index in range(4)]
+    source = select(
+        *key, *(func.sum(combined.c[index]) for index in range(4, 7))
+    ).group_by(*key)
+    await db.execute(pg_insert(TicketDailyStat).from_select(list(_COLUMNS), source))
+    result = await db.execute(select(func.count()).select_from(TicketDailyStat))
+    await db.commit()
+    return result.scalar_one()
+
+
+async def get_stats(db: AsyncSession, *, date_from: date, date_to: date) -> list:
+    """
+    Итоги сводки за диапазон дней одним запросом с GROUPING SETS:
+    по дням, статусам, приоритетам, типам устройств и общий итог.
+    Строки различаются колонкой grouping (маски GROUP_*).
+
+    Returns:
+        Строки с полями grouping, day, status_id, priority_id, device_type_id,
+        opened, closed, close_seconds.
+    """
+    key = [getattr(TicketDailyStat, name) for name in _KEY]
+    result = await db.execute(
+        select(
+            func.grouping(*key).label("grouping"),
+            *key,
+            # Общий итог возвращается и для пустого диапазона — суммы без строк равны 0
+            func.coalesce(func.sum(TicketDailyStat.opened_count), 0).label("opened"),
+            func.coalesce(func.sum(TicketDailyStat.closed_count), 0).label("closed"),
+            func.coalesce(func.sum(TicketDailyStat.close_seconds), 0).label("close_seconds"),
+        )
+        .where(TicketDailyStat.day.between(date_from, date_to))
+        .group_by(func.grouping_sets(*(tuple_(column_) for column_ in key), tuple_()))
+    )
+    return list(result.all())
@@ -0,0 +1,101 @@
+# Файл: app/crud/crud_token_revocation.py
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.token_revocation import TokenRevocation
+
+
+async def revoke_token(
+    db: AsyncSession,
+    *,
+    jti: str,
+    expires_at: datetime,
+    user_id: Optional[int] = None,
+    reason: Optional[str] = None
+) -> TokenRevocation:
+    """
+    Отзывает один токен доступа по его jti.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        jti: Идентификатор токена.
+        expires_at: Время истечения токена (после него запись можно удалить).
+        user_id: ID владельца токена (для справки).
+        reason: Причина отзыва.
+    """
+    db_obj = TokenRevocation(
+        jti=jti,
+        user_id=user_id,
+        revoked_at=datetime.now(timezone.utc),
+        expires_at=expires_at,
+        reason=reason,
+    )
+    db.add(db_obj)
+    await db.commit()
+    return db_obj
+
+
+async def revoke_user(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    reason: Optional[str] = None
+) -> TokenRevocation:
+    """
+    Отзывает все токены доступа пользователя, выпущенные до текущего момента.
+
+    Время отзыва берется из часов приложения, а не БД, так как с ним
+    сравнивается `iat` токенов, выпущенных этим же приложением.
+    """
+    now = datetime.now(timezone.utc)
+    db_obj = TokenRevocation(
+        user_id=user_id,
+        revoked_at=now,
+        expires_at=now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        reason=reason,
+    )
+    db.add(db_obj)
+    await db.commit()
+    return db_obj
+
+
+async def get_revocations_since(
+    db: AsyncSession,
+    *,
+    after_id: int = 0,
+    revoked_since: Optional[datetime] = None
+) -> List[TokenRevocation]:
+    """
+    Получает еще действующие записи об отзыве для инкрементального обновления
+    списка отзыва в памяти воркера.
+
+    Args:
+        after_id: Вернуть записи с revocation_id больше этого значения.
+        revoked_since: Дополнительно вернуть записи, отозванные после этого момента.
+                       Значения последовательности выдаются до коммита, поэтому
+                       транзакция с меньшим id может завершиться позже — окно
+                       по времени подхватывает такие записи.
+    """
+    condition = TokenRevocation.revocation_id > after_id
+    if revoked_since is not None:
+        condition = or_(condition, TokenRevocation.revoked_at >= revoked_since)
+    result = await db.execute(
+        select(TokenRevocation)
+        .where(condition, TokenRevocation.expires_at > datetime.now(timezone.utc))
+        .order_by(TokenRevocation.revocation_id)
+    )
+    return list(result.scalars().all())
+
+
+async def delete_expired(db: AsyncSession) -> int:
+    """Удаляет записи об отзыве уже истекших токенов. Возвращает количество удаленных."""
+    result = await db.execute(
+        delete(TokenRevocation).where(TokenRevocation.expires_at < datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return result.rowcount
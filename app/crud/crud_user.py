@@ -1,9 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List, Dict, Any
-from sqlalchemy import update as sqlalchemy_update # Импортируем update
+from sqlalchemy.orm import selectinload
+from typing import Optional, List, Dict, Any, Iterable, Set, Sequence
+from sqlalchemy.engine import Row
+from sqlalchemy import Integer, and_, any_, case, func, literal, literal_column, or_, text, update as sqlalchemy_update # Импортируем update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 
 from app.models.user import User
+from app.models.user_role import UserRole
 from app.schemas.user import UserCreate, UserUpdate # Импортируем схемы
 from app.core.security import get_password_hash # Импортируем функцию хэширования
 
@@ -21,28 +26,141 @@ async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User
     result = await db.execute(select(User).filter(User.username == username))
     return result.scalars().first()
 
-async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+async def get_user_by_id(db: AsyncSession, user_id: int, with_role: bool = False) -> Optional[User]:
     """
     Получает пользователя из базы данных по его ID.
 
     Args:
         db: Асинхронная сессия базы данных.
         user_id: ID пользователя для поиска.
+        with_role: Загружать ли роль пользователя в том же обращении к БД.
 
     Returns:
         Объект User, если найден, иначе None.
     """
-    result = await db.execute(select(User).filter(User.user_id == user_id))
+    query = select(User).filter(User.user_id == user_id)
+    if with_role:
+        query = query.options(selectinload(User.role))
+    result = await db.execute(query)
     return result.scalars().first()
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+
+def _like_pattern(term: str, prefix: bool = False) -> str:
+    """Экранирует спецсимволы LIKE и строит шаблон поиска подстроки (или начала строки)."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+async def get_users(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    *,
+    after_id: Optional[int] = None,
+    role_id: Optional[int] = None,
+    role_name: Optional[str] = None,
+    search: Optional[str] = None,
+    with_role: bool = False
+) -> List[User]:
     """
-    Получает список пользователей с пагинацией.
+    Получает список пользователей, отсортированный по user_id.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        skip: Смещение (для совместимости; при больших объемах используйте after_id).
+        limit: Максимальное количество записей.
+        after_id: Ключ пагинации — вернуть пользователей с user_id больше этого значения.
+                  В отличие от skip, стоимость запроса не растет с номером страницы.
+        role_id: Фильтр по ID роли.
+        role_name: Фильтр по названию роли.
+        search: Поиск подстроки (без учета регистра) в логине, email, имени и фамилии.
+                Каждое слово должно встретиться хотя бы в одном из полей.
+        with_role: Загрузить роли пользователей одним дополнительным запросом.
     """
-    result = await db.execute(
-        select(User).offset(skip).limit(limit).order_by(User.user_id)
-    )
+    query = select(User).order_by(User.user_id)
+    if after_id is not None:
+        query = query.where(User.user_id > after_id)
+    if role_id is not None:
+        query = query.where(User.role_id == role_id)
+    if role_name is not None:
+        query = query.where(User.role.has(UserRole.name == role_name))
+    if search:
+        # Выражение совпадает с триграммным индексом ix_users_search_trgm
+        search_text = literal_column(User.SEARCH_TEXT_SQL)
+        for term in search.split():
+            query = query.where(search_text.ilike(_like_pattern(term), escape="\\"))
+    if with_role:
+        query = query.options(selectinload(User.role))
+    result = await db.execute(query.offset(skip).limit(limit))
     return result.scalars().all()
 
+async def lookup_users(
+    db: AsyncSession,
+    *,
+    query: str,
+    role_names: Optional[Sequence[str]] = None,
+    limit: int = 10,
+    timeout_ms: Optional[int] = None
+) -> List[Row]:
+    """
+    Быстрый поиск пользователей для автодополнения (выбор техника, автора заявки).
+
+    Находит пользователей, у которых каждое слово запроса входит в логин, имя,
+    фамилию или email, а также похожих по написанию (опечатки) через
+    триграммное сходство. Оба условия обслуживаются индексом ix_users_search_trgm.
+    Сначала идут совпадения по началу логина, затем — по убыванию сходства.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        query: Строка поиска.
+        role_names: Ограничить поиск ролями с этими названиями.
+        limit: Максимальное количество результатов.
+        timeout_ms: Ограничение времени выполнения запроса (statement_timeout).
+
+    Raises:
+        TimeoutError: Запрос не уложился в timeout_ms.
+
+    Returns:
+        Строки с полями user_id, username, first_name, last_name, email, role.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    search_text = literal_column(User.SEARCH_TEXT_SQL)
+    matches = [search_text.ilike(_like_pattern(term), escape="\\") for term in query.split()]
+    statement = (
+        select(
+            User.user_id,
+            User.username,
+            User.first_name,
+            User.last_name,
+            User.email,
+            UserRole.name.label("role"),
+        )
+        .join(UserRole, UserRole.id == User.role_id)
+        # %> — нечеткое совпадение (word_similarity выше порога pg_trgm)
+        .where(or_(and_(*matches), search_text.op("%>")(query)))
+        .order_by(
+            case((User.username.ilike(_like_pattern(query, prefix=True), escape="\\"), 0), else_=1),
+            func.word_similarity(query, search_text).desc(),
+            User.username,
+        )
+        .limit(limit)
+    )
+    if role_names:
+        statement = statement.where(UserRole.name.in_(role_names))
+
+    if timeout_ms:
+        # SET не принимает параметры; значение — целое число из настроек
+        await db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+    try:
+        result = await db.execute(statement)
+        return result.all()
+    except DBAPIError as e:
+        # 57014 — query_canceled (сработал statement_timeout)
+        if getattr(e.orig, "pgcode", None) == "57014" or getattr(e.orig, "sqlstate", None) == "57014":
+            await db.rollback()
+            raise TimeoutError("User lookup exceeded the time limit") from e
+        raise
+
 async def create_user(db: AsyncSession, *, obj_in: UserCreate) -> User:
     """
     Создает нового пользователя.
@@ -65,6 +183,68 @@ async def create_user(db: AsyncSession, *, obj_in: UserCreate) -> User:
     await db.refresh(db_obj)
     return db_obj
 
+async def get_existing_usernames(db: AsyncSession, usernames: Iterable[str]) -> Set[str]:
+    """
+    Возвращает те имена пользователей из переданных, которые уже заняты.
+    Проверка выполняется одним запросом (для массового импорта).
+    """
+    usernames = set(usernames)
+    if not usernames:
+        return set()
+    result = await db.execute(select(User.username).where(User.username.in_(usernames)))
+    return set(result.scalars().all())
+
+async def get_existing_emails(db: AsyncSession, emails: Iterable[str]) -> Set[str]:
+    """
+    Возвращает те email из переданных, которые уже заняты.
+    Проверка выполняется одним запросом (для массового импорта).
+    """
+    emails = set(emails)
+    if not emails:
+        return set()
+    result = await db.execute(select(User.email).where(User.email.in_(emails)))
+    return set(result.scalars().all())
+
+async def get_existing_user_ids(db: AsyncSession, user_ids: Iterable[int]) -> Set[int]:
+    """
+    Возвращает те ID из переданных, для которых пользователь существует.
+    Проверка выполняется одним запросом (список передается одним параметром-массивом).
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return set()
+    result = await db.execute(
+        select(User.user_id).where(User.user_id == any_(literal(list(user_ids), ARRAY(Integer))))
+    )
+    return set(result.scalars().all())
+
+async def create_users_bulk(db: AsyncSession, *, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Создает пользователей пачкой: многострочный INSERT ... ON CONFLICT DO NOTHING.
+
+    Строки должны быть уже проверены и содержать готовый `password_hash`.
+    Строки, конфликтующие по уникальным полям (например, созданные параллельно
+    после проверки), пропускаются, а не прерывают всю вставку.
+
+    Args:
+        db: Асинхронная сессия базы данных.
+        rows: Словари с полями модели User.
+
+    Returns:
+        Словарь username -> user_id для фактически созданных пользователей.
+    """
+    if not rows:
+        return {}
+    stmt = (
+        pg_insert(User)
+        .on_conflict_do_nothing()
+        .returning(User.user_id, User.username)
+    )
+    result = await db.execute(stmt, rows)
+    created = {username: user_id for user_id, username in result.all()}
+    await db.commit()
+    return created
+
 async def update_user(
     db: AsyncSession, *, db_obj: User, obj_in: UserUpdate | Dict[str, Any]
 ) -> User:
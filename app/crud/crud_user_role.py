@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Any, Union
 
 from app.models.user_role import UserRole
 from app.schemas.user_role import UserRoleCreate, UserRoleUpdate
+from app.core.workflow import invalidate_workflow
 
 async def get_user_role(db: AsyncSession, role_id: int) -> Optional[UserRole]:
     """
@@ -118,6 +119,7 @@ async def update_user_role(
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
+    invalidate_workflow() # Граф переходов хранит роли по имени
     return db_obj
 
 async def delete_user_role(db: AsyncSession, *, role_id: int) -> Optional[UserRole]:
@@ -137,4 +139,5 @@ async def delete_user_role(db: AsyncSession, *, role_id: int) -> Optional[UserRo
     
     await db.delete(db_obj)
     await db.commit()
+    invalidate_workflow() # Переходы роли удаляются каскадно
     return db_obj
@@ -8,10 +8,18 @@ from app.models.user import User
 from app.models.device_type import DeviceType
 from app.models.priority import Priority
 from app.models.status import Status
+from app.models.status_transition import StatusTransition
 from app.models.device import Device
 from app.models.file import File
 from app.models.technician_assignment import TechnicianAssignment
 from app.models.ticket import Ticket
+from app.models.user_role import UserRole
+from app.models.refresh_token import RefreshToken
+from app.models.token_revocation import TokenRevocation
+from app.models.idempotency_key import IdempotencyKey
+from app.models.ticket_event import TicketEvent
+from app.models.ticket_comment import TicketComment
+from app.models.ticket_daily_stat import TicketDailyStat
 # Когда появятся другие модели, добавляй их импорты сюда:
 # 
 # 
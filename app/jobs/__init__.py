@@ -0,0 +1,3 @@
+# Файл: app/jobs/__init__.py
+# Фоновые задачи и утилиты командной строки.
+# Каждый модуль запускается как `python -m app.jobs.<имя_модуля> --help`.
@@ -0,0 +1,34 @@
+# Файл: app/jobs/cleanup_idempotency_keys.py
+"""
+Удаление истекших ключей идемпотентности (таблица `idempotency_keys`).
+
+Запускать периодически (например, раз в час из cron):
+    python -m app.jobs.cleanup_idempotency_keys
+"""
+import asyncio
+import logging
+
+from app import crud
+
+logger = logging.getLogger(__name__)
+
+
+async def cleanup_idempotency_keys() -> None:
+    """Удаляет записи, срок хранения которых (IDEMPOTENCY_KEY_TTL_HOURS) истек."""
+    from app.db.session import AsyncSessionFactory, engine
+
+    try:
+        async with AsyncSessionFactory() as db:
+            deleted = await crud.idempotency_key.delete_expired(db)
+        logger.info("Удалено истекших ключей идемпотентности: %d", deleted)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(cleanup_idempotency_keys())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# Файл: app/jobs/cleanup_tokens.py
+"""
+Удаление истекших токенов обновления и записей об отзыве токенов доступа.
+
+Запускать периодически (например, раз в сутки из cron):
+    python -m app.jobs.cleanup_tokens
+"""
+import asyncio
+import logging
+
+from app import crud
+
+logger = logging.getLogger(__name__)
+
+
+async def cleanup_tokens() -> None:
+    """Удаляет строки refresh_tokens и token_revocations, срок которых истек."""
+    from app.db.session import AsyncSessionFactory, engine
+
+    try:
+        async with AsyncSessionFactory() as db:
+            refresh_deleted = await crud.refresh_token.delete_expired(db)
+            revocations_deleted = await crud.token_revocation.delete_expired(db)
+        logger.info(
+            "Удалено истекших токенов обновления: %d, записей об отзыве: %d",
+            refresh_deleted,
+            revocations_deleted,
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(cleanup_tokens())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Файл: app/jobs/import_tickets.py
+"""
+Массовый импорт заявок из CSV или JSON (миграция из другой системы,
+заявки от мониторинга).
+
+Формат тот же, что у POST /api/v1/admin/tickets/import: колонки user_id,
+device_id, priority_id, description и необязательные status_id,
+resolution_notes, created_at, closed_at. Ограничения на число строк нет.
+
+Примеры:
+    python -m app.jobs.import_tickets tickets.csv
+    python -m app.jobs.import_tickets tickets.json --batch-size 10000 --errors errors.csv
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Optional
+
+from app.core.bulk_import import parse_import_data
+from app.core.config import settings
+from app.core.ticket_import import import_tickets
+
+logger = logging.getLogger(__name__)
+
+
+async def run(path: Path, *, batch_size: int, errors_path: Optional[Path]) -> int:
+    """Импортирует файл и возвращает код завершения (1, если были ошибки)."""
+    from app.db.session import AsyncSessionFactory, engine
+
+    try:
+        rows = parse_import_data(path.read_bytes(), is_json=path.suffix.lower() == ".json")
+    except ValueError as e:
+        logger.error("Не удалось разобрать %s: %s", path, e)
+        return 2
+
+    try:
+        async with AsyncSessionFactory() as db:
+            result = await import_tickets(db, rows, batch_size=batch_size)
+    finally:
+        await engine.dispose()
+
+    logger.info(
+        "Строк: %d, создано: %d, ошибок: %d, время: %.1f с, скорость: %.1f заявок/с",
+        result.total, result.created, result.failed, result.elapsed_seconds, result.rows_per_second,
+    )
+    if result.errors:
+        if errors_path is not None:
+            with errors_path.open("w", newline="", encoding="utf-8") as stream:
+                writer = csv.writer(stream)
+                writer.writerow(["row", "errors"])
+                for error in result.errors:
+                    writer.writerow([error.row, "; ".join(error.errors)])
+            logger.info("Ошибки записаны в %s", errors_path)
+        else:
+            for error in result.errors[:20]:
+                logger.warning("Строка %d: %s", error.row, json.dumps(error.errors, ensure_ascii=False))
+            if len(result.errors) > 20:
+                logger.warning("... и еще %d строк с ошибками (используйте --errors)", len(result.errors) - 20)
+    return 1 if result.errors else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Массовый импорт заявок из CSV или JSON")
+    parser.add_argument("path", type=Path, help="Файл .csv или .json")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.TICKET_IMPORT_BATCH_SIZE,
+        help="Размер пачки COPY (по умолчанию TICKET_IMPORT_BATCH_SIZE)",
+    )
+    parser.add_argument("--errors", type=Path, default=None, help="Записать ошибки по строкам в CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    sys.exit(asyncio.run(run(args.path, batch_size=args.batch_size, errors_path=args.errors)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Файл: app/jobs/rebuild_ticket_stats.py
+"""
+Полный пересчет дневной сводки по заявкам (таблица `ticket_daily_stats`).
+
+В обычной работе сводка обновляется в транзакциях создания, закрытия
+и импорта заявок. Пересчет нужен после смены STATS_TIMEZONE или для
+сверки со всеми заявками:
+    python -m app.jobs.rebuild_ticket_stats
+"""
+import asyncio
+import logging
+
+from app import crud
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_ticket_stats() -> None:
+    """Пересчитывает сводку по всем заявкам в одной транзакции."""
+    from app.db.session import AsyncSessionFactory, engine
+
+    try:
+        async with AsyncSessionFactory() as db:
+            rows = await crud.ticket_stats.rebuild(db)
+        logger.info("Дневная сводка по заявкам пересчитана, строк: %d", rows)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(rebuild_ticket_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# Файл: app/jobs/reconcile_uploads.py
+"""
+Сверка директории загрузок с таблицей `files`.
+
+Находит:
+- "сирот" — файлы на диске, на которые не ссылается ни одна запись в `files`
+  (остаются после удаления заявок и от старого плоского формата `uploads/<uuid>.ext`);
+- "пропавшие" файлы — записи в `files`, для которых нет файла на диске.
+
+Обход диска и чтение таблицы выполняются потоково и в одном порядке
+(побайтовая сортировка путей), поэтому сравнение — это слияние двух
+отсортированных потоков без загрузки всего списка в память.
+
+Примеры:
+    python -m app.jobs.reconcile_uploads                      # только отчет
+    python -m app.jobs.reconcile_uploads --report report.csv  # отчет в CSV
+    python -m app.jobs.reconcile_uploads --delete-orphans --min-age 86400
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import crud
+from app.core.storage import get_upload_root
+
+logger = logging.getLogger(__name__)
+
+
+class ScannedFile(NamedTuple):
+    """Файл, найденный при обходе директории загрузок."""
+    path: str  # Путь относительно корня загрузок, разделитель "/"
+    size: int
+    mtime: float
+
+
+@dataclass
+class ReconcileStats:
+    """Счетчики прогресса и результата сверки."""
+    scanned_files: int = 0
+    scanned_rows: int = 0
+    matched: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    orphans_too_young: int = 0
+    missing: int = 0
+    deleted_files: int = 0
+    deleted_rows: int = 0
+    errors: int = 0
+    started_at: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def files_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.scanned_files / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("started_at")
+        data["elapsed_seconds"] = round(self.elapsed, 3)
+        data["files_per_second"] = round(self.files_per_second, 1)
+        return data
+
+
+def iter_upload_tree(directory: Path, prefix: str = "") -> Iterator[ScannedFile]:
+    """
+    Рекурсивно обходит директорию через os.scandir в порядке сортировки путей.
+
+    Имена каталогов сортируются с завершающим "/", поэтому порядок отдаваемых
+    относительных путей совпадает с обычным сравнением строк целиком
+    (и с `ORDER BY file_path COLLATE "C"` в PostgreSQL).
+    В памяти держатся только имена одного каталога, а не всего дерева.
+    Скрытые файлы (начинающиеся с ".") пропускаются.
+    """
+    names: List[Tuple[str, bool]] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                names.append((entry.name + "/", True))
+            elif entry.is_file(follow_symlinks=False):
+                names.append((entry.name, False))
+    names.sort()
+
+    for name, is_dir in names:
+        if is_dir:
+            yield from iter_upload_tree(directory / name, prefix + name)
+            continue
+        try:
+            st = os.stat(directory / name, follow_symlinks=False)
+        except FileNotFoundError:
+            # Файл удалили между scandir и stat
+            continue
+        yield ScannedFile(prefix + name, st.st_size, st.st_mtime)
+
+
+async def _iter_scanned_batches(root: Path, batch_size: int) -> AsyncIterator[List[ScannedFile]]:
+    """Отдает результаты обхода диска порциями, выполняя обход в отдельном потоке."""
+    tree = iter_upload_tree(root)
+    while True:
+        batch = await asyncio.to_thread(lambda: list(islice(tree, batch_size)))
+        if not batch:
+            return
+        yield batch
+
+
+async def _iter_scanned(root: Path, batch_size: int) -> AsyncIterator[ScannedFile]:
+    async for batch in _iter_scanned_batches(root, batch_size):
+        for item in batch:
+            yield item
+
+
+async def _anext_or_none(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+class UploadReconciler:
+    """
+    Сверяет дерево загрузок с таблицей `files` и при необходимости чистит расхождения.
+
+    По умолчанию ничего не удаляет, а только считает и сообщает расхождения.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        root: Optional[Path] = None,
+        batch_size: int = 1000,
+        delete_orphans: bool = False,
+        delete_missing_rows: bool = False,
+        min_age_seconds: float = 3600,
+        progress_every: int = 10000,
+        report: Optional[TextIO] = None,
+    ):
+        self.session_factory = session_factory
+        self.root = root or get_upload_root()
+        self.batch_size = batch_size
+        self.delete_orphans = delete_orphans
+        self.delete_missing_rows = delete_missing_rows
+        # Свежие файлы могут принадлежать загрузке, запись о которой еще не закоммичена
+        self.min_age_seconds = min_age_seconds
+        self.progress_every = progress_every
+        self.stats = ReconcileStats()
+        self._report = csv.writer(report) if report is not None else None
+        self._missing_ids: List[int] = []
+        self._next_progress = progress_every
+
+    async def run(self) -> ReconcileStats:
+        """Выполняет сверку и возвращает итоговые счетчики."""
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Директория загрузок не найдена: {self.root}")
+
+        if self._report is not None:
+            self._report.writerow(["kind", "path", "file_id", "size"])
+
+        now = time.time()
+        async with self.session_factory() as read_session:
+            rows = crud.file.stream_file_paths(read_session, batch_size=self.batch_size)
+            scanned = _iter_scanned(self.root, self.batch_size)
+
+            row = await _anext_or_none(rows)
+            disk = await _anext_or_none(scanned)
+            while row is not None or disk is not None:
+                if disk is not None and (row is None or disk.path < row[1]):
+                    self.stats.scanned_files += 1
+                    self._handle_orphan(disk, now)
+                    disk = await _anext_or_none(scanned)
+                elif row is not None and (disk is None or row[1] < disk.path):
+                    self.stats.scanned_rows += 1
+                    await self._handle_missing(row)
+                    row = await _anext_or_none(rows)
+                else:
+                    # Совпадение: на один путь может ссылаться несколько записей
+                    path = disk.path
+                    self.stats.scanned_files += 1
+                    self.stats.matched += 1
+                    while row is not None and row[1] == path:
+                        self.stats.scanned_rows += 1
+                        row = await _anext_or_none(rows)
+                    disk = await _anext_or_none(scanned)
+                self._maybe_log_progress()
+
+        await self._flush_missing()
+        logger.info("Сверка загрузок завершена: %s", self.stats.as_dict())
+        return self.stats
+
+    def _handle_orphan(self, item: ScannedFile, now: float) -> None:
+        if now - item.mtime < self.min_age_seconds:
+            self.stats.orphans_too_young += 1
+            return
+        self.stats.orphans += 1
+        self.stats.orphan_bytes += item.size
+        self._write_report("orphan", item.path, None, item.size)
+        if not self.delete_orphans:
+            return
+        try:
+            os.remove(self.root / item.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.stats.errors += 1
+            logger.error("Не удалось удалить файл-сироту %s: %s", item.path, e)
+        else:
+            self.stats.deleted_files += 1
+
+    async def _handle_missing(self, row: Tuple[int, str]) -> None:
+        file_id, path = row
+        self.stats.missing += 1
+        self._write_report("missing", path, file_id, None)
+        if self.delete_missing_rows:
+            self._missing_ids.append(file_id)
+            if len(self._missing_ids) >= self.batch_size:
+                await self._flush_missing()
+
+    async def _flush_missing(self) -> None:
+        """Удаляет накопленные записи без файлов отдельной сессией (чтение идет курсором)."""
+        if not self._missing_ids:
+            return
+        ids, self._missing_ids = self._missing_ids, []
+        async with self.session_factory() as write_session:
+            self.stats.deleted_rows += await crud.file.delete_files(write_session, file_ids=ids)
+
+    def _write_report(self, kind: str, path: str, file_id: Optional[int], size: Optional[int]) -> None:
+        if self._report is not None:
+            self._report.writerow([kind, path, file_id if file_id is not None else "", size if size is not None else ""])
+
+    def _maybe_log_progress(self) -> None:
+        processed = self.stats.scanned_files + self.stats.scanned_rows
+        if self.progress_every and processed >= self._next_progress:
+            self._next_progress = processed + self.progress_every
+            logger.info(
+                "Прогресс: файлов %d, записей %d, сирот %d (%.1f МБ), пропавших %d, %.0f файлов/с",
+                self.stats.scanned_files,
+                self.stats.scanned_rows,
+                self.stats.orphans,
+                self.stats.orphan_bytes / (1024 * 1024),
+                self.stats.missing,
+                self.stats.files_per_second,
+            )
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.jobs.reconcile_uploads",
+        description="Сверка директории загрузок с таблицей files.",
+    )
+    parser.add_argument("--root", type=Path, default=None, help="Корень загрузок (по умолчанию UPLOAD_DIRECTORY)")
+    parser.add_argument("--delete-orphans", action="store_true", help="Удалять файлы без записей в БД")
+    parser.add_argument("--delete-missing-rows", action="store_true", help="Удалять записи о файлах, которых нет на диске")
+    parser.add_argument("--min-age", type=float, default=3600, help="Не трогать файлы моложе N секунд (по умолчанию 3600)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Размер порции чтения диска и БД")
+    parser.add_argument("--progress-every", type=int, default=10000, help="Писать прогресс каждые N элементов")
+    parser.add_argument("--report", type=Path, default=None, help="CSV-файл для списка расхождений")
+    parser.add_argument("--json", action="store_true", help="Вывести итоговую статистику в JSON")
+    return parser
+
+
+async def _main(args: argparse.Namespace) -> ReconcileStats:
+    from app.db.session import AsyncSessionFactory, engine
+
+    report = args.report.open("w", newline="", encoding="utf-8") if args.report else None
+    try:
+        reconciler = UploadReconciler(
+            AsyncSessionFactory,
+            root=args.root,
+            batch_size=args.batch_size,
+            delete_orphans=args.delete_orphans,
+            delete_missing_rows=args.delete_missing_rows,
+            min_age_seconds=args.min_age,
+            progress_every=args.progress_every,
+            report=report,
+        )
+        return await reconciler.run()
+    finally:
+        if report is not None:
+            report.close()
+        await engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    stats = asyncio.run(_main(args))
+    if args.json:
+        print(json.dumps(stats.as_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 # Импортируем настройки из config.py с использованием правильного относительного импорта
 from .core.config import settings
+from .core import security, ticket_events
 # Импортируем роутеры с использованием относительного импорта
 from .api.v1.endpoints import ( 
     auth as auth_router, 
@@ -84,6 +85,15 @@ async def ping():
     """
     return {"message": "pong"}
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Останавливает пул процессов хэширования паролей (массовый импорт)
+    и дописывает в БД буфер истории заявок.
+    """
+    security.shutdown_hash_pool()
+    await ticket_events.event_buffer.close()
+
 # Здесь можно добавить обработчики событий startup/shutdown, если нужно
 # @app.on_event("startup")
 # async def startup_event():
@@ -5,11 +5,18 @@ from .user import User
 from .device_type import DeviceType
 from .priority import Priority
 from .status import Status
+from .status_transition import StatusTransition
 from .device import Device
 from .file import File
 from .technician_assignment import TechnicianAssignment
 from .ticket import Ticket
 from .user_role import UserRole
+from .refresh_token import RefreshToken
+from .token_revocation import TokenRevocation
+from .idempotency_key import IdempotencyKey
+from .ticket_event import TicketEvent
+from .ticket_comment import TicketComment
+from .ticket_daily_stat import TicketDailyStat
 
 # Это позволяет импортировать так:
 # from app import models
@@ -68,6 +68,10 @@ class Device(Base):
         Index('ix_devices_device_type_id', 'device_type_id'), # Индекс для внешнего ключа
         Index('ix_devices_inventory_number', 'inventory_number'), # Индекс для инвентарного номера
         UniqueConstraint('inventory_number', name='uq_devices_inventory_number'), # Ограничение уникальности для инвентарного номера
+        # Триграммные индексы (pg_trgm) для поиска устройств по вхождению и нечетко
+        Index('ix_devices_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_devices_inventory_number_trgm', 'inventory_number', postgresql_using='gin',
+              postgresql_ops={'inventory_number': 'gin_trgm_ops'}),
     )
 
 
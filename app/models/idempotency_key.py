@@ -0,0 +1,47 @@
+# Файл: app/models/idempotency_key.py
+import datetime
+from typing import Optional
+from sqlalchemy import Integer, LargeBinary, SmallInteger, String, DateTime, func, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Модель сохраненного результата запроса с заголовком Idempotency-Key SQLAlchemy.
+
+    Ключ уникален в пределах пользователя. Пока запрос выполняется, status_code
+    пуст; после выполнения хранится код и тело ответа, которые возвращаются
+    на повторы. Записи нужны только до expires_at, после чего их можно удалять.
+    """
+    __tablename__ = "idempotency_keys"
+
+    # Без внешнего ключа: запись — служебная и живет недолго
+    user_id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, comment="ID пользователя, отправившего запрос"
+    )
+    key: Mapped[str] = mapped_column(
+        String(255), primary_key=True, comment="Значение заголовка Idempotency-Key"
+    )
+    request_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="SHA-256 эндпоинта и содержимого запроса (повтор с другим телом отклоняется)"
+    )
+    status_code: Mapped[Optional[int]] = mapped_column(
+        SmallInteger, nullable=True, comment="HTTP-код сохраненного ответа (NULL — запрос еще выполняется)"
+    )
+    response_body: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, comment="Тело сохраненного ответа (JSON)"
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Дата и время первого запроса"
+    )
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, comment="После этого момента ключ можно использовать заново"
+    )
+
+    __table_args__ = (
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f"<IdempotencyKey(user={self.user_id}, key='{self.key}', status={self.status_code})>"
@@ -0,0 +1,55 @@
+# Файл: app/models/refresh_token.py
+import datetime
+from typing import Optional
+from sqlalchemy import Integer, String, ForeignKey, DateTime, func, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.db.base_class import Base
+from typing import TYPE_CHECKING
+
+# Импортируем User только для проверки типов
+if TYPE_CHECKING:
+    from .user import User # type: ignore
+
+
+class RefreshToken(Base):
+    """
+    Модель токена обновления (refresh token) SQLAlchemy.
+
+    Сам токен в БД не хранится — только его SHA-256. Токены одной цепочки
+    ротации объединены общим family_id: повторное предъявление уже
+    использованного токена отзывает всю цепочку.
+    """
+    __tablename__ = "refresh_tokens"
+
+    token_id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, comment="Уникальный идентификатор токена (Автоинкремент)"
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False, comment="Внешний ключ, ID пользователя"
+    )
+    token_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, unique=True, comment="SHA-256 токена в hex"
+    )
+    family_id: Mapped[str] = mapped_column(
+        String(32), nullable=False, comment="Идентификатор цепочки ротации (uuid4 hex)"
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Дата и время выдачи"
+    )
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, comment="Дата и время истечения"
+    )
+    revoked_at: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, comment="Дата и время отзыва или ротации (NULL — активен)"
+    )
+
+    user: Mapped["User"] = relationship("User")
+
+    __table_args__ = (
+        Index('ix_refresh_tokens_user_id', 'user_id'),
+        Index('ix_refresh_tokens_family_id', 'family_id'),
+        Index('ix_refresh_tokens_expires_at', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.token_id}, user={self.user_id}, family='{self.family_id}')>"
@@ -2,6 +2,7 @@
 from typing import Optional
 from sqlalchemy import Integer, String, UniqueConstraint, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import expression
 from app.db.base_class import Base
 from typing import TYPE_CHECKING
 
@@ -42,6 +43,14 @@ class Status(Base):
         default=False,
         comment="Флаг завершающего статуса (закрывает заявку)"
     )
+    # Флаг начального статуса: с него начинается новая заявка
+    is_initial: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default=expression.false(),
+        comment="Флаг начального статуса (присваивается новой заявке)"
+    )
 
     # Отношение "один ко многим" к заявкам (Tickets)
     # tickets: Mapped[list["Ticket"]] = relationship("Ticket", back_populates="status") # Добавим позже
@@ -54,4 +63,5 @@ class Status(Base):
     def __repr__(self):
         order = f", order={self.display_order}" if self.display_order is not None else ""
         final = f", is_final={self.is_final}"
-        return f"<Status(id={self.status_id}, name='{self.name}'{order}{final})>"
\ No newline at end of file
+        initial = ", is_initial=True" if self.is_initial else ""
+        return f"<Status(id={self.status_id}, name='{self.name}'{order}{final}{initial})>"
\ No newline at end of file
@@ -0,0 +1,52 @@
+# Файл: app/models/status_transition.py
+from typing import Optional
+from sqlalchemy import Integer, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class StatusTransition(Base):
+    """
+    Модель разрешенного перехода между статусами заявки SQLAlchemy.
+    Набор переходов задает рабочий процесс (workflow) заявки.
+    """
+    __tablename__ = "status_transitions"
+
+    transition_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="Уникальный идентификатор перехода (Автоинкремент)"
+    )
+    from_status_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("statuses.status_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Внешний ключ, ID исходного статуса"
+    )
+    to_status_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("statuses.status_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Внешний ключ, ID целевого статуса"
+    )
+    # Роль, которой разрешен переход (NULL — всем ролям, которые могут менять статус)
+    role_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("user_roles.id", ondelete="CASCADE"),
+        nullable=True,
+        comment="Внешний ключ, ID роли (NULL — любая роль)"
+    )
+
+    __table_args__ = (
+        # NULL в role_id считается одинаковым значением (PostgreSQL 15+)
+        UniqueConstraint(
+            'from_status_id', 'to_status_id', 'role_id',
+            name='uq_status_transitions_from_to_role',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    def __repr__(self):
+        role = f", role={self.role_id}" if self.role_id is not None else ""
+        return f"<StatusTransition(id={self.transition_id}, {self.from_status_id}->{self.to_status_id}{role})>"
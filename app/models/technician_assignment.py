@@ -1,6 +1,6 @@
 # Файл: app/models/technician_assignment.py
 import datetime
-from sqlalchemy import Integer, ForeignKey, DateTime, func, UniqueConstraint
+from sqlalchemy import Integer, ForeignKey, DateTime, func, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
 from typing import TYPE_CHECKING
@@ -36,7 +36,7 @@ class TechnicianAssignment(Base):
         Integer,
         ForeignKey("users.user_id"), # Ссылаемся на существующую таблицу users
         nullable=False,
-        index=True,
+        # Отдельный индекс не нужен: technician_id — префикс составного индекса ниже
         comment="Внешний ключ, ID техника (из таблицы users)"
     )
     # Время назначения
@@ -54,6 +54,8 @@ class TechnicianAssignment(Base):
     # Гарантируем, что один и тот же техник не может быть назначен на одну и ту же заявку дважды
     __table_args__ = (
         UniqueConstraint('ticket_id', 'technician_id', name='uq_ticket_technician'),
+        # Для выборки заявок техника (фильтр assignee_id в списке заявок)
+        Index('ix_technician_assignments_technician_id_ticket_id', 'technician_id', 'ticket_id'),
     )
 
     def __repr__(self):
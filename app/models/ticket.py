@@ -1,7 +1,7 @@
 # Файл: app/models/ticket.py
 import datetime
 from typing import Optional # Используем Optional для nullable полей
-from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, func, Index
+from sqlalchemy import Integer, BigInteger, String, Text, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base_class import Base
 from typing import TYPE_CHECKING
@@ -58,6 +58,27 @@ class Ticket(Base):
     closed_at: Mapped[Optional[datetime.datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True, comment="Дата и время закрытия (может быть NULL)"
     )
+    # Денормализованные счетчики обсуждения: поддерживаются в той же
+    # транзакции, что и изменение комментариев (crud_ticket_comment),
+    # чтобы список заявок не считал комментарии подзапросом
+    comment_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", comment="Количество комментариев"
+    )
+    last_activity_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Дата и время последней активности (создание заявки или комментарий)"
+    )
+    # Денормализованные счетчики файлов и назначений: поддерживаются в той же
+    # транзакции, что и изменение files/technician_assignments (crud_file,
+    # crud_technician_assignment), чтобы список заявок не читал дочерние таблицы
+    files_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", comment="Количество прикрепленных файлов"
+    )
+    total_files_size: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="Суммарный размер прикрепленных файлов в байтах"
+    )
+    assignees_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", comment="Количество назначенных техников"
+    )
 
     # --- Определяем Отношения (Relationships) ---
 
@@ -93,6 +114,12 @@ class Ticket(Base):
         Index('ix_tickets_user_id', 'user_id'),
         Index('ix_tickets_priority_id', 'priority_id'),
         Index('ix_tickets_status_id', 'status_id'),
+        # Сортировка списка по последней активности
+        Index('ix_tickets_last_activity_at', 'last_activity_at'),
+        # Отчеты по заявкам, закрытым за период
+        Index('ix_tickets_closed_at', 'closed_at'),
+        # Отчеты по заявкам, созданным за период
+        Index('ix_tickets_created_at', 'created_at'),
     )
 
     def __repr__(self):
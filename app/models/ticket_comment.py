@@ -0,0 +1,67 @@
+# Файл: app/models/ticket_comment.py
+import datetime
+from sqlalchemy import Integer, Text, ForeignKey, DateTime, func, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.db.base_class import Base
+from typing import TYPE_CHECKING
+
+# Импортируем User только для проверки типов
+if TYPE_CHECKING:
+    from .user import User # type: ignore
+
+
+class TicketComment(Base):
+    """
+    Модель Комментария к заявке SQLAlchemy.
+    Количество комментариев и время последнего хранятся также в заявке
+    (tickets.comment_count, tickets.last_activity_at) — см. crud_ticket_comment.
+    """
+    __tablename__ = "ticket_comments"
+
+    comment_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="Уникальный идентификатор комментария (Автоинкремент)"
+    )
+    # Комментарии удаляются вместе с заявкой (на уровне БД)
+    ticket_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("tickets.ticket_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Внешний ключ, ID заявки"
+    )
+    author_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.user_id"),
+        nullable=False,
+        index=True,
+        comment="Внешний ключ, ID автора комментария"
+    )
+    body: Mapped[str] = mapped_column(
+        Text, nullable=False, comment="Текст комментария"
+    )
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Дата и время создания"
+    )
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False, comment="Дата и время последнего изменения"
+    )
+
+    author: Mapped["User"] = relationship("User", foreign_keys=[author_id])
+
+    __table_args__ = (
+        # Комментарии заявки постранично по ключу comment_id
+        Index('ix_ticket_comments_ticket_id_comment_id', 'ticket_id', 'comment_id'),
+    )
+
+    def __repr__(self):
+        return f"<TicketComment(id={self.comment_id}, ticket={self.ticket_id}, author={self.author_id})>"
+
+    @property
+    def author_name(self) -> str:
+        # Возвращает полное имя автора или username
+        first = getattr(self.author, 'first_name', None)
+        last = getattr(self.author, 'last_name', None)
+        full = ' '.join(filter(None, [first, last])).strip()
+        return full if full else self.author.username
@@ -0,0 +1,68 @@
+# Файл: app/models/ticket_daily_stat.py
+import datetime
+from typing import Optional
+from sqlalchemy import Integer, BigInteger, Date, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class TicketDailyStat(Base):
+    """
+    Модель дневной сводки по заявкам SQLAlchemy (таблица ticket_daily_stats).
+
+    Строка — счетчики за день (в часовом поясе STATS_TIMEZONE) в разрезе
+    статуса, приоритета и типа устройства. Открытие учитывается в день создания
+    заявки без статуса, закрытие — в день закрытия с текущим статусом заявки
+    (при смене статуса закрытой заявки оно переносится на новый статус).
+    Счетчики меняются в той же транзакции, что и сама заявка (см.
+    crud_ticket_stats), поэтому статистика читается из этой таблицы без
+    группировки по всем заявкам.
+    Внешних ключей нет: сводка — производные данные, как и история заявок.
+    """
+    __tablename__ = "ticket_daily_stats"
+
+    stat_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="Уникальный идентификатор строки сводки (Автоинкремент)"
+    )
+    day: Mapped[datetime.date] = mapped_column(
+        Date, nullable=False, comment="День (в часовом поясе статистики)"
+    )
+    # Открытия учитываются без статуса (NULL), закрытия — с текущим статусом заявки
+    status_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, comment="ID статуса закрытой заявки (NULL — строка открытий)"
+    )
+    priority_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="ID приоритета"
+    )
+    # Тип устройства может быть не задан (NULL)
+    device_type_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, comment="ID типа устройства (NULL — тип не задан)"
+    )
+    opened_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", comment="Количество созданных заявок"
+    )
+    closed_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", comment="Количество закрытых заявок"
+    )
+    close_seconds: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0", comment="Суммарное время от создания до закрытия закрытых заявок (с)"
+    )
+
+    __table_args__ = (
+        # Ключ сводки; он же обслуживает выборку по диапазону дней.
+        # NULL в status_id и device_type_id считается одинаковым значением (PostgreSQL 15+)
+        UniqueConstraint(
+            'day', 'status_id', 'priority_id', 'device_type_id',
+            name='uq_ticket_daily_stats_day_status_priority_type',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    def __repr__(self):
+        return (
+            f"<TicketDailyStat(day={self.day}, status={self.status_id}, priority={self.priority_id}, "
+            f"type={self.device_type_id}, opened={self.opened_count}, closed={self.closed_count})>"
+        )
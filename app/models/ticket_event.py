@@ -0,0 +1,54 @@
+# Файл: app/models/ticket_event.py
+import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import BigInteger, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class TicketEvent(Base):
+    """
+    Модель события истории заявки SQLAlchemy (журнал аудита, только добавление).
+
+    Каждое событие — одно изменение заявки: тип события и измененные поля
+    в виде {"поле": {"old": ..., "new": ...}}. События пишутся пачками
+    из буфера в памяти (app.core.ticket_events).
+    """
+    __tablename__ = "ticket_events"
+
+    event_id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Уникальный идентификатор события (Автоинкремент)"
+    )
+    # Без внешних ключей: история переживает удаление заявки и пользователя,
+    # а пачка из буфера не отклоняется из-за заявки, удаленной до записи
+    ticket_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="ID заявки"
+    )
+    actor_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, comment="ID пользователя, выполнившего изменение"
+    )
+    event_type: Mapped[str] = mapped_column(
+        String(32), nullable=False, comment="Тип события (updated, status_changed, technician_assigned, ...)"
+    )
+    changes: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, comment='Измененные поля: {"поле": {"old": ..., "new": ...}}'
+    )
+    # Время изменения (а не записи пачки) — проставляется приложением
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, comment="Дата и время изменения"
+    )
+
+    __table_args__ = (
+        # История заявки постранично по ключу (created_at, event_id): события
+        # разных воркеров попадают в таблицу не в порядке изменения
+        Index('ix_ticket_events_ticket_id_created_at', 'ticket_id', 'created_at', 'event_id'),
+        # Записи добавляются в порядке времени — BRIN на порядки меньше B-tree
+        Index('ix_ticket_events_created_at', 'created_at', postgresql_using='brin'),
+    )
+
+    def __repr__(self):
+        return f"<TicketEvent(id={self.event_id}, ticket={self.ticket_id}, type='{self.event_type}')>"
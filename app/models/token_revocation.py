@@ -0,0 +1,47 @@
+# Файл: app/models/token_revocation.py
+import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, Integer, String, DateTime, func, Index, CheckConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base_class import Base
+
+
+class TokenRevocation(Base):
+    """
+    Модель записи об отзыве токенов доступа SQLAlchemy.
+
+    Запись отзывает либо один токен (по jti), либо все токены пользователя,
+    выпущенные до revoked_at (принудительный выход). Записи нужны только
+    до истечения отозванных токенов (expires_at), после чего их можно удалять.
+    Воркеры читают таблицу инкрементально по возрастанию revocation_id.
+    """
+    __tablename__ = "token_revocations"
+
+    revocation_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, autoincrement=True, comment="Уникальный идентификатор отзыва (Автоинкремент)"
+    )
+    jti: Mapped[Optional[str]] = mapped_column(
+        String(32), nullable=True, comment="Идентификатор отозванного токена (NULL — отзыв всех токенов пользователя)"
+    )
+    # Без внешнего ключа: запись должна пережить удаление пользователя
+    user_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, comment="ID пользователя, чьи токены отозваны"
+    )
+    revoked_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, comment="Дата и время отзыва"
+    )
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, comment="Когда отозванные токены истекут сами (после этого запись не нужна)"
+    )
+    reason: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True, comment="Причина отзыва (logout, sign_out, role_change и т.п.)"
+    )
+
+    __table_args__ = (
+        CheckConstraint('jti IS NOT NULL OR user_id IS NOT NULL', name='target_present'),
+        Index('ix_token_revocations_expires_at', 'expires_at'),
+    )
+
+    def __repr__(self):
+        target = f"jti='{self.jti}'" if self.jti else f"user={self.user_id}"
+        return f"<TokenRevocation(id={self.revocation_id}, {target})>"
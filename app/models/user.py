@@ -51,6 +51,14 @@ class User(Base):
     # Связь с UserRole
     role = relationship("UserRole", back_populates="users")
 
+    # SQL-выражение для поиска пользователей по логину, имени, фамилии и email.
+    # Должно в точности совпадать с выражением триграммного GIN-индекса
+    # ix_users_search_trgm (создается миграцией), иначе индекс не используется.
+    SEARCH_TEXT_SQL = (
+        "(coalesce(username, '') || ' ' || coalesce(first_name, '') || ' ' || "
+        "coalesce(last_name, '') || ' ' || coalesce(email, ''))"
+    )
+
     # Связь "один ко многим" с TechnicianAssignment (назначения, где пользователь является техником)
     assignments: Mapped[List["TechnicianAssignment"]] = relationship(
         "TechnicianAssignment", back_populates="technician"
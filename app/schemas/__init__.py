@@ -1,7 +1,7 @@
 # Файл: app/schemas/__init__.py
 # Делает Pydantic схемы доступными напрямую через пакет app.schemas
 
-from .token import Token, TokenData
+from .token import Token, TokenData, RefreshTokenRequest
 from .user import UserBase, UserCreate, UserUpdate, UserRead
 from . import device_type # Импортируем модуль схем для типов устройств
 from . import priority # Импортируем модуль схем для приоритетов
@@ -10,6 +10,9 @@ from . import device # Импортируем модуль схем для ус
 from . import ticket # Импортируем модуль схем для заявок
 from . import technician_assignment # Импортируем модуль схем для назначения техников
 from . import file # Импортируем модуль схем для файлов
+from . import bulk_import # Общие схемы массового импорта
+from . import ticket_stats # Схемы статистики по заявкам
+from . import report # Схемы аналитических отчетов
 
 # Это позволяет импортировать так:
 # from app import schemas
@@ -0,0 +1,10 @@
+# Файл: app/schemas/bulk_import.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class ImportRowError(BaseModel):
+    """Ошибка в одной строке массового импорта."""
+    row: int = Field(..., description="Номер строки данных (с 1, без учета заголовка CSV)")
+    identifier: Optional[str] = Field(None, description="Ключ строки (логин, инвентарный номер и т.п.), если удалось прочитать")
+    errors: List[str] = Field(..., description="Описание ошибок")
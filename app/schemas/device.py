@@ -1,9 +1,10 @@
 # Файл: app/schemas/device.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 # Импортируем схему для чтения типа устройства, чтобы вложить ее в DeviceRead
 from .device_type import DeviceTypeRead
+from .bulk_import import ImportRowError
 
 # --- Схемы для Устройств (Devices) ---
 
@@ -39,4 +40,40 @@ class DeviceRead(DeviceBase):
 
     class Config:
         # Включаем режим ORM (from_attributes для Pydantic V2)
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Схемы для поиска устройств ---
+
+class DeviceLookup(BaseModel):
+    """Компактная схема устройства для автодополнения."""
+    device_id: int
+    name: str
+    inventory_number: Optional[str] = None
+    device_type_id: Optional[int] = None
+    device_type: Optional[str] = Field(None, description="Название типа устройства")
+
+    class Config:
+        from_attributes = True
+
+class DeviceSearchPage(BaseModel):
+    """Страница результатов поиска устройств."""
+    items: List[DeviceLookup]
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (None — страниц больше нет)")
+
+# --- Схемы для массового импорта устройств ---
+
+class DeviceImportRow(DeviceCreate):
+    """
+    Строка массового импорта устройств.
+    Тип можно указать по ID или по названию (колонка device_type, как в экспорте).
+    """
+    device_type: Optional[str] = Field(None, max_length=255, description="Название типа устройства (если не указан device_type_id)")
+
+class DeviceImportResult(BaseModel):
+    """Итог массового импорта устройств."""
+    total: int = Field(..., description="Всего строк в запросе")
+    inserted: int = Field(..., description="Создано устройств")
+    updated: int = Field(..., description="Обновлено устройств")
+    unchanged: int = Field(..., description="Строк без изменений")
+    failed: int = Field(..., description="Строк с ошибками")
+    errors: List[ImportRowError] = Field(default_factory=list)
@@ -0,0 +1,72 @@
+# Файл: app/schemas/report.py
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ReportPeriod(BaseModel):
+    """Период отчета (дни в часовом поясе статистики)."""
+    date_from: date
+    date_to: date
+    timezone: str = Field(..., description="Часовой пояс, в котором считаются дни")
+    generated_at: datetime = Field(..., description="Когда отчет посчитан (отчеты кэшируются)")
+
+
+class TechnicianReportRow(BaseModel):
+    """Показатели техника по заявкам, закрытым за период."""
+    technician_id: int
+    technician_name: str
+    handled: int = Field(..., description="Закрыто заявок, на которые назначен техник")
+    reopened: int = Field(..., description="Из них повторно открывались")
+    reopen_rate: float = Field(..., description="Доля повторно открытых заявок")
+    median_seconds: float = Field(..., description="Медиана времени от назначения до закрытия (с)")
+    p90_seconds: float = Field(..., description="90-й перцентиль времени от назначения до закрытия (с)")
+    mean_seconds: float = Field(..., description="Среднее время от назначения до закрытия (с)")
+    rank_by_handled: int = Field(..., description="Место по числу заявок (1 — больше всех)")
+    rank_by_median: int = Field(..., description="Место по медиане времени закрытия (1 — быстрее всех)")
+    share_of_handled: float = Field(..., description="Доля от всех заявок отчета")
+
+
+class TechnicianReport(ReportPeriod):
+    """Отчет по техникам за период."""
+    items: List[TechnicianReportRow] = []
+
+
+# Колонки CSV-выгрузки отчета по техникам
+TECHNICIAN_REPORT_COLUMNS = tuple(TechnicianReportRow.model_fields)
+
+
+class DeviceReliabilityMetrics(BaseModel):
+    """Показатели надежности по заявкам, созданным за период (места: 1 — наименее надежные)."""
+    tickets: int = Field(..., description="Заявок за период")
+    resolved: int = Field(..., description="Из них закрыто")
+    mean_seconds_between: Optional[float] = Field(None, description="Среднее время между заявками устройства (с)")
+    mean_resolution_seconds: Optional[float] = Field(None, description="Среднее время от создания до закрытия (с)")
+    rank_by_tickets: int = Field(..., description="Место по числу заявок (1 — больше всех)")
+    rank_by_interval: Optional[int] = Field(None, description="Место по времени между заявками (1 — чаще всех)")
+    rank_by_resolution: Optional[int] = Field(None, description="Место по времени решения (1 — дольше всех)")
+
+
+class DeviceReliabilityRow(DeviceReliabilityMetrics):
+    """Надежность устройства за период."""
+    device_id: int
+    device_name: str
+    inventory_number: Optional[str] = None
+    device_type_id: Optional[int] = None
+    device_type_name: Optional[str] = None
+
+
+class DeviceTypeReliabilityRow(DeviceReliabilityMetrics):
+    """Надежность типа устройств за период (device_type_id = null — устройства без типа)."""
+    device_type_id: Optional[int] = None
+    device_type_name: Optional[str] = None
+    devices: int = Field(..., description="Устройств этого типа с заявками за период")
+    tickets_per_device: float = Field(..., description="Заявок на одно такое устройство")
+
+
+class DeviceReliabilityReport(ReportPeriod):
+    """Отчет по надежности устройств и типов устройств за период."""
+    devices_total: int = Field(..., description="Устройств с заявками за период (в devices — не больше limit)")
+    devices: List[DeviceReliabilityRow] = []
+    device_types: List[DeviceTypeReliabilityRow] = []
@@ -9,10 +9,11 @@ class StatusBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Название статуса")
     display_order: Optional[int] = Field(None, description="Порядок отображения (необязательно)")
     is_final: bool = Field(False, description="Флаг завершающего статуса (закрывает заявку)")
+    is_initial: bool = Field(False, description="Флаг начального статуса (присваивается новой заявке)")
 
 class StatusCreate(StatusBase):
     """Схема для создания нового статуса."""
-    # Наследует 'name', 'display_order' и 'is_final' от StatusBase
+    # Наследует 'name', 'display_order', 'is_final' и 'is_initial' от StatusBase
     pass
 
 class StatusUpdate(BaseModel):
@@ -23,6 +24,7 @@ class StatusUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100, description="Новое название статуса")
     display_order: Optional[int] = Field(None, description="Новый порядок отображения")
     is_final: Optional[bool] = Field(None, description="Флаг завершающего статуса (закрывает заявку)")
+    is_initial: Optional[bool] = Field(None, description="Флаг начального статуса (присваивается новой заявке)")
 
 class StatusRead(StatusBase):
     """Схема для чтения данных статуса из БД."""
@@ -30,4 +32,19 @@ class StatusRead(StatusBase):
 
     class Config:
         # Включаем режим ORM (from_attributes для Pydantic V2)
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Схемы для переходов между статусами (Status Transitions) ---
+
+class StatusTransitionCreate(BaseModel):
+    """Схема для добавления разрешенного перехода между статусами."""
+    from_status_id: int = Field(..., description="ID исходного статуса")
+    to_status_id: int = Field(..., description="ID целевого статуса")
+    role_id: Optional[int] = Field(None, description="ID роли, которой разрешен переход (не указан — любой роли)")
+
+class StatusTransitionRead(StatusTransitionCreate):
+    """Схема для чтения перехода между статусами."""
+    transition_id: int = Field(..., description="Уникальный идентификатор перехода")
+
+    class Config:
+        from_attributes = True
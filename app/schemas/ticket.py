@@ -1,6 +1,6 @@
 # Файл: app/schemas/ticket.py
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, Literal, Optional, List
 from datetime import datetime
 
 from app.schemas.user import UserRead
@@ -9,6 +9,7 @@ from app.schemas.priority import PriorityRead
 from app.schemas.status import StatusRead
 from app.schemas.file import FileRead
 from app.schemas.technician_assignment import TechnicianAssignmentWithDetails
+from app.schemas.bulk_import import ImportRowError
 
 # Базовая схема для заявки с общими полями
 class TicketBase(BaseModel):
@@ -48,9 +49,9 @@ class TicketStatusUpdate(BaseModel):
     status_id: int = Field(..., description="Новый ID статуса заявки")
     resolution_notes: Optional[str] = Field(None, description="Примечания по решению (только при закрытии)")
 
-# Схема для чтения информации о заявке
-class TicketRead(BaseModel):
-    """Схема для чтения данных заявки."""
+# Поля заявки без связанных объектов
+class TicketReadBase(BaseModel):
+    """Поля заявки и ее денормализованные счетчики (без связанных объектов)."""
     ticket_id: int
     device_id: int
     user_id: int
@@ -61,11 +62,31 @@ class TicketRead(BaseModel):
     created_at: datetime
     updated_at: datetime
     closed_at: Optional[datetime] = None
-    files: List[FileRead] = []
+    comment_count: int = 0
+    last_activity_at: Optional[datetime] = None
+    files_count: int = 0
+    total_files_size: int = 0
+    assignees_count: int = 0
 
     class Config:
         from_attributes = True
 
+# Схема для чтения информации о заявке
+class TicketRead(TicketReadBase):
+    """Схема для чтения данных заявки."""
+    files: List[FileRead] = []
+
+# Схема для элемента списка заявок
+class TicketListRead(TicketReadBase):
+    """
+    Схема элемента списка заявок: связи "многие к одному" без файлов
+    и назначений — вместо них files_count, total_files_size и assignees_count.
+    """
+    user: Optional[UserRead] = None
+    device: Optional[DeviceRead] = None
+    priority: Optional[PriorityRead] = None
+    status: Optional[StatusRead] = None
+
 # Схема для детального чтения заявки со связанными объектами
 class TicketDetailRead(TicketRead):
     """Схема для детального чтения заявки со всеми связанными объектами."""
@@ -79,3 +100,143 @@ class TicketDetailRead(TicketRead):
 
     class Config:
         from_attributes = True
+
+# --- Схемы для пакетного получения заявок ---
+
+class TicketBatchGetRequest(BaseModel):
+    """Запрос пакетного получения заявок по списку ID."""
+    ids: List[int] = Field(..., min_length=1, description="ID заявок (повторы игнорируются)")
+
+class TicketBatchItem(BaseModel):
+    """Результат для одного ID: заявка (status=200) или маркер отсутствия (status=404)."""
+    status: int = Field(..., description="200 — заявка найдена, 404 — не найдена")
+    ticket: Optional[TicketDetailRead] = None
+    detail: Optional[str] = None
+
+class TicketBatchGetResult(BaseModel):
+    """Результаты пакетного получения, сгруппированные по ID заявки."""
+    items: Dict[int, TicketBatchItem]
+
+# --- Схемы для массовых операций над заявками ---
+
+class TicketBulkFilter(BaseModel):
+    """Фильтр заявок для массовой операции (те же условия, что у списка заявок)."""
+    user_id: Optional[List[int]] = None
+    status_id: Optional[List[int]] = None
+    priority_id: Optional[List[int]] = None
+    device_id: Optional[List[int]] = None
+    state: Optional[Literal["open", "closed"]] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    updated_from: Optional[datetime] = None
+    updated_to: Optional[datetime] = None
+    closed_from: Optional[datetime] = None
+    closed_to: Optional[datetime] = None
+    search: Optional[str] = None
+    assignee_id: Optional[int] = None
+    unassigned: bool = False
+
+class TicketBulkTarget(BaseModel):
+    """Набор заявок для массовой операции: список ID или фильтр (ровно одно из двух)."""
+    ids: Optional[List[int]] = Field(None, min_length=1, description="ID заявок")
+    filter: Optional[TicketBulkFilter] = Field(None, description="Фильтр заявок")
+
+    @model_validator(mode="after")
+    def check_target(self) -> "TicketBulkTarget":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Укажите ровно одно из полей: ids или filter")
+        return self
+
+class TicketBulkStatusUpdate(TicketBulkTarget):
+    """Массовая смена статуса."""
+    status_id: int = Field(..., description="Новый ID статуса")
+    resolution_notes: Optional[str] = Field(None, description="Примечания по решению (обязательны при закрытии)")
+
+class TicketBulkPriorityUpdate(TicketBulkTarget):
+    """Массовая смена приоритета."""
+    priority_id: int = Field(..., description="Новый ID приоритета")
+
+class TicketBulkAssignment(TicketBulkTarget):
+    """Массовое назначение или снятие техника."""
+    technician_id: int = Field(..., description="ID техника")
+
+class TicketBulkResult(BaseModel):
+    """Итог массовой операции."""
+    matched: int = Field(..., description="Сколько заявок попало под ids/filter")
+    updated: int = Field(..., description="Сколько заявок изменено")
+    updated_ids: List[int] = []
+    not_found: List[int] = Field([], description="ID из запроса, которых нет в базе")
+    skipped: Dict[str, List[int]] = Field(
+        {}, description=(
+            "Пропущенные заявки по причинам: closed — заявка закрыта, unchanged — изменение не требуется, "
+            "transition_not_allowed — переход из текущего статуса не разрешен рабочим процессом"
+        )
+    )
+
+# --- Схемы для массового импорта заявок ---
+
+class TicketImportRow(AdminTicketCreate):
+    """
+    Строка массового импорта заявки. Кроме полей AdminTicketCreate можно
+    перенести статус и даты из другой системы.
+    """
+    status_id: Optional[int] = Field(None, description="ID статуса (по умолчанию — начальный)")
+    resolution_notes: Optional[str] = None
+    created_at: Optional[datetime] = Field(None, description="Дата создания (по умолчанию — время импорта)")
+    closed_at: Optional[datetime] = Field(None, description="Дата закрытия (для финальных статусов)")
+
+class TicketImportResult(BaseModel):
+    """Результат массового импорта заявок."""
+    total: int = Field(..., description="Строк во входных данных")
+    created: int = Field(..., description="Создано заявок")
+    failed: int = Field(..., description="Строк с ошибками")
+    errors: List[ImportRowError] = Field(default_factory=list)
+    elapsed_seconds: float = Field(..., description="Время импорта")
+    rows_per_second: float = Field(..., description="Скорость вставки (созданных заявок в секунду)")
+
+# --- Схемы для истории изменений заявки ---
+
+class TicketEventRead(BaseModel):
+    """Событие истории заявки."""
+    event_id: int
+    ticket_id: int
+    actor_id: Optional[int] = Field(None, description="ID пользователя, выполнившего изменение")
+    event_type: str = Field(..., description="updated, status_changed, technician_assigned, technician_removed")
+    changes: Dict[str, Any] = Field(..., description='Измененные поля: {"поле": {"old": ..., "new": ...}}')
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class TicketEventPage(BaseModel):
+    """Страница истории заявки (от новых событий к старым)."""
+    items: List[TicketEventRead]
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (None — страниц больше нет)")
+
+# --- Схемы для комментариев к заявке ---
+
+class TicketCommentCreate(BaseModel):
+    """Схема для добавления комментария к заявке."""
+    body: str = Field(..., min_length=1, max_length=10000, description="Текст комментария")
+
+class TicketCommentUpdate(TicketCommentCreate):
+    """Схема для изменения текста комментария."""
+    pass
+
+class TicketCommentRead(BaseModel):
+    """Схема для чтения комментария."""
+    comment_id: int
+    ticket_id: int
+    author_id: int
+    author_name: str = Field(..., description="Имя автора (или логин)")
+    body: str
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class TicketCommentPage(BaseModel):
+    """Страница комментариев заявки (от старых к новым)."""
+    items: List[TicketCommentRead]
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (None — страниц больше нет)")
@@ -0,0 +1,46 @@
+# Файл: app/schemas/ticket_stats.py
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TicketStatsBucket(BaseModel):
+    """Счетчики заявок за период (или его срез)."""
+    opened: int = Field(0, description="Создано заявок")
+    closed: int = Field(0, description="Закрыто заявок")
+    mean_time_to_close_seconds: Optional[float] = Field(
+        None, description="Среднее время от создания до закрытия закрытых заявок (с); null, если закрытий нет"
+    )
+
+
+class TicketStatsDay(TicketStatsBucket):
+    """Счетчики за день."""
+    day: date
+
+
+class TicketStatsByStatus(TicketStatsBucket):
+    """Закрытия в разрезе статуса закрытой заявки (открытия учитываются без статуса)."""
+    status_id: int
+
+
+class TicketStatsByPriority(TicketStatsBucket):
+    """Счетчики в разрезе приоритета."""
+    priority_id: int
+
+
+class TicketStatsByDeviceType(TicketStatsBucket):
+    """Счетчики в разрезе типа устройства."""
+    device_type_id: Optional[int] = Field(None, description="ID типа устройства (null — тип не задан)")
+
+
+class TicketStatsRead(BaseModel):
+    """Статистика по заявкам за диапазон дней (из дневной сводки)."""
+    date_from: date
+    date_to: date
+    timezone: str = Field(..., description="Часовой пояс, в котором считаются дни")
+    totals: TicketStatsBucket
+    days: List[TicketStatsDay] = Field(..., description="Все дни диапазона по порядку, включая дни без заявок")
+    by_status: List[TicketStatsByStatus] = []
+    by_priority: List[TicketStatsByPriority] = []
+    by_device_type: List[TicketStatsByDeviceType] = []
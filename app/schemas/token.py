@@ -5,9 +5,17 @@ class Token(BaseModel):
     """Схема для ответа с JWT токеном."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None # Токен обновления для /api/auth/refresh
+
+class RefreshTokenRequest(BaseModel):
+    """Схема запроса на обновление токена доступа."""
+    refresh_token: str
 
 class TokenData(BaseModel):
     """Схема для данных, закодированных внутри JWT токена."""
     username: Optional[str] = None
     user_id: Optional[int] = None
-    role: Optional[str] = None # Добавим роль для удобства проверки прав
\ No newline at end of file
+    role: Optional[str] = None # Добавим роль для удобства проверки прав
+    jti: Optional[str] = None # Идентификатор токена (для отзыва)
+    iat: Optional[float] = None # Время выпуска (epoch)
+    exp: Optional[float] = None # Время истечения (epoch)
\ No newline at end of file
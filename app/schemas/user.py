@@ -1,8 +1,10 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import enum
 
+from app.schemas.bulk_import import ImportRowError
+
 # Используем Enum из модели, если он там определен, или определяем здесь
 # Импортируем UserRole из модели, если он там есть
 try:
@@ -61,6 +63,22 @@ class UserRead(UserBase):
         # Включаем режим ORM (from_attributes для Pydantic V2)
         from_attributes = True
 
+class UserReadWithRole(UserRead):
+    """Схема пользователя вместе с ролью (для административных эндпоинтов)."""
+    role: Optional[UserRoleSchema] = None
+
+class UserLookup(BaseModel):
+    """Компактная схема пользователя для автодополнения."""
+    user_id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    role: str = Field(..., description="Название роли")
+
+    class Config:
+        from_attributes = True
+
 # --- Схемы для смены/установки пароля ---
 
 class PasswordUpdate(BaseModel):
@@ -76,4 +94,20 @@ class AdminPasswordReset(BaseModel):
 
 class UserRoleChange(BaseModel):
     """Схема для изменения роли пользователя администратором."""
-    role_id: int = Field(..., description="ID новой роли пользователя")
\ No newline at end of file
+    role_id: int = Field(..., description="ID новой роли пользователя")
+
+# --- Схемы для массового импорта пользователей ---
+
+class UserImportCreated(BaseModel):
+    """Пользователь, созданный при массовом импорте."""
+    row: int = Field(..., description="Номер строки данных (с 1)")
+    user_id: int
+    username: str
+
+class UserImportResult(BaseModel):
+    """Итог массового импорта пользователей."""
+    total: int = Field(..., description="Всего строк в запросе")
+    created: int = Field(..., description="Создано пользователей")
+    failed: int = Field(..., description="Строк с ошибками")
+    users: List[UserImportCreated] = Field(default_factory=list)
+    errors: List[ImportRowError] = Field(default_factory=list)
@@ -0,0 +1,49 @@
+# Файл: benchmarks/bench_auth.py
+"""
+Замер накладных расходов на проверку JWT в одном запросе.
+
+Сравнивает:
+- jose, без кэша   — исходное поведение decode_access_token;
+- pyjwt, без кэша  — ускоренный бэкенд (JWT_BACKEND=pyjwt);
+- кэш (попадание)  — повторный запрос с тем же токеном.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_auth [--number 20000]
+"""
+import argparse
+import timeit
+
+from app.core import security
+from app.schemas.token import TokenData
+
+
+def _decode_uncached(backend, token: str) -> TokenData:
+    payload = backend.decode(token)
+    return TokenData(username=payload.get("sub"), user_id=payload.get("user_id"), role=payload.get("role"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="Количество повторов на сценарий")
+    args = parser.parse_args()
+
+    token = security.create_access_token({"sub": "bench", "user_id": 1, "role": "user"})
+
+    cases = [("jose, без кэша", lambda: _decode_uncached(security._JoseBackend, token))]
+    if security.pyjwt is not None:
+        cases.append(("pyjwt, без кэша", lambda: _decode_uncached(security._PyJWTBackend, token)))
+    if security.token_cache is not None:
+        security.decode_access_token(token)  # Прогреваем кэш
+        cases.append(("кэш (попадание)", lambda: security.decode_access_token(token)))
+
+    baseline = None
+    print(f"{'сценарий':<20} {'мкс/запрос':>12} {'ускорение':>10}")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        per_call_us = seconds / args.number * 1e6
+        baseline = baseline or per_call_us
+        print(f"{name:<20} {per_call_us:>12.2f} {baseline / per_call_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,13 @@ export default function UserPage() {
   const router = useRouter();
   const { t, i18n } = useTranslation();
   const handleLogout = () => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      // Отзываем токен обновления на сервере; результат не ждем
+      api.post('/api/auth/logout', { refresh_token: refreshToken }).catch(() => {});
+    }
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     router.push('/login');
   };
 
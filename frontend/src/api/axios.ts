@@ -22,12 +22,49 @@ if (typeof window !== 'undefined') {
     (error) => Promise.reject(error)
   );
 
-  // Автоматический выход при 401 Unauthorized
+  // Один общий запрос обновления на все параллельные 401
+  let refreshPromise: Promise<string | null> | null = null;
+
+  const refreshAccessToken = async (): Promise<string | null> => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) return null;
+    try {
+      const { data } = await axios.post(
+        `${baseURL}/api/auth/refresh`,
+        { refresh_token: refreshToken },
+        { withCredentials: true }
+      );
+      localStorage.setItem('access_token', data.access_token);
+      if (data.refresh_token) {
+        localStorage.setItem('refresh_token', data.refresh_token);
+      }
+      return data.access_token;
+    } catch {
+      return null;
+    }
+  };
+
+  // При 401 пробуем обновить токен доступа без повторного ввода пароля,
+  // и только если это не удалось — выходим
   api.interceptors.response.use(
     (response) => response,
-    (error) => {
-      if (error.response?.status === 401) {
+    async (error) => {
+      const original = error.config;
+      const isAuthRequest = original?.url?.includes('/api/auth/');
+      if (error.response?.status === 401 && original && !original._retry && !isAuthRequest) {
+        original._retry = true;
+        refreshPromise = refreshPromise ?? refreshAccessToken().finally(() => {
+          refreshPromise = null;
+        });
+        const newToken = await refreshPromise;
+        if (newToken) {
+          original.headers['Authorization'] = `Bearer ${newToken}`;
+          return api(original);
+        }
+      }
+      if (error.response?.status === 401 && !isAuthRequest) {
         localStorage.removeItem('access_token');
+        localStorage.removeItem('refresh_token');
         window.location.href = '/login';
       }
       return Promise.reject(error);
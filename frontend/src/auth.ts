@@ -15,6 +15,7 @@ export function setToken(token: string) {
 export function removeToken() {
   if (typeof window === 'undefined') return;
   localStorage.removeItem('access_token');
+  localStorage.removeItem('refresh_token');
 }
 
 export function useCurrentUser() {
@@ -12,6 +12,7 @@ interface LoginCredentials {
 interface LoginResponse {
   access_token: string;
   token_type: string;
+  refresh_token?: string;
 }
 
 // Функция для выполнения запроса на вход
@@ -40,6 +41,9 @@ export function useLoginMutation() {
     onSuccess: async (data: LoginResponse) => {
       // Сохраняем токен и перенаправляем на страницу пользователя
       localStorage.setItem('access_token', data.access_token);
+      if (data.refresh_token) {
+        localStorage.setItem('refresh_token', data.refresh_token);
+      }
       queryClient.invalidateQueries({ queryKey: ['user', 'me'] });
       router.push('/user');
     },
@@ -48,6 +52,7 @@ export function useLoginMutation() {
       console.error('Login failed:', error);
       // Очистка токена в случае ошибки (на всякий случай)
       localStorage.removeItem('access_token');
+      localStorage.removeItem('refresh_token');
     },
   });
 }
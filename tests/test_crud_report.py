@@ -0,0 +1,100 @@
+# Файл: tests/test_crud_report.py
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.crud import crud_report
+from app.crud.crud_report import _rank, _reliability, _report_rows
+
+
+def test_period_bounds_cover_whole_local_days():
+    start, end = crud_report.period_bounds(date(2026, 3, 1), date(2026, 3, 31))
+    zone = ZoneInfo(settings.STATS_TIMEZONE)
+    assert start.tzinfo == zone and end.tzinfo == zone
+    assert start.date() == date(2026, 3, 1)
+    assert end.date() == date(2026, 4, 1)
+    assert end - start == timedelta(days=31)
+
+
+def test_invalidate_drops_only_periods_with_day(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(crud_report, "report_cache", cache)
+    march = (date(2026, 3, 1), date(2026, 3, 31))
+    april = (date(2026, 4, 1), date(2026, 4, 30))
+    for name in (crud_report.TECHNICIAN_REPORT, crud_report.DEVICE_REPORT):
+        for period in (march, april):
+            cache.set((name, *period), {})
+
+    crud_report.invalidate([crud_report.TECHNICIAN_REPORT], date(2026, 3, 15))
+
+    assert sorted(cache.keys()) == sorted([
+        (crud_report.TECHNICIAN_REPORT, *april),
+        (crud_report.DEVICE_REPORT, *march),
+        (crud_report.DEVICE_REPORT, *april),
+    ])
+
+
+def test_invalidate_without_day_drops_all_periods(monkeypatch):
+    cache = TTLCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(crud_report, "report_cache", cache)
+    cache.set((crud_report.DEVICE_REPORT, date(2026, 3, 1), date(2026, 3, 31)), {})
+    cache.set((crud_report.TECHNICIAN_REPORT, date(2026, 3, 1), date(2026, 3, 31)), {})
+
+    crud_report.invalidate([crud_report.DEVICE_REPORT])
+
+    assert cache.keys() == [(crud_report.TECHNICIAN_REPORT, date(2026, 3, 1), date(2026, 3, 31))]
+
+
+def test_invalidate_without_cache(monkeypatch):
+    monkeypatch.setattr(crud_report, "report_cache", None)
+    crud_report.invalidate([crud_report.DEVICE_REPORT], date(2026, 3, 1))
+
+
+# Три устройства: 3, 1 и 2 заявки; моменты создания по устройствам подряд
+TICKETS = np.array([3, 1, 2])
+RESOLVED = np.array([2, 0, 2])
+RESOLUTION_SECONDS = np.array([100.0, 0.0, 50.0])
+CREATED = np.array([0.0, 10.0, 30.0, 5.0, 100.0, 160.0])
+
+
+def test_rank_matches_sql_rank_and_skips_nan():
+    ranks = _rank(np.array([3.0, 1.0, 3.0, np.nan, 2.0]))
+    np.testing.assert_array_equal(ranks, [3.0, 1.0, 3.0, np.nan, 2.0])
+
+
+def test_reliability_per_device():
+    columns = _reliability(TICKETS, RESOLVED, RESOLUTION_SECONDS, CREATED, np.arange(3), 3)
+    np.testing.assert_array_equal(columns["tickets"], [3, 1, 2])
+    # Интервалы не пересекают границы устройств: (10 + 20) / 2 и 60 / 1
+    np.testing.assert_array_equal(columns["mean_seconds_between"], [15.0, np.nan, 60.0])
+    np.testing.assert_array_equal(columns["mean_resolution_seconds"], [50.0, np.nan, 25.0])
+    np.testing.assert_array_equal(columns["rank_by_tickets"], [1, 3, 2])
+    np.testing.assert_array_equal(columns["rank_by_interval"], [1, np.nan, 2])
+    np.testing.assert_array_equal(columns["rank_by_resolution"], [1, np.nan, 2])
+
+
+def test_reliability_per_type():
+    types = np.array([0, 1, 0])
+    columns = _reliability(TICKETS, RESOLVED, RESOLUTION_SECONDS, CREATED, types, 2)
+    np.testing.assert_array_equal(columns["tickets"], [5, 1])
+    # Интервалы 10, 20 и 60 обоих устройств типа 0
+    np.testing.assert_array_equal(columns["mean_seconds_between"], [30.0, np.nan])
+    np.testing.assert_array_equal(columns["mean_resolution_seconds"], [37.5, np.nan])
+
+
+def test_reliability_empty():
+    empty = np.zeros(0, dtype=np.int64)
+    columns = _reliability(empty, empty, np.zeros(0), np.zeros(0), empty, 0)
+    assert all(len(values) == 0 for values in columns.values())
+
+
+def test_report_rows_order_and_nulls():
+    columns = _reliability(TICKETS, RESOLVED, RESOLUTION_SECONDS, CREATED, np.arange(3), 3)
+    rows = _report_rows(columns, [{"device_id": device_id} for device_id in (10, 11, 12)])
+    assert [row["device_id"] for row in rows] == [10, 12, 11]
+    assert rows[2]["mean_seconds_between"] is None
+    assert rows[2]["rank_by_interval"] is None
+    assert rows[0]["tickets"] == 3 and isinstance(rows[0]["tickets"], int)
@@ -0,0 +1,164 @@
+# Файл: tests/test_idempotency.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app import crud
+from app.core import idempotency
+from app.core.cache import TTLCache
+from app.core.idempotency import REPLAYED_HEADER, IdempotentRequest
+
+
+class Item(BaseModel):
+    item_id: int
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeKeys:
+    """Таблица idempotency_keys в памяти вместо crud.idempotency_key."""
+
+    def __init__(self):
+        self.rows = {}
+        self.save_result = True
+
+    async def reserve_key(self, db, *, user_id, key, request_hash, expires_at):
+        if (user_id, key) in self.rows:
+            return None
+        reserved_at = datetime.now(timezone.utc)
+        self.rows[(user_id, key)] = SimpleNamespace(
+            request_hash=request_hash, status_code=None, response_body=None,
+            created_at=reserved_at, expires_at=expires_at,
+        )
+        return reserved_at
+
+    async def get_key(self, db, *, user_id, key):
+        return self.rows.get((user_id, key))
+
+    async def save_response(self, db, *, user_id, key, reserved_at, status_code, response_body):
+        row = self.rows.get((user_id, key))
+        if not self.save_result or row is None or row.created_at != reserved_at:
+            return False
+        row.status_code, row.response_body = status_code, response_body
+        return True
+
+    async def release_key(self, db, *, user_id, key, reserved_at):
+        row = self.rows.get((user_id, key))
+        if row is not None and row.status_code is None and row.created_at == reserved_at:
+            del self.rows[(user_id, key)]
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    fake = FakeKeys()
+    for name in ("reserve_key", "get_key", "save_response", "release_key"):
+        monkeypatch.setattr(crud.idempotency_key, name, getattr(fake, name))
+    monkeypatch.setattr(idempotency, "completed_cache", None)
+    return fake
+
+
+async def _create(db, key, fingerprint="a", item_id=1):
+    async with IdempotentRequest(db, user_id=1, key=key, fingerprint=fingerprint) as idempotent:
+        if idempotent.replay is not None:
+            return idempotent.replay
+        return await idempotent.respond(Item(item_id=item_id), response_model=Item, status_code=201)
+
+
+def test_without_key_commits_and_returns_content(keys):
+    db = FakeSession()
+    result = asyncio.run(_create(db, None))
+    assert result == Item(item_id=1)
+    assert db.commits == 1
+    assert keys.rows == {}
+
+
+def test_response_is_saved_in_one_commit_and_replayed(keys):
+    db = FakeSession()
+    first = asyncio.run(_create(db, "k"))
+    assert first.status_code == 201
+    assert first.body == b'{"item_id":1}'
+    # Резерв ключа фиксирует crud (здесь подменен), объект и ответ — один commit
+    assert db.commits == 1
+
+    replay = asyncio.run(_create(FakeSession(), "k", item_id=2))
+    assert replay.status_code == 201
+    assert replay.body == b'{"item_id":1}'
+    assert replay.headers[REPLAYED_HEADER] == "true"
+
+
+def test_other_request_with_same_key_is_rejected(keys):
+    asyncio.run(_create(FakeSession(), "k"))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_create(FakeSession(), "k", fingerprint="b"))
+    assert error.value.status_code == 422
+
+
+def test_pending_key_returns_conflict(keys):
+    keys.rows[(1, "k")] = SimpleNamespace(
+        request_hash="a", status_code=None, response_body=None,
+        created_at=datetime.now(timezone.utc), expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_create(FakeSession(), "k"))
+    assert error.value.status_code == 409
+
+
+def test_error_rolls_back_and_releases_key(keys):
+    db = FakeSession()
+
+    async def failing():
+        async with IdempotentRequest(db, user_id=1, key="k", fingerprint="a"):
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(failing())
+    assert db.rollbacks == 1
+    assert db.commits == 0
+    assert keys.rows == {}
+    # Ключ можно использовать повторно
+    assert asyncio.run(_create(FakeSession(), "k")).status_code == 201
+
+
+def test_reclaimed_reservation_rolls_back_with_conflict(keys):
+    keys.save_result = False
+    db = FakeSession()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_create(db, "k"))
+    assert error.value.status_code == 409
+    assert db.commits == 0
+    assert db.rollbacks == 1
+
+
+def test_cached_response_expires_with_key_row(keys, monkeypatch):
+    now = datetime.now(timezone.utc)
+    clock = {"now": now.timestamp()}
+    cache = TTLCache(maxsize=10, timer=lambda: clock["now"])
+    monkeypatch.setattr(idempotency, "completed_cache", cache)
+    keys.rows[(1, "k")] = SimpleNamespace(
+        request_hash="a", status_code=201, response_body=b'{"item_id":1}',
+        created_at=now - timedelta(hours=23), expires_at=now + timedelta(hours=1),
+    )
+    asyncio.run(_create(FakeSession(), "k"))
+    assert cache.get((1, "k")) is not None
+    clock["now"] = (now + timedelta(hours=2)).timestamp()
+    assert cache.get((1, "k")) is None
+
+
+def test_invalid_key_length(keys):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_create(FakeSession(), "x" * (idempotency.MAX_KEY_LENGTH + 1)))
+    assert error.value.status_code == 400
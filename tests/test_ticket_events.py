@@ -0,0 +1,115 @@
+# Файл: tests/test_ticket_events.py
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from app import crud
+from app.core import ticket_events
+from app.core.ticket_events import TicketEventBuffer, diff, snapshot
+
+
+def test_snapshot_and_diff():
+    ticket = SimpleNamespace(status_id=1, priority_id=2, device_id=3, description="a", resolution_notes=None)
+    before = snapshot(ticket)
+    ticket.status_id = 4
+    ticket.resolution_notes = "done"
+    assert diff(before, snapshot(ticket)) == {
+        "status_id": {"old": 1, "new": 4},
+        "resolution_notes": {"old": None, "new": "done"},
+    }
+    assert diff(before, before) == {}
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Подменяет запись в БД: события собираются в список."""
+    batches = []
+
+    @contextlib.asynccontextmanager
+    async def session_factory():
+        yield None
+
+    async def insert_events(db, *, events, chunk_size):
+        batches.append(list(events))
+        return len(events)
+
+    monkeypatch.setattr("app.db.session.AsyncSessionFactory", session_factory)
+    monkeypatch.setattr(crud.ticket_event, "insert_events", insert_events)
+    return batches
+
+
+def _record(buffer, ticket_id, changes=None):
+    buffer.record(
+        ticket_id=ticket_id, actor_id=1, event_type=ticket_events.EVENT_UPDATED,
+        changes={"status_id": {"old": 1, "new": 2}} if changes is None else changes,
+    )
+
+
+def test_flush_writes_pending_events(written):
+    async def run():
+        buffer = TicketEventBuffer(batch_size=100, flush_interval=60, max_pending=100)
+        _record(buffer, 1)
+        _record(buffer, 2)
+        _record(buffer, 3, changes={})  # пустые изменения не записываются
+        assert len(buffer) == 2
+        assert await buffer.flush() == 2
+        assert len(buffer) == 0
+        await buffer.close()
+
+    asyncio.run(run())
+    assert [[event["ticket_id"] for event in batch] for batch in written] == [[1, 2]]
+
+
+def test_batch_size_wakes_background_flush(written):
+    async def run():
+        buffer = TicketEventBuffer(batch_size=2, flush_interval=60, max_pending=100)
+        _record(buffer, 1)
+        _record(buffer, 2)
+        for _ in range(10):
+            await asyncio.sleep(0)
+            if written:
+                break
+        await buffer.close()
+
+    asyncio.run(run())
+    assert [event["ticket_id"] for event in written[0]] == [1, 2]
+
+
+def test_close_flushes_remaining(written):
+    async def run():
+        buffer = TicketEventBuffer(batch_size=100, flush_interval=60, max_pending=100)
+        _record(buffer, 1)
+        await buffer.close()
+        assert len(buffer) == 0
+
+    asyncio.run(run())
+    assert sum(len(batch) for batch in written) == 1
+
+
+def test_failed_flush_requeues_within_limit(monkeypatch):
+    @contextlib.asynccontextmanager
+    async def session_factory():
+        yield None
+
+    async def insert_events(db, *, events, chunk_size):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr("app.db.session.AsyncSessionFactory", session_factory)
+    monkeypatch.setattr(crud.ticket_event, "insert_events", insert_events)
+
+    async def run():
+        buffer = TicketEventBuffer(batch_size=100, flush_interval=60, max_pending=3)
+        for ticket_id in range(5):
+            _record(buffer, ticket_id)
+        # Сверх max_pending события отбрасываются
+        assert len(buffer) == 3
+        assert await buffer.flush() == 0
+        # Неудачная пачка возвращается в начало очереди
+        assert [event["ticket_id"] for event in buffer._pending] == [0, 1, 2]
+        buffer._closing = True
+        buffer._wakeup.set()
+        await buffer._task
+
+    asyncio.run(run())
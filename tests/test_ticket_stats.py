@@ -0,0 +1,40 @@
+# Файл: tests/test_ticket_stats.py
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.crud.crud_ticket_stats import aggregate_imported
+
+
+def test_aggregate_imported_groups_by_local_day():
+    zone = ZoneInfo("Europe/Moscow")
+    # 22:30 UTC — уже следующий день по Москве
+    created = datetime(2026, 3, 1, 22, 30, tzinfo=timezone.utc)
+    closed = created + timedelta(hours=2, seconds=10.6)
+    rows = [
+        (created, None, 1, 2, 100),
+        (created, closed, 4, 2, 100),
+        (created, None, 1, 3, 100),
+    ]
+    totals = aggregate_imported(rows, zone)
+    assert totals == {
+        (date(2026, 3, 2), None, 2, 100): [2, 0, 0],
+        (date(2026, 3, 2), None, 3, 100): [1, 0, 0],
+        (date(2026, 3, 2), 4, 2, 100): [0, 1, 7211],
+    }
+
+
+def test_aggregate_imported_sums_closures_with_per_ticket_rounding():
+    zone = ZoneInfo("UTC")
+    created = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+    rows = [
+        (created, created + timedelta(seconds=1.4), 4, 1, 7),
+        (created, created + timedelta(seconds=1.4), 4, 1, 7),
+    ]
+    totals = aggregate_imported(rows, zone)
+    # 1.4 + 1.4 округляется по заявкам (1 + 1), как CAST(... AS BIGINT) в SQL
+    assert totals[(date(2026, 3, 1), 4, 1, 7)] == [0, 2, 2]
+    assert totals[(date(2026, 3, 1), None, 1, 7)] == [2, 0, 0]
+
+
+def test_aggregate_imported_empty():
+    assert aggregate_imported([], ZoneInfo("UTC")) == {}
@@ -0,0 +1,58 @@
+# Файл: tests/test_workflow.py
+from types import SimpleNamespace
+
+from app.core.workflow import compile_workflow
+
+
+def _status(status_id, is_final=False, is_initial=False):
+    return SimpleNamespace(status_id=status_id, is_final=is_final, is_initial=is_initial)
+
+
+STATUSES = [_status(1, is_initial=True), _status(2), _status(3), _status(4, is_final=True)]
+TRANSITIONS = [(1, 3, None), (3, 4, None), (4, 3, "admin"), (2, 3, "technician")]
+
+
+def test_initial_status_is_flagged_status():
+    workflow = compile_workflow(STATUSES, TRANSITIONS)
+    assert workflow.initial_status_id == 1
+
+
+def test_initial_status_falls_back_to_first_non_final():
+    statuses = [_status(4, is_final=True), _status(2), _status(3)]
+    assert compile_workflow(statuses, []).initial_status_id == 2
+
+
+def test_no_statuses():
+    workflow = compile_workflow([], [])
+    assert workflow.initial_status_id is None
+    assert not workflow.status_exists(1)
+
+
+def test_common_edges_apply_to_every_role():
+    workflow = compile_workflow(STATUSES, TRANSITIONS)
+    assert workflow.can_transition("technician", 1, 3)
+    assert workflow.can_transition("admin", 3, 4)
+    # Роль без собственных переходов получает только общие
+    assert workflow.can_transition("user", 1, 3)
+
+
+def test_role_edges_are_merged_with_common():
+    workflow = compile_workflow(STATUSES, TRANSITIONS)
+    assert workflow.allowed_targets("admin", 4) == frozenset({3})
+    assert workflow.allowed_targets("technician", 2) == frozenset({3})
+    assert workflow.allowed_targets("technician", 1) == frozenset({3})
+    assert not workflow.can_transition("technician", 4, 3)
+    assert not workflow.can_transition("user", 2, 3)
+
+
+def test_same_status_is_always_allowed():
+    workflow = compile_workflow(STATUSES, [])
+    assert workflow.can_transition("user", 2, 2)
+    assert not workflow.can_transition("user", 2, 3)
+
+
+def test_final_flags():
+    workflow = compile_workflow(STATUSES, TRANSITIONS)
+    assert workflow.is_final(4)
+    assert not workflow.is_final(3)
+    assert not workflow.is_final(99)